@@ -0,0 +1,55 @@
+"""Add account daily balances snapshot table
+
+Revision ID: 20250301_account_daily_balances
+Revises: 20250214_update_budget
+Create Date: 2025-03-01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250301_account_daily_balances'
+down_revision: Union[str, Sequence[str], None] = '20250214_update_budget'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'account_daily_balances',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('account_id', sa.UUID(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('delta', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('account_id', 'date', name='uq_account_daily_balance_account_date')
+    )
+    op.create_index(op.f('ix_account_daily_balances_date'), 'account_daily_balances', ['date'], unique=False)
+
+    # Backfill from existing balances: latest created balance per account and
+    # date, with its change from the account's previous date
+    op.execute("""
+        INSERT INTO account_daily_balances (id, created_at, updated_at, account_id, date, amount, delta)
+        SELECT gen_random_uuid(), now(), now(), account_uuid, date, amount,
+               amount - COALESCE(LAG(amount) OVER (PARTITION BY account_uuid ORDER BY date), 0)
+        FROM (
+            SELECT DISTINCT ON (account_uuid, date) account_uuid, date, amount
+            FROM balances
+            ORDER BY account_uuid, date, created_at DESC
+        ) AS latest
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_account_daily_balances_date'), table_name='account_daily_balances')
+    op.drop_table('account_daily_balances')
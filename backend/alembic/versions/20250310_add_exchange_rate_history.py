@@ -0,0 +1,47 @@
+"""Add exchange rate history table
+
+Revision ID: 20250310_exchange_rate_history
+Revises: 20250301_account_daily_balances
+Create Date: 2025-03-10
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250310_exchange_rate_history'
+down_revision: Union[str, Sequence[str], None] = '20250301_account_daily_balances'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'exchange_rate_history',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('base_currency', sa.String(length=3), nullable=False),
+        sa.Column('target_currency', sa.String(length=3), nullable=False),
+        sa.Column('rate_date', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('base_currency', 'target_currency', 'rate_date', name='uq_exchange_rate_history_pair_date')
+    )
+
+    # Seed with the rates currently stored so existing data keeps a rate
+    op.execute("""
+        INSERT INTO exchange_rate_history (id, created_at, updated_at, base_currency, target_currency, rate_date, rate)
+        SELECT gen_random_uuid(), now(), now(), base_currency, target_currency, fetched_at::date, rate
+        FROM exchange_rates
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('exchange_rate_history')
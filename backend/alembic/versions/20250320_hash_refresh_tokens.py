@@ -0,0 +1,43 @@
+"""Store refresh tokens as hashes
+
+Revision ID: 20250320_hash_refresh_tokens
+Revises: 20250310_exchange_rate_history
+Create Date: 2025-03-20
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250320_hash_refresh_tokens'
+down_revision: Union[str, Sequence[str], None] = '20250310_exchange_rate_history'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(length=64), nullable=True))
+
+    # Expired and revoked tokens can never be used again
+    op.execute("DELETE FROM refresh_tokens WHERE revoked OR expires_at < now()")
+    op.execute("UPDATE refresh_tokens SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.drop_column('refresh_tokens', 'token')
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+    op.create_index('ix_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Hashes cannot be turned back into tokens, so every session has to log in again
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_index('ix_refresh_tokens_expires_at', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(length=500), nullable=False))
+    op.create_unique_constraint('refresh_tokens_token_key', 'refresh_tokens', ['token'])
@@ -0,0 +1,32 @@
+"""Add composite index for paginated balance listing
+
+Revision ID: 20250401_balance_listing_index
+Revises: 20250320_hash_refresh_tokens
+Create Date: 2025-04-01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250401_balance_listing_index'
+down_revision: Union[str, Sequence[str], None] = '20250320_hash_refresh_tokens'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_balances_account_date_created_id',
+        'balances',
+        ['account_uuid', 'date', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_balances_account_date_created_id', table_name='balances')
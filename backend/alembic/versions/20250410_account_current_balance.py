@@ -0,0 +1,47 @@
+"""Add denormalized current balance columns to accounts
+
+Revision ID: 20250410_account_current_balance
+Revises: 20250401_balance_listing_index
+Create Date: 2025-04-10
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250410_account_current_balance'
+down_revision: Union[str, Sequence[str], None] = '20250401_balance_listing_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('accounts', sa.Column('current_balance', sa.Float(), nullable=True))
+    op.add_column('accounts', sa.Column('current_balance_date', sa.Date(), nullable=True))
+    op.add_column('accounts', sa.Column('current_balance_id', sa.UUID(), nullable=True))
+
+    # Backfill from the latest balance of each account (latest date, then most
+    # recently created)
+    op.execute("""
+        UPDATE accounts
+        SET current_balance = latest.amount,
+            current_balance_date = latest.date,
+            current_balance_id = latest.id
+        FROM (
+            SELECT DISTINCT ON (account_uuid) account_uuid, id, date, amount
+            FROM balances
+            ORDER BY account_uuid, date DESC, created_at DESC
+        ) AS latest
+        WHERE accounts.id = latest.account_uuid
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('accounts', 'current_balance_id')
+    op.drop_column('accounts', 'current_balance_date')
+    op.drop_column('accounts', 'current_balance')
@@ -0,0 +1,39 @@
+"""Add composite indexes for budget period aggregates
+
+Revision ID: 20250415_budget_period_indexes
+Revises: 20250410_account_current_balance
+Create Date: 2025-04-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250415_budget_period_indexes'
+down_revision: Union[str, Sequence[str], None] = '20250410_account_current_balance'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_income_user_frequency_period',
+        'income',
+        ['user_id', 'frequency', 'effective_year', 'effective_month'],
+        unique=False
+    )
+    op.create_index(
+        'ix_expenses_user_frequency_period',
+        'expenses',
+        ['user_id', 'frequency', 'effective_year', 'effective_month'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expenses_user_frequency_period', table_name='expenses')
+    op.drop_index('ix_income_user_frequency_period', table_name='income')
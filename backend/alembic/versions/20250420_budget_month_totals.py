@@ -0,0 +1,69 @@
+"""Add budget_month_totals ledger table
+
+Revision ID: 20250420_budget_month_totals
+Revises: 20250415_budget_period_indexes
+Create Date: 2025-04-20
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250420_budget_month_totals'
+down_revision: Union[str, Sequence[str], None] = '20250415_budget_period_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'budget_month_totals',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column(
+            'frequency',
+            postgresql.ENUM('MONTHLY', 'YEARLY', 'ONE_TIME', name='frequencyenum', create_type=False),
+            nullable=False
+        ),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.UUID(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['budget_categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_budget_month_totals_user_period',
+        'budget_month_totals',
+        ['user_id', 'frequency', 'year', 'month'],
+        unique=False
+    )
+
+    # Backfill: one-time items per (year, month), recurring items on a single
+    # baseline row with year and month 0; income rows have no category
+    for source, category in (('income', 'NULL::uuid'), ('expenses', 'category_id')):
+        op.execute(f"""
+            INSERT INTO budget_month_totals (id, created_at, updated_at, user_id, frequency, year, month, category_id, amount)
+            SELECT gen_random_uuid(), now(), now(), user_id, frequency, year, month, category_id, SUM(amount)
+            FROM (
+                SELECT user_id, frequency, {category} AS category_id, amount,
+                       CASE WHEN frequency = 'ONE_TIME' THEN COALESCE(effective_year, 0) ELSE 0 END AS year,
+                       CASE WHEN frequency = 'ONE_TIME' THEN COALESCE(effective_month, 0) ELSE 0 END AS month
+                FROM {source}
+            ) AS items
+            GROUP BY user_id, frequency, year, month, category_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_budget_month_totals_user_period', table_name='budget_month_totals')
+    op.drop_table('budget_month_totals')
@@ -0,0 +1,71 @@
+"""Add kind and a unique key to the budget_month_totals ledger
+
+Revision ID: 20250425_budget_ledger_kind
+Revises: 20250420_budget_month_totals
+Create Date: 2025-04-25
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20250425_budget_ledger_kind'
+down_revision: Union[str, Sequence[str], None] = '20250420_budget_month_totals'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Placeholder for the NULL category of income rows in the unique key
+NO_CATEGORY = "'00000000-0000-0000-0000-000000000000'"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    budgetkindenum = postgresql.ENUM('INCOME', 'EXPENSE', name='budgetkindenum')
+    budgetkindenum.create(op.get_bind(), checkfirst=True)
+
+    op.add_column(
+        'budget_month_totals',
+        sa.Column(
+            'kind',
+            postgresql.ENUM('INCOME', 'EXPENSE', name='budgetkindenum', create_type=False),
+            nullable=True
+        )
+    )
+
+    # The ledger is derived data and concurrent refreshes may have left
+    # duplicate rows, so rebuild it rather than patching rows in place
+    op.execute("DELETE FROM budget_month_totals")
+    for source, kind, category in (('income', 'INCOME', 'NULL::uuid'), ('expenses', 'EXPENSE', 'category_id')):
+        op.execute(f"""
+            INSERT INTO budget_month_totals (id, created_at, updated_at, user_id, kind, frequency, year, month, category_id, amount)
+            SELECT gen_random_uuid(), now(), now(), user_id, '{kind}', frequency, year, month, category_id, SUM(amount)
+            FROM (
+                SELECT user_id, frequency, {category} AS category_id, amount,
+                       CASE WHEN frequency = 'ONE_TIME' THEN COALESCE(effective_year, 0) ELSE 0 END AS year,
+                       CASE WHEN frequency = 'ONE_TIME' THEN COALESCE(effective_month, 0) ELSE 0 END AS month
+                FROM {source}
+            ) AS items
+            GROUP BY user_id, frequency, year, month, category_id
+        """)
+
+    op.alter_column('budget_month_totals', 'kind', nullable=False)
+    op.create_index(
+        'uq_budget_month_totals_key',
+        'budget_month_totals',
+        [
+            'user_id', 'kind', 'frequency', 'year', 'month',
+            sa.text(f"coalesce(category_id, {NO_CATEGORY})"),
+        ],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_budget_month_totals_key', table_name='budget_month_totals')
+    op.drop_column('budget_month_totals', 'kind')
+    op.execute('DROP TYPE budgetkindenum')
@@ -1,15 +1,30 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from nw_tracker.config.settings import get_settings
+from nw_tracker.utils.pool_metrics import instrument_engine
 
 settings = get_settings()
 
+
+def engine_options(pool_size: int, max_overflow: int) -> dict:
+    """create_async_engine keyword arguments for the configured pool tuning."""
+    return {
+        "echo": settings.sql_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,  # Verify connections before using
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,    # Seconds to wait for a free connection
+        "pool_recycle": settings.db_pool_recycle,    # Replace connections older than this
+        "connect_args": {
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        },
+    }
+
+
 # Create async engine with PostgreSQL configuration
 engine = create_async_engine(
     settings.database_url,
-    echo=settings.debug,  # Enable SQL logging in debug mode
-    pool_pre_ping=True,   # Verify connections before using
-    pool_size=10,         # Connection pool size
-    max_overflow=20,      # Max overflow connections
+    **engine_options(settings.db_pool_size, settings.db_max_overflow)
 )
 
 # Create async session factory
@@ -21,38 +36,74 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+instrument_engine(engine, "primary")
 
-async def get_db() -> AsyncSession:
-    """Dependency for FastAPI to get async database session (RW user)."""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
 
+def create_read_only_engine():
+    """
+    Engine for read-only endpoints, logged in as the RO user.
 
-async def get_ro_db() -> AsyncSession:
-    """Dependency for FastAPI to get async read-only database session (RO user)."""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-
+    Connects to the replica host when one is configured, otherwise to the
+    primary host. Returns None when no RO user is configured, in which case
+    reads share the primary engine.
+    """
+    if not settings.read_only_user_configured:
+        return None
     ro_engine = create_async_engine(
         settings.ro_database_url,
-        echo=settings.debug,
-        pool_pre_ping=True,
-        pool_size=5,  # Smaller pool for read-only connections
-        max_overflow=10,
+        **engine_options(settings.db_ro_pool_size, settings.db_ro_max_overflow)
     )
+    instrument_engine(ro_engine, "replica" if settings.read_replica_configured else "read_only")
+    return ro_engine
 
+
+# Read-only engine, created once
+ro_engine = create_read_only_engine() or engine
+if ro_engine is engine:
+    ROAsyncSessionLocal = AsyncSessionLocal
+else:
     ROAsyncSessionLocal = async_sessionmaker(
         bind=ro_engine,
         class_=AsyncSession,
         autocommit=False,
         autoflush=False,
         expire_on_commit=False,
+        info={"read_only": True},
     )
 
+
+def is_read_only(session: AsyncSession) -> bool:
+    """Whether a session is bound to the read-only (RO user) engine."""
+    return bool(session.info.get("read_only"))
+
+
+async def get_db() -> AsyncSession:
+    """Dependency for FastAPI to get async database session (RW user)."""
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_ro_db() -> AsyncSession:
+    """
+    Dependency for FastAPI to get async read-only database session (RO user).
+
+    Used by endpoints that only read (dashboard, history, budget summaries,
+    enums). Connects as the RO user to the replica, or to the primary when
+    no replica is configured. A replica may lag the primary slightly, so never use it to read back a
+    write made in the same request.
+    """
     async with ROAsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (application shutdown)."""
+    await engine.dispose()
+    if ro_engine is not engine:
+        await ro_engine.dispose()
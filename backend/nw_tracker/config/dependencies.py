@@ -1,11 +1,15 @@
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+import secrets
+from typing import Annotated, Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from nw_tracker.config.database import get_db
+from nw_tracker.config.settings import get_settings
 from nw_tracker.services.auth_service import AuthService
-from nw_tracker.models.models import User
+from nw_tracker.utils.user_cache import UserPrincipal
+
+settings = get_settings()
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
@@ -14,12 +18,15 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> UserPrincipal:
     """
     Dependency to get the current authenticated user from JWT token.
 
     The token should be passed in the Authorization header as:
     Authorization: Bearer <access_token>
+
+    Returns a read-only UserPrincipal, usually from the in-process user
+    cache. The session is only used on a cache miss.
     """
     token = credentials.credentials
     auth_service = AuthService(db)
@@ -27,8 +34,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[UserPrincipal, Depends(get_current_user)]
+) -> UserPrincipal:
     """
     Dependency to get the current active user.
     This ensures the user is authenticated AND active.
@@ -39,3 +46,22 @@ async def get_current_active_user(
             detail="Inactive user"
         )
     return current_user
+
+
+async def require_metrics_token(
+    x_metrics_token: Annotated[Optional[str], Header()] = None
+) -> None:
+    """
+    Dependency for internal, process-wide endpoints (cache and pool metrics).
+
+    These expose activity across all users, so a user's access token is not
+    enough: the caller must send the configured METRICS_TOKEN in the
+    X-Metrics-Token header. Without a configured token the endpoints do not
+    exist (404).
+    """
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_metrics_token or not secrets.compare_digest(
+        x_metrics_token.encode(), settings.metrics_token.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid metrics token")
@@ -21,20 +21,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(password_bytes, hash_bytes)
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password."""
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password (bcrypt cost factor from PASSWORD_HASH_ROUNDS unless given)."""
     password_bytes = password.encode('utf-8')
+    salt = bcrypt.gensalt(rounds or settings.password_hash_rounds)
 
     if len(password_bytes) > 72:
         # For long passwords, use SHA256 hash as the password
         sha256_hash = hashlib.sha256(password_bytes).hexdigest()
-        hashed = bcrypt.hashpw(sha256_hash.encode('utf-8'), bcrypt.gensalt())
+        hashed = bcrypt.hashpw(sha256_hash.encode('utf-8'), salt)
     else:
-        hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+        hashed = bcrypt.hashpw(password_bytes, salt)
 
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a bcrypt hash was made with a different cost factor than configured."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return False
+    return rounds != settings.password_hash_rounds
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -56,6 +66,11 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
+def hash_refresh_token(token: str) -> str:
+    """Fixed-size digest used to store and look up refresh tokens."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and validate a JWT access token."""
     try:
@@ -25,19 +25,75 @@ class Settings(BaseSettings):
     postgres_ro_user: str = "reporting_user"
     postgres_ro_password: str = "reporting_password"
 
+    # Read replica host for read-only endpoints (empty = read from the primary)
+    postgres_ro_host: str = ""
+    postgres_ro_port: int = 5432
+
     # Application Settings
     debug: bool = True
     log_level: str = "INFO"
+    # Log every SQL statement (independent of debug)
+    sql_echo: bool = False
+
+    # Connection pools (per worker process; the replica pool uses the db_ro_* sizes)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_ro_pool_size: int = 5
+    db_ro_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # asyncpg server-side statement cache per connection (0 disables it, e.g. behind
+    # PgBouncer in transaction mode) and SQLAlchemy's prepared statement cache
+    db_statement_cache_size: int = 100
+    db_prepared_statement_cache_size: int = 100
+
+    # Read history endpoints from the account_daily_balances snapshot table
+    balance_snapshots_enabled: bool = True
+
+    # Bulk balance import: rows written per executemany, and how many row
+    # errors are listed in the response (all failures are still counted)
+    balance_import_batch_size: int = 1000
+    balance_import_max_errors: int = 100
+
+    # Per-user cache for dashboard and account group summaries
+    result_cache_enabled: bool = True
+    result_cache_max_entries: int = 1024
+    result_cache_ttl_seconds: int = 300
+
+    # Authenticated user principals, so valid access tokens resolve without a query
+    user_cache_enabled: bool = True
+    user_cache_max_entries: int = 10000
+    user_cache_ttl_seconds: int = 30
+
+    # Process-wide exchange rate cache (refreshed in the background while the app runs)
+    exchange_rate_cache_ttl_seconds: int = 3600
+    exchange_rate_retry_seconds: int = 60
+    exchange_rate_background_refresh: bool = True
+    exchange_rate_refresh_interval_seconds: int = 3600
+
+    # Shared secret for the internal /metrics endpoints (X-Metrics-Token header; empty = disabled)
+    metrics_token: str = ""
 
     # JWT Configuration
     jwt_secret_key: str = "your-secret-key-change-in-production"
     jwt_refresh_secret_key: str = "your-refresh-secret-key-change-in-production"
     jwt_access_token_expire_minutes: int = 15
     jwt_refresh_token_expire_days: int = 7
+    # Background deletion of expired/revoked refresh tokens
+    refresh_token_sweep_enabled: bool = True
+    refresh_token_sweep_interval_seconds: int = 3600
 
     # Password Policy
     password_min_length: int = 8
 
+    # Password hashing: bcrypt cost factor (existing hashes are upgraded on login),
+    # hashing threads, and how many hashes may be running or queued before
+    # login/register answer 503
+    password_hash_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
     @property
     def database_url(self) -> str:
         """Construct async PostgreSQL URL for application (RW user)."""
@@ -54,12 +110,22 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def read_replica_configured(self) -> bool:
+        """Whether read-only endpoints connect to a separate replica host."""
+        return bool(self.postgres_ro_host)
+
+    @property
+    def read_only_user_configured(self) -> bool:
+        """Whether read-only endpoints log in as a separate RO user."""
+        return bool(self.postgres_ro_user)
+
     @property
     def ro_database_url(self) -> str:
-        """Construct async PostgreSQL URL for reporting (RO user)."""
+        """Construct async PostgreSQL URL for reporting (RO user on the replica, else the primary)."""
         return (
             f"postgresql+asyncpg://{self.postgres_ro_user}:{self.postgres_ro_password}"
-            f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+            f"@{self.postgres_ro_host or self.postgres_host}:{self.postgres_ro_port}/{self.postgres_db}"
         )
 
 
@@ -5,3 +5,8 @@ class FrequencyEnum(BaseEnum):
     MONTHLY = "MONTHLY"
     YEARLY = "YEARLY"
     ONE_TIME = "ONE_TIME"
+
+
+class BudgetKindEnum(BaseEnum):
+    INCOME = "INCOME"
+    EXPENSE = "EXPENSE"
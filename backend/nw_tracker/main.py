@@ -1,8 +1,13 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from nw_tracker.config.database import dispose_engines
 from nw_tracker.config.settings import get_settings
 from nw_tracker.router.api import router
+from nw_tracker.services.auth_service import sweep_refresh_tokens_periodically
+from nw_tracker.services.exchange_rate_service import refresh_rates_periodically
+from nw_tracker.utils.password_hasher import shutdown_password_hasher
 
 settings = get_settings()
 
@@ -10,8 +15,25 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     # Startup: Database is managed by Alembic migrations
     # No automatic table creation
+    background_tasks = []
+    if settings.exchange_rate_background_refresh:
+        # Keep exchange rates warm so requests never wait on the rates API
+        background_tasks.append(asyncio.create_task(
+            refresh_rates_periodically(settings.exchange_rate_refresh_interval_seconds)
+        ))
+    if settings.refresh_token_sweep_enabled:
+        # Keep the refresh_tokens table bounded
+        background_tasks.append(asyncio.create_task(
+            sweep_refresh_tokens_periodically(settings.refresh_token_sweep_interval_seconds)
+        ))
     yield
-    # Shutdown: Cleanup if needed
+    # Shutdown: stop background tasks, hashing threads and pooled connections
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    shutdown_password_hasher()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -38,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Balance listing pagination
 )
 
 app.include_router(router)
@@ -9,9 +9,10 @@ class RefreshToken(BaseModelClass):
     """Refresh token model for storing refresh tokens in database."""
     __tablename__ = 'refresh_tokens'
 
-    token = Column(String(500), nullable=False, unique=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    expires_at = Column(DateTime, nullable=False)
+    # SHA-256 hex digest of the token; the token itself is never stored
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
     revoked = Column(Boolean, default=False, nullable=False)
 
     ############# Relationships #############
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Float, Boolean, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, Boolean, Integer, ForeignKey, Index, func, literal_column, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from nw_tracker.models.models import BaseModelClass
-from nw_tracker.enums.budget_enums import FrequencyEnum
+from nw_tracker.enums.budget_enums import BudgetKindEnum, FrequencyEnum
 
 
 class BudgetCategoryModel(BaseModelClass):
@@ -21,6 +21,10 @@ class BudgetCategoryModel(BaseModelClass):
 
 class IncomeModel(BaseModelClass):
     __tablename__ = 'income'
+    __table_args__ = (
+        # Backs the per-month budget aggregates (recurring + one-time for a month)
+        Index('ix_income_user_frequency_period', 'user_id', 'frequency', 'effective_year', 'effective_month'),
+    )
 
     description = Column(String(255), nullable=False)
     amount = Column(Float, nullable=False)
@@ -33,6 +37,10 @@ class IncomeModel(BaseModelClass):
 
 class ExpenseModel(BaseModelClass):
     __tablename__ = 'expenses'
+    __table_args__ = (
+        # Backs the per-month budget aggregates (recurring + one-time for a month)
+        Index('ix_expenses_user_frequency_period', 'user_id', 'frequency', 'effective_year', 'effective_month'),
+    )
 
     description = Column(String(255), nullable=False)
     amount = Column(Float, nullable=False)
@@ -44,3 +52,42 @@ class ExpenseModel(BaseModelClass):
 
     # Relationships
     category = relationship("BudgetCategoryModel", back_populates="expenses")
+
+
+class BudgetMonthTotalModel(BaseModelClass):
+    """
+    Precomputed budget ledger: income and expense totals per user, period and category.
+
+    One-time items are totalled per (frequency ONE_TIME, year, month).
+    MONTHLY and YEARLY items are totalled once as a recurring baseline with
+    year and month 0, so a recurring item never fans out to every month.
+    kind tells income from expense rows; income rows have no category.
+    Rows are unique per BUDGET_LEDGER_KEY. Maintained by the income,
+    expense and budget category services on write.
+    """
+    __tablename__ = 'budget_month_totals'
+    __table_args__ = (
+        Index('ix_budget_month_totals_user_period', 'user_id', 'frequency', 'year', 'month'),
+    )
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    kind = Column(SQLEnum(BudgetKindEnum), nullable=False)
+    frequency = Column(SQLEnum(FrequencyEnum), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    category_id = Column(UUID(as_uuid=True), ForeignKey('budget_categories.id', ondelete='CASCADE'), nullable=True)
+    amount = Column(Float, nullable=False)
+
+
+# A unique key would treat the NULL category of income rows as distinct on
+# every database, so the key maps it to a placeholder that is never an ID
+NO_CATEGORY = literal_column("'00000000-0000-0000-0000-000000000000'")
+BUDGET_LEDGER_KEY = (
+    BudgetMonthTotalModel.user_id,
+    BudgetMonthTotalModel.kind,
+    BudgetMonthTotalModel.frequency,
+    BudgetMonthTotalModel.year,
+    BudgetMonthTotalModel.month,
+    func.coalesce(BudgetMonthTotalModel.category_id, NO_CATEGORY),
+)
+Index('uq_budget_month_totals_key', *BUDGET_LEDGER_KEY, unique=True)
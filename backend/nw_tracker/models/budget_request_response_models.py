@@ -1,5 +1,6 @@
 from typing import Optional
-from pydantic import BaseModel, Field
+from enum import Enum
+from pydantic import BaseModel, Field, field_validator
 from pydantic import UUID4
 from datetime import datetime
 
@@ -65,6 +66,12 @@ class IncomeResponse(IncomeBase):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("frequency", mode="before")
+    @classmethod
+    def frequency_value(cls, value):
+        # ORM rows carry FrequencyEnum members
+        return value.value if isinstance(value, Enum) else value
+
 
 # Expense Models
 class ExpenseBase(BaseModel):
@@ -98,6 +105,12 @@ class ExpenseResponse(ExpenseBase):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("frequency", mode="before")
+    @classmethod
+    def frequency_value(cls, value):
+        # ORM rows carry FrequencyEnum members
+        return value.value if isinstance(value, Enum) else value
+
 
 # Dashboard Models
 class ExpenseBreakdownItem(BaseModel):
@@ -126,3 +139,19 @@ class BudgetTrendMonth(BaseModel):
 
 class BudgetTrendsResponse(BaseModel):
     months: list[BudgetTrendMonth]
+
+
+class BudgetProjectionMonth(BaseModel):
+    month: int
+    year: int
+    income: float
+    expenses: float
+    surplus_deficit: float
+    cumulative_surplus: float
+    projected_net_worth: Optional[float] = None
+
+
+class BudgetProjectionResponse(BaseModel):
+    annual_return_rate: float
+    starting_net_worth: Optional[float] = None
+    months: list[BudgetProjectionMonth]
@@ -4,7 +4,7 @@ from typing import List, Optional
 import uuid
 
 
-from sqlalchemy import Column, String, Float, DateTime, Table, func, ForeignKey, Enum, Date, Boolean
+from sqlalchemy import Column, String, Float, DateTime, Table, func, ForeignKey, Enum, Date, Boolean, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.types import CHAR
 from sqlalchemy.orm import relationship
@@ -53,6 +53,13 @@ class Theme(BaseEnum):
     DARK = "dark"
 
 
+class HistoryResolution(BaseEnum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    AUTO = "auto"
+
+
 account_group_association = Table(
     'account_group_association',
     Base.metadata,
@@ -80,6 +87,10 @@ class BaseModelClass(Base):
 
 class Balance(BaseModelClass):
     __tablename__ = 'balances'
+    __table_args__ = (
+        # Backs the keyset-paginated, date-filtered balance listing
+        Index('ix_balances_account_date_created_id', 'account_uuid', 'date', 'created_at', 'id'),
+    )
     amount = Column(Float, nullable=False)
     date = Column(Date, nullable=False)
     account_uuid = Column(UUID(as_uuid=True), ForeignKey('accounts.id'), nullable=False)
@@ -88,6 +99,24 @@ class Balance(BaseModelClass):
     account = relationship("Account", back_populates="balances", uselist=False, passive_deletes=True)
 
 
+class AccountDailyBalance(BaseModelClass):
+    """
+    Materialized balance series: one row per account and balance date.
+
+    amount is the latest created balance on that date (account currency) and
+    delta its change from the account's previous row, so a running sum of
+    deltas over any set of accounts is their fill-forward total.
+    """
+    __tablename__ = 'account_daily_balances'
+    __table_args__ = (
+        UniqueConstraint('account_id', 'date', name='uq_account_daily_balance_account_date'),
+    )
+    account_id = Column(UUID(as_uuid=True), ForeignKey('accounts.id', ondelete='CASCADE'), nullable=False)
+    date = Column(Date, nullable=False, index=True)
+    amount = Column(Float, nullable=False)
+    delta = Column(Float, nullable=False)
+
+
 class Account(BaseModelClass):
     __tablename__ = 'accounts'
     account_name = Column(String(50), nullable=False)
@@ -95,6 +124,12 @@ class Account(BaseModelClass):
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     account_type = Column(String(50), nullable=False, default='savings')
     is_excluded_from_totals = Column(Boolean, default=False, nullable=False)
+    # Denormalized latest balance (latest date, then most recently created), kept
+    # in step with balance writes by AccountRepository.refresh_current_balances.
+    # NULL when the account has no balances.
+    current_balance = Column(Float, nullable=True)
+    current_balance_date = Column(Date, nullable=True)
+    current_balance_id = Column(UUID(as_uuid=True), nullable=True)
 
     ############# Relationships #############
     balances = relationship("Balance", back_populates="account", cascade="all, delete-orphan", order_by="desc(Balance.date), desc(Balance.created_at)")
@@ -142,6 +177,23 @@ class ExchangeRate(BaseModelClass):
     fetched_at = Column(DateTime, nullable=False)
 
 
+class ExchangeRateHistory(BaseModelClass):
+    """
+    Append-only daily exchange rates, one row per currency pair and date.
+
+    exchange_rates only keeps the latest fetch; this table keeps every day's
+    rate so history points can be converted at their own date's rate.
+    """
+    __tablename__ = 'exchange_rate_history'
+    __table_args__ = (
+        UniqueConstraint('base_currency', 'target_currency', 'rate_date', name='uq_exchange_rate_history_pair_date'),
+    )
+    base_currency = Column(String(3), nullable=False)  # GBP
+    target_currency = Column(String(3), nullable=False)  # USD, EUR
+    rate_date = Column(Date, nullable=False)
+    rate = Column(Float, nullable=False)  # 1 GBP = X target_currency on rate_date
+
+
 class AccountTypeDefinition(BaseModelClass):
     __tablename__ = 'account_type_definitions'
     name = Column(String(50), nullable=False)  # e.g., "savings", "crypto"
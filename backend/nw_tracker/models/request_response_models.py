@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 from pydantic import BaseModel, UUID4, field_serializer, Field, ConfigDict, EmailStr, field_validator
 from datetime import datetime, date as DateType
 
@@ -90,6 +90,19 @@ class BalanceUpdateRequest(BaseModelClass):
 class BalanceResponse(BaseResponseClass, BalanceCreateRequest):
     pass
 
+class BalancePageResponse(BaseModelClass):
+    items: list[BalanceResponse]
+    next_cursor: Optional[str] = None
+
+class BalanceImportError(BaseModelClass):
+    line: int
+    error: str
+
+class BalanceImportResponse(BaseModelClass):
+    imported: int
+    failed: int
+    errors: list[BalanceImportError] = Field(default_factory=list)
+
 
 # ============ Account Models ============
 
@@ -287,3 +300,39 @@ class AccountTypeResponse(BaseResponseClass, BaseModel):
     icon: Optional[str] = None
     is_default: bool
     user_id: Optional[UUID4] = None
+
+
+# ============ Metrics Models ============
+
+class CacheNamespaceStats(BaseModel):
+    """Hit/miss counters for one cached result type."""
+    hits: int
+    misses: int
+
+
+class ResultCacheStatsResponse(BaseModel):
+    """Counters for the per-user result cache."""
+    enabled: bool
+    entries: int
+    hits: int
+    misses: int
+    namespaces: Dict[str, CacheNamespaceStats]
+
+
+class PoolStatsResponse(BaseModel):
+    """Connection pool counters for one database engine."""
+    name: str
+    pool_class: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int
+    checkins: int
+    connects: int
+    acquire_count: int
+    acquire_avg_ms: float
+    acquire_max_ms: float
+    timeouts: int
+    pings: int
+    ping_avg_ms: float
+    ping_max_ms: float
@@ -0,0 +1,216 @@
+from datetime import date
+from typing import Iterable, Optional
+
+from pydantic import UUID4
+from sqlalchemy import case, delete, func, insert, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nw_tracker.models.models import Account, AccountDailyBalance, Balance, account_group_association
+from nw_tracker.logger import get_logger
+from nw_tracker.repositories.base_repository import GenericRepository
+
+
+logger = get_logger()
+
+
+class AccountDailyBalanceRepository(GenericRepository[AccountDailyBalance]):
+    """
+    Maintains and reads the account_daily_balances snapshot table.
+
+    Each row stores an account's latest balance on a date and its delta from
+    the previous row, so a write on one date only touches that row and the
+    next one, and history reads are a GROUP BY over deltas.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, AccountDailyBalance)
+
+    async def refresh_dates(self, account_id: UUID4, dates: Iterable[date]) -> None:
+        """
+        Recompute the snapshot rows affected by balance writes on the given dates.
+
+        Dates are processed in ascending order so each one sees the already
+        refreshed rows before it.
+        """
+        try:
+            for changed_date in sorted(set(dates)):
+                await self._refresh_date(account_id, changed_date)
+            await self._commit()
+        except Exception as e:
+            logger.error(f"Database error while refreshing daily balances for account {account_id}: {e}")
+            raise Exception(f"An error occurred while refreshing daily balances for account ID: {account_id}.")
+
+    async def _refresh_date(self, account_id: UUID4, changed_date: date) -> None:
+        """Rewrite the row for changed_date and the delta of the row after it."""
+        latest = (await self.session.execute(
+            select(Balance.amount)
+            .filter(Balance.account_uuid == account_id, Balance.date == changed_date)
+            .order_by(Balance.created_at.desc())
+            .limit(1)
+        )).first()
+
+        previous = await self._get_neighbour(account_id, AccountDailyBalance.date < changed_date, AccountDailyBalance.date.desc())
+        current = await self._get_neighbour(account_id, AccountDailyBalance.date == changed_date, AccountDailyBalance.date)
+        following = await self._get_neighbour(account_id, AccountDailyBalance.date > changed_date, AccountDailyBalance.date)
+
+        carried = previous.amount if previous else 0.0
+        if latest is None:
+            # No balance left on this date - the next row now follows the previous one
+            if current:
+                await self.session.delete(current)
+        else:
+            if current is None:
+                current = AccountDailyBalance(account_id=account_id, date=changed_date)
+                self.session.add(current)
+            current.amount = latest.amount
+            current.delta = latest.amount - carried
+            carried = latest.amount
+
+        if following:
+            following.delta = following.amount - carried
+        await self.session.flush()
+
+    async def _get_neighbour(self, account_id: UUID4, criterion, order_by) -> Optional[AccountDailyBalance]:
+        result = await self.session.execute(
+            select(AccountDailyBalance)
+            .filter(AccountDailyBalance.account_id == account_id, criterion)
+            .order_by(order_by)
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def rebuild(self, account_ids: Optional[list[UUID4]] = None) -> int:
+        """
+        Rebuild snapshot rows from the balances table.
+
+        Used for backfills and repairs. Rebuilds every account when account_ids
+        is None. Flushes but does not commit; the caller owns the transaction.
+
+        Returns:
+            Number of snapshot rows written
+        """
+        try:
+            clear = delete(AccountDailyBalance)
+            query = select(Balance.account_uuid, Balance.date, Balance.amount).order_by(
+                Balance.account_uuid, Balance.date, Balance.created_at
+            )
+            if account_ids is not None:
+                clear = clear.where(AccountDailyBalance.account_id.in_(account_ids))
+                query = query.filter(Balance.account_uuid.in_(account_ids))
+
+            await self.session.execute(clear)
+            result = await self.session.execute(query)
+
+            rows = []
+            for balance in result.all():
+                last = rows[-1] if rows else None
+                if last and last["account_id"] == balance.account_uuid and last["date"] == balance.date:
+                    # Same date - the most recently created balance wins
+                    last["delta"] += balance.amount - last["amount"]
+                    last["amount"] = balance.amount
+                    continue
+                previous_amount = last["amount"] if last and last["account_id"] == balance.account_uuid else 0.0
+                rows.append({
+                    "account_id": balance.account_uuid,
+                    "date": balance.date,
+                    "amount": balance.amount,
+                    "delta": balance.amount - previous_amount,
+                })
+
+            if rows:
+                await self.session.execute(insert(AccountDailyBalance), rows)
+            await self.session.flush()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Database error while rebuilding daily balances: {e}")
+            raise Exception("An error occurred while rebuilding daily balances.")
+
+    async def get_daily_deltas_for_accounts(
+        self,
+        user_id: UUID4,
+        account_ids: list[UUID4],
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> list:
+        """Get summed deltas per (date, currency) for a set of the user's accounts."""
+        if not account_ids:
+            return []
+        return await self._get_daily_deltas(
+            [AccountDailyBalance.account_id.in_(account_ids), Account.user_id == user_id], from_date, to_date
+        )
+
+    async def get_daily_deltas_by_group(
+        self,
+        user_id: UUID4,
+        group_ids: list[UUID4],
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> dict[UUID4, list]:
+        """
+        Get summed deltas per (date, currency) for each of the user's groups in one query.
+
+        Joins through account_group_association, so an account in several
+        groups counts towards each of them. Groups without snapshot rows map
+        to an empty list.
+        """
+        deltas = {group_id: [] for group_id in group_ids}
+        if not group_ids:
+            return deltas
+        rows = await self._get_daily_deltas(
+            [account_group_association.c.group_id.in_(group_ids), Account.user_id == user_id],
+            from_date,
+            to_date,
+            per_group=True
+        )
+        for row in rows:
+            deltas[row.group_id].append((row.date, row.currency, row.delta))
+        return deltas
+
+    async def get_daily_deltas_for_user(
+        self,
+        user_id: UUID4,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> list:
+        """Get summed deltas per (date, currency) for a user's accounts counted in totals."""
+        return await self._get_daily_deltas(
+            [Account.user_id == user_id, Account.is_excluded_from_totals.is_(False)], from_date, to_date
+        )
+
+    async def _get_daily_deltas(
+        self, criteria: list, from_date: Optional[date], to_date: Optional[date], per_group: bool = False
+    ) -> list:
+        """
+        Sum deltas per (date, currency), and per group_id as well when per_group is set.
+
+        Rows before from_date are folded into a single row per currency with
+        date None, which seeds the running total without being returned as a
+        history point. Rows come back ordered by date with the seed first.
+        """
+        try:
+            bucket_date = AccountDailyBalance.date
+            if from_date:
+                bucket_date = case((AccountDailyBalance.date < from_date, null()), else_=AccountDailyBalance.date)
+            bucket_date = bucket_date.label("date")
+
+            columns = [bucket_date, Account.currency]
+            if per_group:
+                columns.insert(0, account_group_association.c.group_id)
+            query = (
+                select(*columns, func.sum(AccountDailyBalance.delta).label("delta"))
+                .join(Account, Account.id == AccountDailyBalance.account_id)
+                .filter(*criteria)
+                .group_by(*columns)
+            )
+            if per_group:
+                query = query.join(
+                    account_group_association, account_group_association.c.account_id == Account.id
+                )
+            if to_date:
+                query = query.filter(AccountDailyBalance.date <= to_date)
+
+            result = await self.session.execute(query)
+            return sorted(result.all(), key=lambda row: (row.date is not None, row.date or date.min))
+        except Exception as e:
+            logger.error(f"Database error while retrieving daily balance deltas: {e}")
+            raise Exception("An error occurred while retrieving daily balance deltas.")
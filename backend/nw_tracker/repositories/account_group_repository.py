@@ -2,7 +2,7 @@ from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from nw_tracker.models.models import AccountGroup, Account
+from nw_tracker.models.models import AccountGroup, Account, account_group_association
 from nw_tracker.logger import get_logger
 from nw_tracker.repositories.base_repository import GenericRepository
 
@@ -44,6 +44,34 @@ class AccountGroupRepository(GenericRepository[AccountGroup]):
             logger.error(f"Database error while retrieving account groups for user {user_id}: {e}")
             raise Exception(f"An error occurred while retrieving account groups for user {user_id}.")
 
+    async def get_all_for_user_with_account_ids(self, user_id: UUID4) -> list[tuple[AccountGroup, list[UUID4]]]:
+        """
+        Get all account groups for a user with their member account IDs.
+
+        Reads the association table in the same query instead of loading the
+        member accounts (and their balances), for callers that already hold
+        the user's accounts.
+        """
+        try:
+            result = await self.session.execute(
+                select(AccountGroup, account_group_association.c.account_id)
+                .outerjoin(
+                    account_group_association,
+                    account_group_association.c.group_id == AccountGroup.id
+                )
+                .filter(AccountGroup.user_id == user_id)
+                .order_by(AccountGroup.created_at)
+            )
+            memberships: dict[UUID4, tuple[AccountGroup, list[UUID4]]] = {}
+            for group, account_id in result.all():
+                _, account_ids = memberships.setdefault(group.id, (group, []))
+                if account_id is not None:
+                    account_ids.append(account_id)
+            return list(memberships.values())
+        except Exception as e:
+            logger.error(f"Database error while retrieving account group memberships for user {user_id}: {e}")
+            raise Exception(f"An error occurred while retrieving account groups for user {user_id}.")
+
     async def get_all_for_user(self, user_id: UUID4):
         """Get all account groups for a user with accounts eagerly loaded in a single query."""
         try:
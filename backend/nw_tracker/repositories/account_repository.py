@@ -1,8 +1,9 @@
+from typing import Optional
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
-from nw_tracker.models.models import Account
+from nw_tracker.models.models import Account, Balance
 from nw_tracker.logger import get_logger
 from nw_tracker.repositories.base_repository import GenericRepository
 
@@ -28,16 +29,19 @@ class AccountRepository(GenericRepository[Account]):
         )
         return result.scalars().first()
 
-    async def get_all_for_user(self, user_id: UUID4) -> list[Account]:
+    async def get_all_for_user(self, user_id: UUID4, with_balances: bool = True) -> list[Account]:
         """
         Get all accounts for a user with eager loaded relationships.
+
+        Pass with_balances=False when only current balances are needed (the
+        denormalized Account.current_balance) to skip loading every balance.
         """
+        options = [selectinload(Account.groups)]
+        if with_balances:
+            options.append(selectinload(Account.balances))
         result = await self.session.execute(
             select(Account)
-            .options(
-                selectinload(Account.balances),
-                selectinload(Account.groups)
-            )
+            .options(*options)
             .filter_by(user_id=user_id)
         )
         return list(result.scalars().all())
@@ -73,3 +77,45 @@ class AccountRepository(GenericRepository[Account]):
             select(Account).filter_by(account_type=account_type)
         )
         return list(result.scalars().all())
+
+    async def refresh_current_balances(self, account_ids: Optional[list[UUID4]] = None) -> int:
+        """
+        Recompute the denormalized current balance columns from the balances table.
+
+        Called after every balance write for the affected accounts, and by
+        scripts/repair_account_current_balances.py for all accounts (None).
+        One UPDATE with correlated subqueries, each an index lookup on
+        (account_uuid, date, created_at). Flushes but does not commit; the
+        caller owns the transaction.
+
+        Returns:
+            Number of accounts updated
+        """
+        def latest(column):
+            return (
+                select(column)
+                .where(Balance.account_uuid == Account.id)
+                .order_by(Balance.date.desc(), Balance.created_at.desc())
+                .limit(1)
+                .correlate(Account)
+                .scalar_subquery()
+            )
+
+        try:
+            statement = update(Account).values(
+                current_balance=latest(Balance.amount),
+                current_balance_date=latest(Balance.date),
+                current_balance_id=latest(Balance.id),
+                # A balance write is not an edit of the account itself
+                updated_at=Account.updated_at
+            )
+            if account_ids is not None:
+                if not account_ids:
+                    return 0
+                statement = statement.where(Account.id.in_(account_ids))
+            result = await self.session.execute(statement.execution_options(synchronize_session="fetch"))
+            await self.session.flush()
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Database error while refreshing current balances: {e}")
+            raise Exception("An error occurred while refreshing account current balances.")
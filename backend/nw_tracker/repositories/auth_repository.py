@@ -1,12 +1,20 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select, update
+from nw_tracker.config.security import hash_refresh_token
 from nw_tracker.models.auth_models import RefreshToken
 from nw_tracker.repositories.base_repository import GenericRepository
 
 
 class RefreshTokenRepository(GenericRepository[RefreshToken]):
+    """
+    Refresh tokens, stored as SHA-256 digests.
+
+    Lookups go through the unique token_hash index; revocation and expiry
+    are single UPDATE/DELETE statements.
+    """
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, RefreshToken)
 
@@ -14,7 +22,7 @@ class RefreshTokenRepository(GenericRepository[RefreshToken]):
         """Create a new refresh token."""
         refresh_token = RefreshToken(
             id=uuid4(),
-            token=token,
+            token_hash=hash_refresh_token(token),
             user_id=user_id,
             expires_at=expires_at,
             revoked=False
@@ -23,45 +31,52 @@ class RefreshTokenRepository(GenericRepository[RefreshToken]):
 
     async def get_valid_token(self, token: str) -> RefreshToken | None:
         """Get a refresh token if it's valid (not expired and not revoked)."""
-        refresh_token = await self.get_by_token(token)
-        if refresh_token and not refresh_token.revoked and refresh_token.expires_at > datetime.utcnow():
-            return refresh_token
-        return None
+        result = await self.session.execute(
+            select(RefreshToken).filter(
+                RefreshToken.token_hash == hash_refresh_token(token),
+                RefreshToken.revoked == False,
+                RefreshToken.expires_at > datetime.utcnow()
+            )
+        )
+        return result.scalars().first()
 
     async def get_by_token(self, token: str) -> RefreshToken | None:
         """Get a refresh token by token string."""
         result = await self.session.execute(
-            select(RefreshToken).filter(RefreshToken.token == token)
+            select(RefreshToken).filter(RefreshToken.token_hash == hash_refresh_token(token))
         )
         return result.scalars().first()
 
     async def revoke_token(self, token: str) -> bool:
-        """Revoke a refresh token."""
-        refresh_token = await self.get_by_token(token)
-        if refresh_token:
-            refresh_token.revoked = True
-            await self.session.commit()
-            return True
-        return False
-
-    async def revoke_all_user_tokens(self, user_id: UUID) -> None:
-        """Revoke all refresh tokens for a user."""
+        """Revoke a refresh token. Returns False if the token does not exist."""
         result = await self.session.execute(
-            select(RefreshToken).filter(RefreshToken.user_id == user_id, RefreshToken.revoked == False)
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == hash_refresh_token(token))
+            .values(revoked=True)
         )
-        tokens = result.scalars().all()
-        for token in tokens:
-            token.revoked = True
-        await self.session.commit()
+        if not result.rowcount:
+            return False
+        await self._commit()
+        return True
 
-    async def delete_expired_tokens(self) -> int:
-        """Delete all expired refresh tokens. Returns count of deleted tokens."""
+    async def revoke_all_user_tokens(self, user_id: UUID) -> int:
+        """Revoke all refresh tokens for a user. Returns count of revoked tokens."""
         result = await self.session.execute(
-            select(RefreshToken).filter(RefreshToken.expires_at < datetime.utcnow())
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked == False)
+            .values(revoked=True)
         )
-        tokens = result.scalars().all()
-        count = len(tokens)
-        for token in tokens:
-            await self.session.delete(token)
-        await self.session.commit()
-        return count
+        await self._commit()
+        return result.rowcount
+
+    async def delete_expired_tokens(self, include_revoked: bool = True) -> int:
+        """
+        Delete expired (and by default revoked) refresh tokens.
+        Returns count of deleted tokens.
+        """
+        condition = RefreshToken.expires_at < datetime.utcnow()
+        if include_revoked:
+            condition = or_(condition, RefreshToken.revoked == True)
+        result = await self.session.execute(delete(RefreshToken).where(condition))
+        await self._commit()
+        return result.rowcount
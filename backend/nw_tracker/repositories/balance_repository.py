@@ -1,8 +1,20 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from nw_tracker.models.models import Balance
+from sqlalchemy import case, delete, func, insert, null, select, tuple_
+from nw_tracker.models.models import Account, Balance, Currency, HistoryResolution
 from nw_tracker.logger import get_logger
 from nw_tracker.repositories.base_repository import GenericRepository
+from nw_tracker.utils.balance_utils import (
+    DEFAULT_MAX_POINTS,
+    compute_history_from_daily_deltas,
+    downsample_history,
+    sweep_balance_history
+)
+from nw_tracker.utils.rate_table import RateTable
 
 
 logger = get_logger()
@@ -12,11 +24,41 @@ class BalanceRepository(GenericRepository[Balance]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Balance)
 
-    async def get_all_balances_by_account_id(self, account_id: str):
+    async def get_all_balances_by_account_id(
+        self,
+        account_id: UUID | str,
+        limit: Optional[int] = None,
+        after: Optional[tuple[date, datetime, UUID]] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> list[Balance]:
+        """
+        Get an account's balances, newest first.
+
+        Ordered by (date, created_at, id) descending, which the
+        ix_balances_account_date_created_id index serves directly. Pass the
+        sort key of the last row already seen as after to continue from it
+        (keyset pagination), so later pages cost the same as the first.
+
+        Args:
+            limit: Maximum number of balances to return (all when None)
+            after: (date, created_at, id) of the last balance on the previous page
+            from_date: Only balances on or after this date
+            to_date: Only balances on or before this date
+        """
         try:
-            result = await self.session.execute(
-                select(Balance).filter(Balance.account_uuid == account_id)
-            )
+            query = select(Balance).filter(Balance.account_uuid == UUID(str(account_id)))
+            if from_date is not None:
+                query = query.filter(Balance.date >= from_date)
+            if to_date is not None:
+                query = query.filter(Balance.date <= to_date)
+            if after is not None:
+                query = query.filter(tuple_(Balance.date, Balance.created_at, Balance.id) < tuple_(*after))
+            query = query.order_by(Balance.date.desc(), Balance.created_at.desc(), Balance.id.desc())
+            if limit is not None:
+                query = query.limit(limit)
+
+            result = await self.session.execute(query)
             return list(result.scalars().all())
         except Exception as e:
             logger.error(f"Database error while retrieving balances: {e}")
@@ -27,9 +69,158 @@ class BalanceRepository(GenericRepository[Balance]):
             result = await self.session.execute(
                 select(Balance)
                 .filter(Balance.account_uuid == account_id)
-                .order_by(Balance.date.desc())
+                .order_by(Balance.date.desc(), Balance.created_at.desc())
             )
             return result.scalars().first()
         except Exception as e:
             logger.error(f"Database error while retrieving latest balance: {e}")
             raise Exception(f"An error occurred while retrieving the latest balance for account ID: {account_id}.")
+
+    async def replace_balances_on_dates(self, account_id: UUID, amounts: dict[date, float]) -> int:
+        """
+        Upsert one balance per date for an account.
+
+        Existing balances on those dates are deleted and the new ones inserted
+        with a single executemany, so re-importing a statement replaces rather
+        than duplicates it. Does not commit; the caller owns the transaction.
+
+        Returns:
+            Number of balances written
+        """
+        if not amounts:
+            return 0
+        try:
+            await self.session.execute(
+                delete(Balance).where(Balance.account_uuid == account_id, Balance.date.in_(list(amounts)))
+            )
+            await self.session.execute(
+                insert(Balance),
+                [
+                    {"account_uuid": account_id, "date": balance_date, "amount": amount}
+                    for balance_date, amount in amounts.items()
+                ]
+            )
+            return len(amounts)
+        except Exception as e:
+            logger.error(f"Database error while importing balances: {e}")
+            raise Exception(f"An error occurred while importing balances for account ID: {account_id}.")
+
+    async def get_fill_forward_history(
+        self,
+        account_currencies: dict[UUID, Currency],
+        rate_table: Optional[RateTable] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        resolution: HistoryResolution = HistoryResolution.DAILY,
+        max_points: int = DEFAULT_MAX_POINTS
+    ) -> list[dict]:
+        """
+        Get the fill-forward GBP history summed over a set of accounts.
+
+        On PostgreSQL the fill-forward runs in the database and only the
+        per-(date, currency) deltas are returned. Other dialects (the SQLite
+        test engine) load the balance columns and sweep them in Python.
+        Either way, totals are converted per point with rate_table.
+
+        Args:
+            account_currencies: Map of account ID -> the account's currency
+            rate_table: Optional rates for currency conversion (non-GBP
+                accounts count their dates but not their amounts without one)
+            from_date: Optional start date filter (inclusive)
+            to_date: Optional end date filter (inclusive)
+            resolution: Bucket size for the returned points
+            max_points: Point budget when resolution is AUTO
+
+        Returns:
+            List of dicts with date, total_balance_gbp
+        """
+        if not account_currencies:
+            return []
+        try:
+            if self.session.bind.dialect.name == "postgresql":
+                result = await self.session.execute(
+                    self._daily_deltas_query(list(account_currencies), from_date, to_date)
+                )
+                return compute_history_from_daily_deltas(result.all(), rate_table, resolution, max_points)
+
+            history = await self._fill_forward_history_fallback(account_currencies, rate_table, from_date, to_date)
+            return downsample_history(history, resolution, max_points)
+        except Exception as e:
+            logger.error(f"Database error while computing balance history: {e}")
+            raise Exception("An error occurred while computing the balance history.")
+
+    @staticmethod
+    def _daily_deltas_query(
+        account_ids: list[UUID],
+        from_date: Optional[date],
+        to_date: Optional[date]
+    ):
+        """
+        Build the PostgreSQL daily deltas query.
+
+        Each account's balance series is turned into per-date deltas (LAG over
+        the account) and summed per (date, currency), so a running sum of the
+        rows is every account's latest balance on or before that date.
+        Deltas before from_date are folded into one seed row per currency
+        with a NULL date, ordered first.
+        """
+        # Latest created balance per account and date
+        latest = (
+            select(Balance.account_uuid, Account.currency, Balance.date, Balance.amount)
+            .join(Account, Account.id == Balance.account_uuid)
+            .filter(Balance.account_uuid.in_(account_ids))
+            .distinct(Balance.account_uuid, Balance.date)
+            .order_by(Balance.account_uuid, Balance.date, Balance.created_at.desc())
+        )
+        if to_date:
+            latest = latest.filter(Balance.date <= to_date)
+        latest = latest.subquery("latest")
+
+        previous_amount = func.lag(latest.c.amount).over(
+            partition_by=latest.c.account_uuid,
+            order_by=latest.c.date
+        )
+        deltas = select(
+            latest.c.date,
+            latest.c.currency,
+            (latest.c.amount - func.coalesce(previous_amount, 0.0)).label("delta")
+        ).subquery("deltas")
+
+        bucket_date = deltas.c.date
+        if from_date:
+            bucket_date = case((deltas.c.date < from_date, null()), else_=deltas.c.date)
+        bucket_date = bucket_date.label("date")
+
+        return (
+            select(bucket_date, deltas.c.currency, func.sum(deltas.c.delta).label("delta"))
+            .group_by(bucket_date, deltas.c.currency)
+            .order_by(bucket_date.asc().nulls_first())
+        )
+
+    async def _fill_forward_history_fallback(
+        self,
+        account_currencies: dict[UUID, Currency],
+        rate_table: Optional[RateTable],
+        from_date: Optional[date],
+        to_date: Optional[date]
+    ) -> list[dict]:
+        """Load only the balance columns and sweep them in Python."""
+        query = (
+            select(Balance.account_uuid, Balance.date, Balance.created_at, Balance.amount)
+            .filter(Balance.account_uuid.in_(list(account_currencies)))
+            .order_by(Balance.account_uuid, Balance.date, Balance.created_at)
+        )
+        if to_date:
+            query = query.filter(Balance.date <= to_date)
+        result = await self.session.execute(query)
+
+        balances_by_account = defaultdict(list)
+        for row in result.all():
+            balances_by_account[row.account_uuid].append(row)
+
+        return sweep_balance_history(
+            [(balances, account_currencies[account_id]) for account_id, balances in balances_by_account.items()],
+            from_date,
+            to_date,
+            rate_table
+        )
@@ -1,6 +1,11 @@
-from typing import Generic, List, Optional, Type, TypeVar
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Generic, Iterable, List, Optional, Type, TypeVar
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from pydantic import UUID4
 
 from nw_tracker.models.models import Base
@@ -10,6 +15,37 @@ logger = get_logger()
 
 T = TypeVar("ModelType", bound=Base)
 
+# Rows per multi-row INSERT, well inside PostgreSQL's and SQLite's bind parameter limits
+BULK_CHUNK_SIZE = 500
+
+# Sessions whose commits are currently deferred by unit_of_work()
+_unit_of_work_sessions: ContextVar[frozenset] = ContextVar("unit_of_work_sessions", default=frozenset())
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Defer repository commits on session to the end of the block.
+
+    Inside the block repository writes only flush, so a service call that
+    touches several repositories commits once (or rolls back everything on
+    error). Nested blocks on the same session join the outer one.
+    """
+    active = _unit_of_work_sessions.get()
+    if session in active:
+        yield session
+        return
+
+    token = _unit_of_work_sessions.set(active | {session})
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        _unit_of_work_sessions.reset(token)
+
 
 class GenericRepository(Generic[T]):
     """Generic repository implementation for basic CRUD operations"""
@@ -18,6 +54,13 @@ class GenericRepository(Generic[T]):
         self.session = session
         self.model_class = model_class
 
+    async def _commit(self) -> None:
+        """Commit, or only flush when a unit_of_work() owns the transaction."""
+        if self.session in _unit_of_work_sessions.get():
+            await self.session.flush()
+        else:
+            await self.session.commit()
+
     async def get_by_id(self, id: UUID4) -> Optional[T]:
         """Get an entity by ID"""
         result = await self.session.execute(
@@ -30,10 +73,20 @@ class GenericRepository(Generic[T]):
         result = await self.session.execute(select(self.model_class))
         return list(result.scalars().all())
 
+    async def get_by_ids(self, ids: Iterable[UUID4]) -> List[T]:
+        """Get the entities with the given IDs in one query (missing IDs are skipped)"""
+        ids = list(ids)
+        if not ids:
+            return []
+        result = await self.session.execute(
+            select(self.model_class).filter(self.model_class.id.in_(ids))
+        )
+        return list(result.scalars().all())
+
     async def create(self, entity: T) -> T:
         """Create a new entity"""
         self.session.add(entity)
-        await self.session.commit()
+        await self._commit()
         await self.session.refresh(entity)
 
         logger.info(f"Entity {entity} created successfully.")
@@ -49,29 +102,103 @@ class GenericRepository(Generic[T]):
         """
         # Merge the entity into this session
         self.session.add(entity)
-        await self.session.commit()
+        await self._commit()
         await self.session.refresh(entity)
         return entity
 
     async def delete(self, entity: T) -> None:
         """Delete an entity"""
         await self.session.delete(entity)
-        await self.session.commit()
+        await self._commit()
 
     async def delete_by_id(self, id: UUID4) -> bool:
-        """Delete an entity by ID"""
-        entity = await self.get_by_id(id)
-        if entity:
-            await self.session.delete(entity)
-            await self.session.commit()
-            return True
-        return False
+        """
+        Delete an entity by ID
+
+        Issues a single DELETE unless the model relies on ORM delete cascades
+        (e.g. users and accounts), which need the entity loaded.
+        """
+        if self._has_orm_cascades():
+            entity = await self.get_by_id(id)
+            if entity:
+                await self.session.delete(entity)
+                await self._commit()
+                return True
+            return False
+        return await self.bulk_delete_by_ids([id]) > 0
 
     async def exists_by_id(self, id: UUID4) -> bool:
         """Check if an entity exists by ID"""
         result = await self.session.execute(
-            select(self.model_class).filter(self.model_class.id == id)
+            select(self.model_class.id).filter(self.model_class.id == id).limit(1)
+        )
+        return result.scalars().first() is not None
+
+    async def bulk_create(self, entities: List[T]) -> List[T]:
+        """
+        Create several entities in one flush
+
+        The ORM batches the INSERTs; entities are not refreshed afterwards, so
+        server-generated values are only loaded on access.
+        """
+        if not entities:
+            return []
+        self.session.add_all(entities)
+        await self._commit()
+        logger.info(f"{len(entities)} {self.model_class.__name__} entities created successfully.")
+        return entities
+
+    async def bulk_upsert(self, rows: List[dict], index_elements: Optional[List[str]] = None) -> int:
+        """
+        Insert rows, updating the existing row on a conflict
+
+        Args:
+            rows: Column values per row; rows without an id get a new one
+            index_elements: Unique columns to detect conflicts on (default: primary key)
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+        index_elements = index_elements or [column.name for column in inspect(self.model_class).primary_key]
+        columns = self.model_class.__table__.columns
+        insert = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            chunk = [{"id": uuid4(), **row} if "id" in columns else row for row in rows[start:start + BULK_CHUNK_SIZE]]
+            statement = insert(self.model_class).values(chunk)
+            updated = [
+                name for name in chunk[0]
+                if name not in index_elements and name not in ("id", "created_at")
+            ]
+            if "updated_at" in columns and "updated_at" not in updated:
+                updated.append("updated_at")
+            statement = statement.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={name: statement.excluded[name] for name in updated}
+            )
+            await self.session.execute(statement)
+        await self._commit()
+        return len(rows)
+
+    async def bulk_delete_by_ids(self, ids: Iterable[UUID4]) -> int:
+        """
+        Delete the entities with the given IDs in one statement
+
+        Bypasses ORM cascades; the database's foreign keys apply.
+
+        Returns:
+            Number of rows deleted
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+        result = await self.session.execute(
+            delete(self.model_class).where(self.model_class.id.in_(ids))
         )
-        entity = result.scalars().first()
+        await self._commit()
+        return result.rowcount
 
-        return bool(entity)
+    def _has_orm_cascades(self) -> bool:
+        return any(relationship.cascade.delete for relationship in inspect(self.model_class).relationships)
@@ -0,0 +1,192 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from pydantic import UUID4
+from sqlalchemy import delete, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nw_tracker.models.budget_models import (
+    BUDGET_LEDGER_KEY,
+    BudgetCategoryModel,
+    BudgetMonthTotalModel,
+    ExpenseModel,
+    IncomeModel,
+)
+from nw_tracker.enums.budget_enums import BudgetKindEnum, FrequencyEnum
+from nw_tracker.logger import get_logger
+from nw_tracker.repositories.base_repository import GenericRepository
+
+
+logger = get_logger()
+
+# (frequency, year, month); recurring frequencies always use year and month 0
+LedgerPeriod = tuple[FrequencyEnum, int, int]
+
+
+class BudgetMonthTotalRepository(GenericRepository[BudgetMonthTotalModel]):
+    """
+    Maintains and reads the budget_month_totals ledger.
+
+    A write to an income or expense item only recomputes the ledger period
+    it belongs to (its month for one-time items, the recurring baseline
+    otherwise), and budget dashboards read a handful of ledger rows instead
+    of every item. Rows are upserted on the ledger's unique key, so two
+    refreshes of the same period racing each other cannot duplicate rows.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, BudgetMonthTotalModel)
+
+    @staticmethod
+    def period_for(item) -> LedgerPeriod:
+        """Ledger period of an income or expense item."""
+        return ledger_period(item.frequency, item.effective_year, item.effective_month)
+
+    async def refresh(self, user_id: UUID4, periods: Iterable[LedgerPeriod]) -> None:
+        """Recompute the user's ledger rows for the given periods from income and expenses."""
+        try:
+            for frequency, year, month in set(periods):
+                await self.session.execute(
+                    delete(BudgetMonthTotalModel).where(
+                        BudgetMonthTotalModel.user_id == user_id,
+                        BudgetMonthTotalModel.frequency == frequency,
+                        BudgetMonthTotalModel.year == year,
+                        BudgetMonthTotalModel.month == month,
+                    )
+                )
+
+                def criteria(model):
+                    filters = [model.user_id == user_id, model.frequency == frequency]
+                    if frequency == FrequencyEnum.ONE_TIME:
+                        filters += [_period_matches(model.effective_year, year), _period_matches(model.effective_month, month)]
+                    return filters
+
+                await self._write_totals(criteria)
+            await self._commit()
+        except Exception as e:
+            logger.error(f"Database error while refreshing budget ledger for user {user_id}: {e}")
+            raise Exception(f"An error occurred while refreshing the budget ledger for user ID: {user_id}.")
+
+    async def rebuild(self, user_ids: Optional[list[UUID4]] = None) -> int:
+        """
+        Rebuild ledger rows from the income and expenses tables.
+
+        Used for backfills, repairs and category deletes. Rebuilds every user
+        when user_ids is None. Flushes but does not commit; the caller owns
+        the transaction.
+
+        Returns:
+            Number of ledger rows written
+        """
+        try:
+            clear = delete(BudgetMonthTotalModel)
+            if user_ids is not None:
+                clear = clear.where(BudgetMonthTotalModel.user_id.in_(user_ids))
+            await self.session.execute(clear)
+
+            written = await self._write_totals(
+                lambda model: [] if user_ids is None else [model.user_id.in_(user_ids)]
+            )
+            await self.session.flush()
+            return written
+        except Exception as e:
+            logger.error(f"Database error while rebuilding budget ledger: {e}")
+            raise Exception("An error occurred while rebuilding the budget ledger.")
+
+    async def _write_totals(self, criteria) -> int:
+        """
+        Insert ledger rows summing the income and expenses matched by criteria(model).
+
+        Source rows are grouped by their raw period columns and folded into
+        ledger periods here, so recurring items with stray effective dates
+        still land on the single baseline row. A row that a concurrent
+        refresh inserted in the meantime is updated instead of duplicated.
+        """
+        totals = defaultdict(float)
+        for model, kind in ((IncomeModel, BudgetKindEnum.INCOME), (ExpenseModel, BudgetKindEnum.EXPENSE)):
+            category = ExpenseModel.category_id if model is ExpenseModel else None
+            group_by = [model.user_id, model.frequency, model.effective_year, model.effective_month]
+            if category is not None:
+                group_by.append(category)
+            result = await self.session.execute(
+                select(*group_by, func.sum(model.amount))
+                .filter(*criteria(model))
+                .group_by(*group_by)
+            )
+            for row in result.all():
+                user_id, frequency, *period, amount = row
+                category_id = period[2] if category is not None else None
+                item_period = ledger_period(frequency, period[0], period[1])
+                totals[(user_id, kind, *item_period, category_id)] += amount
+
+        rows = [
+            {
+                "user_id": user_id,
+                "kind": kind,
+                "frequency": frequency,
+                "year": year,
+                "month": month,
+                "category_id": category_id,
+                "amount": amount,
+            }
+            for (user_id, kind, frequency, year, month, category_id), amount in totals.items()
+        ]
+        if rows:
+            insert = pg_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert
+            statement = insert(BudgetMonthTotalModel)
+            statement = statement.on_conflict_do_update(
+                index_elements=BUDGET_LEDGER_KEY,
+                set_={
+                    "amount": statement.excluded.amount,
+                    "updated_at": func.now(),
+                }
+            )
+            await self.session.execute(statement, rows)
+        return len(rows)
+
+    async def get_totals(self, user_id: UUID4, start: tuple[int, int], end: tuple[int, int]) -> list:
+        """
+        Get the user's recurring baseline rows plus one-time rows from start to end inclusive.
+
+        start and end are (year, month). Rows carry kind, frequency, year,
+        month, category_id (None for income), category_name and amount.
+        """
+        try:
+            result = await self.session.execute(
+                select(
+                    BudgetMonthTotalModel.kind,
+                    BudgetMonthTotalModel.frequency,
+                    BudgetMonthTotalModel.year,
+                    BudgetMonthTotalModel.month,
+                    BudgetMonthTotalModel.category_id,
+                    BudgetCategoryModel.name.label("category_name"),
+                    BudgetMonthTotalModel.amount,
+                )
+                .outerjoin(BudgetCategoryModel, BudgetMonthTotalModel.category_id == BudgetCategoryModel.id)
+                .filter(BudgetMonthTotalModel.user_id == user_id)
+                .filter(or_(
+                    BudgetMonthTotalModel.frequency != FrequencyEnum.ONE_TIME,
+                    tuple_(BudgetMonthTotalModel.year, BudgetMonthTotalModel.month).between(
+                        tuple_(*start), tuple_(*end)
+                    ),
+                ))
+            )
+            return list(result.all())
+        except Exception as e:
+            logger.error(f"Database error while retrieving budget ledger for user {user_id}: {e}")
+            raise Exception(f"An error occurred while retrieving the budget ledger for user ID: {user_id}.")
+
+
+def ledger_period(frequency, effective_year: Optional[int], effective_month: Optional[int]) -> LedgerPeriod:
+    """Ledger period for an item's frequency (enum or value) and effective dates."""
+    frequency = FrequencyEnum(frequency)
+    if frequency != FrequencyEnum.ONE_TIME:
+        return frequency, 0, 0
+    return frequency, effective_year or 0, effective_month or 0
+
+
+def _period_matches(column, value: int):
+    # Ledger period 0 stands for an unset effective year/month
+    return column.is_(None) if value == 0 else column == value
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nw_tracker.models.models import ExchangeRateHistory
+from nw_tracker.repositories.base_repository import GenericRepository
+from nw_tracker.logger import get_logger
+
+logger = get_logger()
+
+
+class ExchangeRateHistoryRepository(GenericRepository[ExchangeRateHistory]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ExchangeRateHistory)
+
+    async def upsert_rates(self, rows: list[dict]) -> int:
+        """
+        Insert dated rates, replacing the rate of any (pair, date) already stored.
+
+        Args:
+            rows: Dicts with base_currency, target_currency, rate_date, rate
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+        try:
+            await self.bulk_upsert(rows, index_elements=["base_currency", "target_currency", "rate_date"])
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Database error while storing exchange rate history: {e}")
+            raise Exception("An error occurred while storing the exchange rate history.")
+
+    async def get_history(
+        self,
+        base_currency: str,
+        to_date: Optional[date] = None
+    ) -> dict[str, list[tuple[date, float]]]:
+        """
+        Get every stored rate for a base currency, grouped by target currency.
+
+        Returns:
+            Map of target currency -> (rate_date, rate) pairs in date order
+        """
+        try:
+            query = (
+                select(ExchangeRateHistory.target_currency, ExchangeRateHistory.rate_date, ExchangeRateHistory.rate)
+                .filter(ExchangeRateHistory.base_currency == base_currency)
+                .order_by(ExchangeRateHistory.target_currency, ExchangeRateHistory.rate_date)
+            )
+            if to_date:
+                query = query.filter(ExchangeRateHistory.rate_date <= to_date)
+            result = await self.session.execute(query)
+
+            history = defaultdict(list)
+            for target_currency, rate_date, rate in result.all():
+                history[target_currency].append((rate_date, rate))
+            return dict(history)
+        except Exception as e:
+            logger.error(f"Database error while retrieving exchange rate history: {e}")
+            raise Exception("An error occurred while retrieving the exchange rate history.")
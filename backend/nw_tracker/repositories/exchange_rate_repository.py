@@ -48,7 +48,7 @@ class ExchangeRateRepository(GenericRepository[ExchangeRate]):
             delete(ExchangeRate)
             .filter_by(base_currency=base_currency, target_currency=target_currency)
         )
-        await self.session.commit()
+        await self._commit()
         return result.rowcount > 0
 
     async def delete_all_by_base(self, base_currency: str) -> int:
@@ -57,5 +57,5 @@ class ExchangeRateRepository(GenericRepository[ExchangeRate]):
             delete(ExchangeRate)
             .filter_by(base_currency=base_currency)
         )
-        await self.session.commit()
+        await self._commit()
         return result.rowcount
@@ -15,22 +15,20 @@ class ExpenseRepository(GenericRepository[ExpenseModel]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, ExpenseModel)
 
-    async def get_all_for_user(self, user_id: UUID4) -> list[ExpenseModel]:
-        """Get all expense entries for a user with category relationships loaded."""
-        result = await self.session.execute(
-            select(ExpenseModel)
-            .options(selectinload(ExpenseModel.category))
-            .filter_by(user_id=user_id)
-        )
+    async def get_all_for_user(self, user_id: UUID4, with_category: bool = True) -> list[ExpenseModel]:
+        """Get all expense entries for a user, with category relationships loaded unless with_category is False."""
+        query = select(ExpenseModel).filter_by(user_id=user_id)
+        if with_category:
+            query = query.options(selectinload(ExpenseModel.category))
+        result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def get_by_id_and_user(self, expense_id: UUID4, user_id: UUID4) -> ExpenseModel | None:
-        """Get an expense entry by ID and user ID with category loaded."""
-        result = await self.session.execute(
-            select(ExpenseModel)
-            .options(selectinload(ExpenseModel.category))
-            .filter_by(id=expense_id, user_id=user_id)
-        )
+    async def get_by_id_and_user(self, expense_id: UUID4, user_id: UUID4, with_category: bool = True) -> ExpenseModel | None:
+        """Get an expense entry by ID and user ID, with category loaded unless with_category is False."""
+        query = select(ExpenseModel).filter_by(id=expense_id, user_id=user_id)
+        if with_category:
+            query = query.options(selectinload(ExpenseModel.category))
+        result = await self.session.execute(query)
         return result.scalars().first()
 
     async def belongs_to_user(self, expense_id: UUID4, user_id: UUID4) -> bool:
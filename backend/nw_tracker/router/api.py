@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from nw_tracker.router.v1 import auth, account, balance, account_group, enums, dashboard, account_types, budget_categories, income, expenses, budget_dashboard
+from nw_tracker.router.v1 import auth, account, balance, account_group, enums, dashboard, account_types, budget_categories, income, expenses, budget_dashboard, metrics
 
 router = APIRouter(
     prefix="/api/v1"
@@ -19,3 +19,4 @@ router.include_router(budget_categories.router)
 router.include_router(income.router)
 router.include_router(expenses.router)
 router.include_router(budget_dashboard.router)
+router.include_router(metrics.router)
@@ -3,9 +3,9 @@ from datetime import date
 from fastapi import APIRouter, Depends, Query
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
-from nw_tracker.config.database import get_db
+from nw_tracker.config.database import get_db, get_ro_db
 from nw_tracker.config.dependencies import get_current_active_user
-from nw_tracker.models.models import User
+from nw_tracker.models.models import HistoryResolution, User
 from nw_tracker.models.request_response_models import (
     AccountGroupSummaryResponse,
     AccountGroupWithHistoryResponse,
@@ -14,6 +14,7 @@ from nw_tracker.models.request_response_models import (
     AccountGroupResponse
 )
 from nw_tracker.services.account_group_service import AccountGroupService
+from nw_tracker.utils.balance_utils import DEFAULT_MAX_POINTS
 
 
 router = APIRouter(
@@ -38,11 +39,19 @@ async def get_all_account_groups(
     current_user: Annotated[User, Depends(get_current_active_user)],
     from_date: Optional[date] = Query(None, description="Filter balance history from this date (inclusive)"),
     to_date: Optional[date] = Query(None, description="Filter balance history to this date (inclusive)"),
-    db: AsyncSession = Depends(get_db)
+    resolution: HistoryResolution = Query(HistoryResolution.DAILY, description="Bucket size for history points (last point of each bucket is kept)"),
+    max_points: int = Query(DEFAULT_MAX_POINTS, ge=2, le=5000, description="Maximum history points per series when resolution is auto"),
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get all account groups for the authenticated user with summary data and balance history."""
     _service = AccountGroupService(db)
-    return await _service.get_all(current_user, from_date=from_date, to_date=to_date)
+    return await _service.get_all(
+        current_user,
+        from_date=from_date,
+        to_date=to_date,
+        resolution=resolution,
+        max_points=max_points
+    )
 
 
 @router.get("/{account_group_id}", response_model=AccountGroupWithHistoryResponse)
@@ -51,11 +60,20 @@ async def get_account_group(
     current_user: Annotated[User, Depends(get_current_active_user)],
     from_date: Optional[date] = Query(None, description="Filter balance history from this date (inclusive)"),
     to_date: Optional[date] = Query(None, description="Filter balance history to this date (inclusive)"),
-    db: AsyncSession = Depends(get_db)
+    resolution: HistoryResolution = Query(HistoryResolution.DAILY, description="Bucket size for history points (last point of each bucket is kept)"),
+    max_points: int = Query(DEFAULT_MAX_POINTS, ge=2, le=5000, description="Maximum history points per series when resolution is auto"),
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get an account group by ID with lite account list and balance history."""
     _service = AccountGroupService(db)
-    return await _service.get_account_group(current_user, account_group_id, from_date=from_date, to_date=to_date)
+    return await _service.get_account_group(
+        current_user,
+        account_group_id,
+        from_date=from_date,
+        to_date=to_date,
+        resolution=resolution,
+        max_points=max_points
+    )
 
 
 @router.put("/{account_group_id}", response_model=AccountGroupResponse)
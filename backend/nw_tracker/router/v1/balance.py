@@ -1,12 +1,14 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Annotated, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 from nw_tracker.config.database import get_db
 from nw_tracker.config.dependencies import get_current_active_user
 from nw_tracker.models.models import User
-from nw_tracker.models.request_response_models import BalanceCreateInitial, BalanceUpdateRequest, BalanceResponse
+from nw_tracker.models.request_response_models import BalanceCreateInitial, BalanceUpdateRequest, BalanceResponse, BalanceImportResponse
 from nw_tracker.services.balance_service import BalanceService
+from nw_tracker.utils.balance_import import detect_format
 
 
 router = APIRouter(
@@ -30,12 +32,46 @@ async def create_balance(
 @router.get("", response_model=list[BalanceResponse])
 async def get_all_balances(
     account_id: UUID4,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_active_user)],
+    limit: Annotated[Optional[int], Query(ge=1, le=1000)] = None,
+    cursor: Optional[str] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all balance entries for an account."""
+    """
+    Get balance entries for an account, newest first.
+
+    Optionally filtered to a from_date/to_date range. With limit, one page is
+    returned and the X-Next-Cursor header carries the cursor for the next
+    page (absent on the last page).
+    """
+    _service = BalanceService(db)
+    page = await _service.get_balance_page(current_user, account_id, limit, cursor, from_date, to_date)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+@router.post("/import", response_model=BalanceImportResponse)
+async def import_balances(
+    account_id: UUID4,
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    import_format: Annotated[Optional[Literal["csv", "ndjson"]], Query(alias="format")] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk import balances from a CSV (text/csv, header with date and amount
+    columns) or NDJSON (application/x-ndjson) request body. The format is
+    taken from the Content-Type unless ?format= is given.
+    """
+    import_format = import_format or detect_format(request.headers.get("content-type"))
+    if import_format is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass ?format=")
     _service = BalanceService(db)
-    return await _service.get_all_balances_for_account(current_user, account_id)
+    return await _service.import_balances(current_user, account_id, request.stream(), import_format)
 
 
 @router.get("/{balance_id}", response_model=BalanceResponse)
@@ -1,10 +1,14 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from nw_tracker.config.database import get_db
+from nw_tracker.config.database import get_ro_db
 from nw_tracker.config.dependencies import get_current_active_user
 from nw_tracker.models.models import User
-from nw_tracker.models.budget_request_response_models import BudgetSummaryResponse, BudgetTrendsResponse
+from nw_tracker.models.budget_request_response_models import (
+    BudgetProjectionResponse,
+    BudgetSummaryResponse,
+    BudgetTrendsResponse,
+)
 from nw_tracker.services.budget_dashboard_service import BudgetDashboardService
 
 
@@ -17,7 +21,7 @@ router = APIRouter(
 @router.get("/summary", response_model=BudgetSummaryResponse)
 async def get_current_month_summary(
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get budget summary for the current month."""
     _service = BudgetDashboardService(db)
@@ -29,7 +33,7 @@ async def get_monthly_summary(
     month: int,
     year: int,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get budget summary for a specific month."""
     _service = BudgetDashboardService(db)
@@ -40,7 +44,7 @@ async def get_monthly_summary(
 async def get_yearly_summary(
     year: int,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_ro_db)
 ):
     """Get budget summary for a specific year."""
     _service = BudgetDashboardService(db)
@@ -50,9 +54,22 @@ async def get_yearly_summary(
 @router.get("/trends", response_model=BudgetTrendsResponse)
 async def get_trends(
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_ro_db),
     months: int = Query(6, ge=1, le=24, description="Number of months to show trends for")
 ):
     """Get budget trends over the last N months."""
     _service = BudgetDashboardService(db)
     return await _service.get_trends(current_user, months)
+
+
+@router.get("/projection", response_model=BudgetProjectionResponse)
+async def get_projection(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_ro_db),
+    months: int = Query(120, ge=1, le=600, description="Number of months to project (up to 50 years)"),
+    include_net_worth: bool = Query(False, description="Compound the surplus onto the current dashboard total"),
+    annual_return_rate: float = Query(0.0, ge=-50, le=50, description="Annual return on net worth, in percent")
+):
+    """Project income, expenses and surplus forward over the next N months."""
+    _service = BudgetDashboardService(db)
+    return await _service.get_projection(current_user, months, include_net_worth, annual_return_rate)
@@ -1,6 +1,6 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends
-from nw_tracker.config.database import get_db
+from nw_tracker.config.database import get_ro_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from nw_tracker.services.enum_service import EnumService
 from nw_tracker.models.enums_models import AllEnumsResponse
@@ -13,7 +13,7 @@ router = APIRouter(
 
 
 @router.get("", response_model=AllEnumsResponse)
-async def get_enums(db: AsyncSession = Depends(get_db)) -> AllEnumsResponse:
+async def get_enums(db: AsyncSession = Depends(get_ro_db)) -> AllEnumsResponse:
     """
     Get all application enums for frontend dropdowns and validation.
 
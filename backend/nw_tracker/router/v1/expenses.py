@@ -1,5 +1,5 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 from nw_tracker.config.database import get_db
@@ -30,25 +30,30 @@ async def create_expense(
     return await _service.create_expense(current_user, data)
 
 
+INCLUDE_CATEGORY_DESCRIPTION = "Set to false to leave out the embedded category (category_id is still returned)"
+
+
 @router.get("", response_model=list[ExpenseResponse])
 async def get_all_expenses(
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    include_category: bool = Query(True, description=INCLUDE_CATEGORY_DESCRIPTION)
 ):
     """Get all expense entries for the authenticated user."""
     _service = ExpenseService(db)
-    return await _service.get_all(current_user)
+    return await _service.get_all(current_user, include_category=include_category)
 
 
 @router.get("/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: UUID4,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    include_category: bool = Query(True, description=INCLUDE_CATEGORY_DESCRIPTION)
 ):
     """Get an expense entry by ID."""
     _service = ExpenseService(db)
-    return await _service.get_expense(current_user, expense_id)
+    return await _service.get_expense(current_user, expense_id, include_category=include_category)
 
 
 @router.put("/{expense_id}", response_model=ExpenseResponse)
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from nw_tracker.config.dependencies import require_metrics_token
+from nw_tracker.models.request_response_models import PoolStatsResponse, ResultCacheStatsResponse
+from nw_tracker.utils.pool_metrics import get_all_pool_stats
+from nw_tracker.utils.result_cache import get_result_cache
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    # Process-wide counters: internal callers only, never regular users
+    dependencies=[Depends(require_metrics_token)],
+    include_in_schema=False
+)
+
+
+@router.get("/cache", response_model=ResultCacheStatsResponse)
+async def get_cache_metrics():
+    """Get hit/miss counters for the dashboard and group summary result cache."""
+    return await get_result_cache().get_stats()
+
+
+@router.get("/pools", response_model=list[PoolStatsResponse])
+async def get_pool_metrics():
+    """Get pool usage, overflow, acquire/pre-ping times and timeouts for the primary and replica engines."""
+    return get_all_pool_stats()
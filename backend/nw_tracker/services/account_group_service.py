@@ -5,7 +5,9 @@ from pydantic import UUID4
 from uuid import uuid4
 from nw_tracker.repositories.account_repository import AccountRepository
 from nw_tracker.repositories.account_group_repository import AccountGroupRepository
-from nw_tracker.models.models import Account, AccountGroup, User
+from nw_tracker.repositories.balance_repository import BalanceRepository
+from nw_tracker.repositories.account_daily_balance_repository import AccountDailyBalanceRepository
+from nw_tracker.models.models import Account, AccountGroup, HistoryResolution, User
 from nw_tracker.models.request_response_models import (
     AccountGroupCreateRequest,
     AccountGroupUpdateRequest,
@@ -18,11 +20,19 @@ from nw_tracker.models.request_response_models import (
     BalanceHistoryPoint,
     Currency
 )
+from nw_tracker.config.settings import get_settings
 from nw_tracker.logger import get_logger
-from nw_tracker.utils.balance_utils import compute_group_balance_history
+from nw_tracker.utils.balance_utils import (
+    DEFAULT_MAX_POINTS,
+    build_balance_matrix,
+    compute_history_from_daily_deltas
+)
+from nw_tracker.utils.rate_table import RateTable
+from nw_tracker.utils.result_cache import get_result_cache
 from nw_tracker.services.exchange_rate_service import ExchangeRateService
 
 logger = get_logger()
+settings = get_settings()
 
 
 class AccountGroupService():
@@ -30,6 +40,8 @@ class AccountGroupService():
     def __init__(self, session):
         self.repository = AccountGroupRepository(session)
         self.account_repository = AccountRepository(session)
+        self.balance_repository = BalanceRepository(session)
+        self.daily_balance_repository = AccountDailyBalanceRepository(session)
         self.exchange_rate_service = ExchangeRateService(session)
 
     async def create_account_group(self, user: User, account_group_data: AccountGroupCreateRequest) -> AccountGroupResponse:
@@ -58,7 +70,6 @@ class AccountGroupService():
             account_group_data_dict = account_group_data.model_dump()
 
             account_group_data_dict["user_id"] = user.id
-            account_group_data_dict["owner"] = user
 
             # Always set accounts to avoid lazy-loading issues
             account_group_data_dict["accounts"] = accounts if accounts else []
@@ -72,6 +83,7 @@ class AccountGroupService():
             logger.debug(f"Account group object created: {new_account_group}")
 
             account_group = await self.repository.create(new_account_group)
+            await get_result_cache().invalidate_user(user.id)
 
             logger.debug(f"Account group object created in DB: {account_group.id}")
 
@@ -96,12 +108,49 @@ class AccountGroupService():
         self,
         user: User,
         from_date: Optional[date] = None,
-        to_date: Optional[date] = None
+        to_date: Optional[date] = None,
+        resolution: HistoryResolution = HistoryResolution.DAILY,
+        max_points: int = DEFAULT_MAX_POINTS
+    ) -> list[AccountGroupSummaryResponse]:
+        """Get all account groups for user with aggregated summary data (cached per user)."""
+        return await get_result_cache().get_or_compute(
+            user.id,
+            "account_group_summaries",
+            (from_date, to_date, resolution, max_points),
+            lambda: self._compute_all(user, from_date, to_date, resolution, max_points)
+        )
+
+    async def _compute_all(
+        self,
+        user: User,
+        from_date: Optional[date],
+        to_date: Optional[date],
+        resolution: HistoryResolution,
+        max_points: int
     ) -> list[AccountGroupSummaryResponse]:
-        """Get all account groups for user with aggregated summary data."""
         try:
-            # Load account groups with accounts and balances
-            account_groups = await self.repository.get_all_for_user_with_balances(user.id)
+            # Load account groups with their accounts; balances are only loaded when
+            # the history has to be rebuilt from them (snapshots disabled)
+            matrix = None
+            if settings.balance_snapshots_enabled:
+                account_groups = await self.repository.get_all_for_user(user.id)
+            else:
+                account_groups = await self.repository.get_all_for_user_with_balances(user.id)
+            # Totals use the current rates, history points their own date's rates
+            rate_table = await self.exchange_rate_service.get_rate_history(to_date)
+
+            # Without snapshots, one account x date matrix is shared by every group's
+            # history; with them, every group's deltas come back from one query
+            snapshot_rows = None
+            if settings.balance_snapshots_enabled:
+                snapshot_rows = await self.daily_balance_repository.get_daily_deltas_by_group(
+                    user.id, [ag.id for ag in account_groups], from_date, to_date
+                )
+            else:
+                matrix = build_balance_matrix(
+                    [account for ag in account_groups for account in ag.accounts],
+                    rate_table=rate_table
+                )
 
             # Construct summary responses with aggregated data
             responses = []
@@ -112,23 +161,22 @@ class AccountGroupService():
                 total_gbp = 0.0
 
                 for account in ag.accounts:
-                    if account.balances:
-                        # Get the most recent balance (ordered by date desc, then created_at desc)
-                        latest_balance = sorted(account.balances, key=lambda b: (b.date, b.created_at), reverse=True)[0]
-                        # Convert to GBP
-                        amount_gbp = await self.exchange_rate_service.convert_to_gbp(
-                            latest_balance.amount,
-                            account.currency
-                        )
-                        total_gbp += amount_gbp
+                    if account.current_balance is not None:
+                        total_gbp += rate_table.to_gbp(account.current_balance, account.currency)
 
                 # Compute balance history with fill-forward logic
-                balance_history_raw = await compute_group_balance_history(
-                    list(ag.accounts),
-                    from_date=from_date,
-                    to_date=to_date,
-                    exchange_rate_service=self.exchange_rate_service
-                )
+                if matrix is None:
+                    balance_history_raw = compute_history_from_daily_deltas(
+                        snapshot_rows[ag.id], rate_table, resolution, max_points
+                    )
+                else:
+                    balance_history_raw = matrix.history(
+                        [account.id for account in ag.accounts],
+                        from_date=from_date,
+                        to_date=to_date,
+                        resolution=resolution,
+                        max_points=max_points
+                    )
                 balance_history = [
                     BalanceHistoryPoint(**point) for point in balance_history_raw
                 ]
@@ -156,26 +204,26 @@ class AccountGroupService():
         user: User,
         account_group_id: UUID4,
         from_date: Optional[date] = None,
-        to_date: Optional[date] = None
+        to_date: Optional[date] = None,
+        resolution: HistoryResolution = HistoryResolution.DAILY,
+        max_points: int = DEFAULT_MAX_POINTS
     ) -> AccountGroupWithHistoryResponse:
         """Get account group by ID with lite account list and balance history."""
         try:
-            # Repository eagerly loads accounts and balances in a single query
-            account_group = await self.repository.get_by_id_and_user_with_balances(account_group_id, user.id)
+            # Balances stay in the database: the group is loaded with its accounts
+            # only, and the history is aggregated by the balance repository
+            account_group = await self.repository.get_by_id_and_user(account_group_id, user.id)
             if account_group:
                 # Convert to lite account format with latest balance
                 account_responses = []
+                account_currencies = {}
+                rate_table = await self.exchange_rate_service.get_rate_history(to_date)
                 for account in account_group.accounts:
-                    # Get latest balance for this account
+                    account_currencies[account.id] = account.currency
+
                     latest_balance_gbp = 0.0
-                    if account.balances:
-                        # Get the most recent balance (ordered by date desc, then created_at desc)
-                        latest_balance = sorted(account.balances, key=lambda b: (b.date, b.created_at), reverse=True)[0]
-                        # Convert to GBP
-                        latest_balance_gbp = await self.exchange_rate_service.convert_to_gbp(
-                            latest_balance.amount,
-                            account.currency
-                        )
+                    if account.current_balance is not None:
+                        latest_balance_gbp = rate_table.to_gbp(account.current_balance, account.currency)
 
                     account_responses.append(
                         AccountInGroup(
@@ -188,12 +236,19 @@ class AccountGroupService():
                     )
 
                 # Compute balance history with fill-forward logic
-                balance_history_raw = await compute_group_balance_history(
-                    list(account_group.accounts),
-                    from_date=from_date,
-                    to_date=to_date,
-                    exchange_rate_service=self.exchange_rate_service
-                )
+                if settings.balance_snapshots_enabled:
+                    balance_history_raw = await self._get_snapshot_history(
+                        user, list(account_currencies), rate_table, from_date, to_date, resolution, max_points
+                    )
+                else:
+                    balance_history_raw = await self.balance_repository.get_fill_forward_history(
+                        account_currencies,
+                        rate_table=rate_table,
+                        from_date=from_date,
+                        to_date=to_date,
+                        resolution=resolution,
+                        max_points=max_points
+                    )
                 balance_history = [
                     BalanceHistoryPoint(**point) for point in balance_history_raw
                 ]
@@ -257,6 +312,7 @@ class AccountGroupService():
                 setattr(account_group, key, value)
 
             updated_account_group = await self.repository.update(account_group)
+            await get_result_cache().invalidate_user(user.id)
 
             # Pass UUIDs to avoid serialization issues with circular references
             return AccountGroupResponse(
@@ -282,8 +338,25 @@ class AccountGroupService():
                 raise HTTPException(status_code=404, detail="Account group not found")
             logger.debug(f"Account group exists, proceeding ...")
             await self.repository.delete(account_group)
+            await get_result_cache().invalidate_user(user.id)
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Error deleting account group: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    async def _get_snapshot_history(
+        self,
+        user: User,
+        account_ids: list[UUID4],
+        rate_table: RateTable,
+        from_date: Optional[date],
+        to_date: Optional[date],
+        resolution: HistoryResolution,
+        max_points: int
+    ) -> list[dict]:
+        """Read a group's history from the account_daily_balances table."""
+        rows = await self.daily_balance_repository.get_daily_deltas_for_accounts(
+            user.id, account_ids, from_date, to_date
+        )
+        return compute_history_from_daily_deltas(rows, rate_table, resolution, max_points)
@@ -4,7 +4,9 @@ from uuid import uuid4
 from datetime import datetime, date, timedelta
 from nw_tracker.repositories.account_repository import AccountRepository
 from nw_tracker.repositories.account_group_repository import AccountGroupRepository
-from nw_tracker.models.models import Account, AccountGroup, Balance, User
+from nw_tracker.repositories.account_daily_balance_repository import AccountDailyBalanceRepository
+from nw_tracker.repositories.base_repository import unit_of_work
+from nw_tracker.models.models import Account, Balance, User
 from nw_tracker.models.request_response_models import (
     AccountCreateRequest,
     AccountUpdateRequest,
@@ -14,6 +16,7 @@ from nw_tracker.models.request_response_models import (
     AccountStats
 )
 from nw_tracker.logger import get_logger
+from nw_tracker.utils.result_cache import get_result_cache
 
 logger = get_logger()
 
@@ -21,8 +24,10 @@ logger = get_logger()
 class AccountService():
 
     def __init__(self, session):
+        self.session = session
         self.repository = AccountRepository(session)
         self.account_group_repository = AccountGroupRepository(session)
+        self.daily_balance_repository = AccountDailyBalanceRepository(session)
 
     def _calculate_account_stats(self, account: Account) -> AccountStats:
         """Calculate account statistics including changes over different time periods."""
@@ -73,29 +78,27 @@ class AccountService():
             logger.debug(f"Creating account for user: {user.username}")
 
             balances = []
-            groups = []
-
-            if len(account_data.balances) > 0:
-                for balance in account_data.balances:
-                    balance_data = balance.model_dump()
-                    balance_data["id"] = uuid4()  # Explicitly set unique ID
-                    logger.debug(f"Creating balance with data: {balance_data}")
-                    balances.append(Balance(**balance_data))
-
-            if len(account_data.groups) > 0:
-                for group_id in account_data.groups:
-                    group = await self.account_group_repository.get_by_id(group_id)
-                    logger.debug(f"Adding group with ID: {group_id}")
-                    groups.append(AccountGroup(group))
-
+            for balance in account_data.balances:
+                balance_data = balance.model_dump()
+                balance_data["id"] = uuid4()  # Explicitly set unique ID
+                logger.debug(f"Creating balance with data: {balance_data}")
+                balances.append(Balance(**balance_data))
+
+            # One query for all requested groups; groups owned by other users are ignored
+            groups = [
+                group for group in await self.account_group_repository.get_by_ids(account_data.groups)
+                if group.user_id == user.id
+            ]
+            if len(groups) < len(account_data.groups):
+                logger.warning(f"Skipping unknown account groups for user {user.username}")
 
             account_data_dict = account_data.model_dump()
 
             account_data_dict["user_id"] = user.id
 
             # Always set relationships to avoid lazy loading issues
-            account_data_dict["balances"] = balances if balances else []
-            account_data_dict["groups"] = groups if groups else []
+            account_data_dict["balances"] = balances
+            account_data_dict["groups"] = groups
 
             logger.debug(f"Creating account with data: {account_data_dict}")
 
@@ -105,7 +108,15 @@ class AccountService():
 
             logger.debug(f"Account object created: {new_account}")
 
-            account = await self.repository.create(new_account)
+            # Account, balances, group links and snapshots commit together; the
+            # flush batches each table's INSERTs, so the statement count does
+            # not grow with the number of balances or groups
+            async with unit_of_work(self.session):
+                account = await self.repository.create(new_account)
+                if balances:
+                    await self.daily_balance_repository.rebuild([account.id])
+                    await self.repository.refresh_current_balances([account.id])
+            await get_result_cache().invalidate_user(user.id)
 
             # Refresh to get relationships loaded from database
             account = await self.repository.get_by_id_with_relations(account.id)
@@ -134,17 +145,12 @@ class AccountService():
 
     async def get_all(self, user: User) -> list[AccountResponse]:
         try:
-            # Repository already eager loads balances and groups
-            accounts = await self.repository.get_all_for_user(user.id)
+            # Current balances are denormalized onto the accounts, so balances are not loaded
+            accounts = await self.repository.get_all_for_user(user.id, with_balances=False)
 
-            # Construct responses with current balance (latest balance by date)
             response_list = []
             for account in accounts:
-                # Get the latest balance (most recent date)
-                current_balance = 0.0
-                if account.balances:
-                    latest_balance = max(account.balances, key=lambda b: (b.date, b.created_at))
-                    current_balance = latest_balance.amount
+                current_balance = account.current_balance if account.current_balance is not None else 0.0
 
                 response_list.append(
                     AccountResponse(
@@ -226,6 +232,7 @@ class AccountService():
                 setattr(account, key, value)
 
             updated_account = await self.repository.update(account)
+            await get_result_cache().invalidate_user(user.id)
 
             # Refresh to get relationships loaded
             updated_account = await self.repository.get_by_id_with_relations(updated_account.id)
@@ -270,6 +277,7 @@ class AccountService():
             # Toggle the exclusion flag
             account.is_excluded_from_totals = not account.is_excluded_from_totals
             updated_account = await self.repository.update(account)
+            await get_result_cache().invalidate_user(user.id)
 
             # Refresh to get relationships loaded
             updated_account = await self.repository.get_by_id_with_relations(updated_account.id)
@@ -310,6 +318,7 @@ class AccountService():
                 logger.warning(f"Account with ID {account_id} does not exist")
                 raise HTTPException(status_code=404, detail="Account not found")
             await self.repository.delete(account)
+            await get_result_cache().invalidate_user(user.id)
 
             return account
 
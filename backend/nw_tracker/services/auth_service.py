@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from uuid import UUID
 from fastapi import HTTPException, status
@@ -10,13 +11,17 @@ from nw_tracker.repositories.auth_repository import RefreshTokenRepository
 from nw_tracker.config.security import (
     verify_password,
     get_password_hash,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_access_token,
     decode_refresh_token
 )
+from nw_tracker.config.database import AsyncSessionLocal
 from nw_tracker.config.settings import get_settings
 from nw_tracker.logger import get_logger
+from nw_tracker.utils.password_hasher import PasswordHasherBusyError, get_password_hasher
+from nw_tracker.utils.user_cache import UserPrincipal, get_user_cache
 
 logger = get_logger()
 settings = get_settings()
@@ -30,6 +35,19 @@ class AuthService:
         self.user_repository = UserRepository(session)
         self.refresh_token_repository = RefreshTokenRepository(session)
 
+    @staticmethod
+    async def _hash_off_loop(func, *args):
+        """Run a bcrypt call on the password hashing pool, answering 503 when it is saturated."""
+        try:
+            return await get_password_hasher().run(func, *args)
+        except PasswordHasherBusyError as e:
+            logger.warning(f"Password hashing rejected: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
     async def register_user(self, username: str, email: str, password: str) -> User:
         """Register a new user with password hashing."""
         # Check if user already exists
@@ -55,7 +73,7 @@ class AuthService:
             )
 
         # Hash password
-        password_hash = get_password_hash(password)
+        password_hash = await self._hash_off_loop(get_password_hash, password)
 
         # Create user
         user = User(
@@ -90,16 +108,25 @@ class AuthService:
 
         # Verify password (if user has password_hash set)
         if user.password_hash:
-            if not verify_password(password, user.password_hash):
+            if not await self._hash_off_loop(verify_password, password, user.password_hash):
                 logger.warning(f"Failed login attempt for email: {email}")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Incorrect email or password"
                 )
 
+            # Upgrade hashes made with an old cost factor (saved with last_login below)
+            if password_needs_rehash(user.password_hash):
+                try:
+                    user.password_hash = await get_password_hasher().run(get_password_hash, password)
+                    logger.info(f"Rehashed password for user: {email}")
+                except PasswordHasherBusyError:
+                    logger.warning(f"Password hasher busy, skipping rehash for user: {email}")
+
         # Update last login
         user.last_login = datetime.utcnow()
         await self.user_repository.update(user)
+        await get_user_cache().invalidate(user.id)
 
         # Create tokens
         access_token = create_access_token(
@@ -167,8 +194,13 @@ class AuthService:
         else:
             logger.warning("Attempted to logout with non-existent token")
 
-    async def get_current_user_from_token(self, token: str) -> User:
-        """Validate access token and return current user."""
+    async def get_current_user_from_token(self, token: str) -> UserPrincipal:
+        """
+        Validate access token and return current user.
+
+        The user is served from the principal cache when possible, so a
+        valid token usually costs no database query.
+        """
         # Decode token
         payload = decode_access_token(token)
         if not payload:
@@ -189,15 +221,21 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Get user from database
-        user = await self.user_repository.get_by_id(UUID(user_id_str))
-        if not user:
-            logger.warning(f"Token for non-existent user: {user_id_str}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        # Get user from the cache, falling back to the database
+        user_id = UUID(user_id_str)
+        user_cache = get_user_cache()
+        user = await user_cache.get(user_id)
+        if user is None:
+            db_user = await self.user_repository.get_by_id(user_id)
+            if not db_user:
+                logger.warning(f"Token for non-existent user: {user_id_str}")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            user = UserPrincipal.from_user(db_user)
+            await user_cache.set(user)
 
         if not user.is_active:
             logger.warning(f"Inactive user attempted access: {user.email}")
@@ -207,3 +245,20 @@ class AuthService:
             )
 
         return user
+
+
+async def sweep_refresh_tokens_periodically(interval_seconds: float) -> None:
+    """
+    Delete expired and revoked refresh tokens every interval_seconds until cancelled.
+
+    Started from the application lifespan so the table stays bounded even
+    though every login adds a row.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                deleted = await RefreshTokenRepository(session).delete_expired_tokens()
+            logger.info(f"Refresh token sweep deleted {deleted} tokens")
+        except Exception as e:
+            logger.error(f"Refresh token sweep failed: {e}")
+        await asyncio.sleep(interval_seconds)
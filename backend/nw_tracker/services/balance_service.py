@@ -1,18 +1,33 @@
+from datetime import date, datetime
+from typing import AsyncIterable, Optional
+from uuid import UUID
 from fastapi import HTTPException
 from pydantic import UUID4
+from nw_tracker.config.settings import get_settings
 from nw_tracker.repositories.balance_repository import BalanceRepository
 from nw_tracker.repositories.account_repository import AccountRepository
+from nw_tracker.repositories.account_daily_balance_repository import AccountDailyBalanceRepository
+from nw_tracker.repositories.base_repository import unit_of_work
 from nw_tracker.models.models import Balance, User
-from nw_tracker.models.request_response_models import BalanceCreateRequest, BalanceUpdateRequest, BalanceResponse
+from nw_tracker.models.request_response_models import (
+    BalanceCreateRequest, BalanceUpdateRequest, BalanceResponse, BalancePageResponse,
+    BalanceImportError, BalanceImportResponse
+)
 from nw_tracker.logger import get_logger
+from nw_tracker.utils.balance_import import iter_balance_rows
+from nw_tracker.utils.pagination import decode_cursor, encode_cursor
+from nw_tracker.utils.result_cache import get_result_cache
 
 logger = get_logger()
+settings = get_settings()
 
 
 class BalanceService:
     def __init__(self, session):
+        self.session = session
         self.repository = BalanceRepository(session)
         self.account_repository = AccountRepository(session)
+        self.daily_balance_repository = AccountDailyBalanceRepository(session)
 
     async def create_balance(self, user: User, account_id: UUID4, balance_data: dict) -> BalanceResponse:
         try:
@@ -29,8 +44,14 @@ class BalanceService:
                 account_uuid=account_id
             )
 
-            balance = await self.repository.create(new_balance)
-            logger.debug(f"Balance object created in DB: {balance.id}")
+            # The balance, its snapshot rows and the account's current balance commit together
+            async with unit_of_work(self.session):
+                balance = await self.repository.create(new_balance)
+                logger.debug(f"Balance object created in DB: {balance.id}")
+
+                await self.daily_balance_repository.refresh_dates(account_id, [balance.date])
+                await self.account_repository.refresh_current_balances([account_id])
+            await get_result_cache().invalidate_user(user.id)
 
             # Manually construct response to avoid lazy-loading issues
             return BalanceResponse(
@@ -47,19 +68,65 @@ class BalanceService:
             logger.error(f"Error creating balance: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
-    async def get_all_balances_for_account(self, user: User, account_id: UUID4) -> list[BalanceResponse]:
-        try:
-            # Verify account belongs to user
-            if not await self.account_repository.account_belongs_to_user(account_id, user.id):
-                logger.warning(f"Account with ID {account_id} does not belong to user {user.username}")
-                raise HTTPException(status_code=403, detail="Account does not belong to user")
+    async def get_balance_page(
+        self,
+        user: User,
+        account_id: UUID4,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> BalancePageResponse:
+        """
+        Get a page of an account's balances, newest first.
+
+        next_cursor is set when more balances follow; pass it back as cursor
+        to fetch the next page. Without a limit every matching balance is
+        returned.
+        """
+        if not await self.account_repository.account_belongs_to_user(account_id, user.id):
+            logger.warning(f"Account with ID {account_id} does not belong to user {user.username}")
+            raise HTTPException(status_code=403, detail="Account does not belong to user")
+
+        after = None
+        if cursor is not None:
+            try:
+                raw_date, raw_created_at, raw_id = decode_cursor(cursor, 3)
+                after = (date.fromisoformat(raw_date), datetime.fromisoformat(raw_created_at), UUID(raw_id))
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
 
-            balances = await self.repository.get_all_balances_by_account_id(str(account_id))
-            return [BalanceResponse.model_validate(balance) for balance in balances]
+        try:
+            # One extra row tells us whether another page follows
+            balances = await self.repository.get_all_balances_by_account_id(
+                account_id,
+                limit=limit + 1 if limit is not None else None,
+                after=after,
+                from_date=from_date,
+                to_date=to_date
+            )
         except Exception as e:
             logger.error(f"Error retrieving balances: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
+        next_cursor = None
+        if limit is not None and len(balances) > limit:
+            balances = balances[:limit]
+            last = balances[-1]
+            next_cursor = encode_cursor((last.date, last.created_at, last.id))
+        return BalancePageResponse(
+            items=[BalanceResponse.model_validate(balance) for balance in balances],
+            next_cursor=next_cursor
+        )
+
+    async def _get_account_balance(self, account_id: UUID4, balance_id: UUID4) -> Balance:
+        """Get a balance of the account, raising 404 if it is missing or belongs to another account."""
+        balance = await self.repository.get_by_id(balance_id)
+        if not balance or str(balance.account_uuid) != str(account_id):
+            logger.warning(f"Balance with ID {balance_id} not found for account {account_id}")
+            raise HTTPException(status_code=404, detail="Balance not found")
+        return balance
+
     async def get_balance(self, user: User, account_id: UUID4, balance_id: UUID4) -> BalanceResponse:
         try:
             # Verify account belongs to user
@@ -67,11 +134,10 @@ class BalanceService:
                 logger.warning(f"Account with ID {account_id} does not belong to user {user.username}")
                 raise HTTPException(status_code=403, detail="Account does not belong to user")
 
-            balance = await self.repository.get_by_id(balance_id)
-            if not balance:
-                logger.warning(f"Balance with ID {balance_id} not found")
-                raise HTTPException(status_code=404, detail="Balance not found")
+            balance = await self._get_account_balance(account_id, balance_id)
             return BalanceResponse.model_validate(balance)
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error retrieving balance: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -83,22 +149,27 @@ class BalanceService:
                 logger.warning(f"Account with ID {account_id} does not belong to user {user.username}")
                 raise HTTPException(status_code=403, detail="Account does not belong to user")
 
-            balance = await self.repository.get_by_id(balance_id)
-            if not balance:
-                logger.warning(f"Balance with ID {balance_id} not found")
-                raise HTTPException(status_code=404, detail="Balance not found")
+            balance = await self._get_account_balance(account_id, balance_id)
 
+            previous_date = balance.date
             balance_data = balance_update_request.model_dump()
 
             # Update the balance object with the new data
             for key, value in balance_data.items():
                 setattr(balance, key, value)
 
-            updated_balance = await self.repository.update(balance)
-            logger.info(f"Balance with ID {balance_id} updated successfully")
+            async with unit_of_work(self.session):
+                updated_balance = await self.repository.update(balance)
+                logger.info(f"Balance with ID {balance_id} updated successfully")
+
+                await self.daily_balance_repository.refresh_dates(account_id, [previous_date, updated_balance.date])
+                await self.account_repository.refresh_current_balances([account_id])
+            await get_result_cache().invalidate_user(user.id)
 
             return BalanceResponse.model_validate(updated_balance)
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error updating balance: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -109,14 +180,73 @@ class BalanceService:
             logger.warning(f"Account with ID {account_id} does not belong to user {user.username}")
             raise HTTPException(status_code=403, detail="Account does not belong to user")
 
-        if not await self.repository.exists_by_id(balance_id):
-            logger.warning(f"Balance with ID {balance_id} not found")
-            raise HTTPException(status_code=404, detail="Balance not found")
+        balance = await self._get_account_balance(account_id, balance_id)
 
         try:
-            await self.repository.delete_by_id(balance_id)
-            logger.info(f"Balance with ID {balance_id} deleted successfully")
+            balance_date = balance.date
+            async with unit_of_work(self.session):
+                await self.repository.delete(balance)
+                logger.info(f"Balance with ID {balance_id} deleted successfully")
+
+                await self.daily_balance_repository.refresh_dates(account_id, [balance_date])
+                await self.account_repository.refresh_current_balances([account_id])
+            await get_result_cache().invalidate_user(user.id)
             return True
         except Exception as e:
             logger.error(f"Error deleting balance: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    async def import_balances(
+        self,
+        user: User,
+        account_id: UUID4,
+        chunks: AsyncIterable[bytes],
+        import_format: str
+    ) -> BalanceImportResponse:
+        """
+        Import balances from a streamed CSV or NDJSON body.
+
+        Rows are validated as they arrive and written in batches, so the file
+        is never held in memory. A balance on a date that already has one
+        replaces it. Invalid rows are reported by line number and skipped; the
+        valid rows are committed together, then the account's snapshots are
+        rebuilt once.
+        """
+        if not await self.account_repository.account_belongs_to_user(account_id, user.id):
+            logger.warning(f"Account with ID {account_id} does not belong to user {user.username}")
+            raise HTTPException(status_code=403, detail="Account does not belong to user")
+
+        imported = 0
+        failed = 0
+        errors: list[BalanceImportError] = []
+        batch: dict[date, float] = {}
+        try:
+            async with unit_of_work(self.session):
+                async for line, values, error in iter_balance_rows(chunks, import_format):
+                    if error is not None:
+                        failed += 1
+                        if len(errors) < settings.balance_import_max_errors:
+                            errors.append(BalanceImportError(line=line, error=error))
+                        continue
+                    balance_date, amount = values
+                    # A later row for the same date wins, as it would across batches
+                    batch[balance_date] = amount
+                    if len(batch) >= settings.balance_import_batch_size:
+                        imported += await self.repository.replace_balances_on_dates(account_id, batch)
+                        batch = {}
+                imported += await self.repository.replace_balances_on_dates(account_id, batch)
+
+                if imported:
+                    await self.daily_balance_repository.rebuild([account_id])
+                    await self.account_repository.refresh_current_balances([account_id])
+        except ValueError as e:
+            logger.warning(f"Rejected balance import for account {account_id}: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error importing balances: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+        if imported:
+            await get_result_cache().invalidate_user(user.id)
+        logger.info(f"Imported {imported} balances into account {account_id} ({failed} rows failed)")
+        return BalanceImportResponse(imported=imported, failed=failed, errors=errors)
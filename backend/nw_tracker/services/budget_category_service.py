@@ -1,7 +1,9 @@
 from fastapi import HTTPException
 from pydantic import UUID4
 from uuid import uuid4
+from nw_tracker.repositories.base_repository import unit_of_work
 from nw_tracker.repositories.budget_category_repository import BudgetCategoryRepository
+from nw_tracker.repositories.budget_month_total_repository import BudgetMonthTotalRepository
 from nw_tracker.models.budget_models import BudgetCategoryModel
 from nw_tracker.models.budget_request_response_models import (
     BudgetCategoryCreateRequest,
@@ -17,7 +19,9 @@ logger = get_logger()
 
 class BudgetCategoryService():
     def __init__(self, session):
+        self.session = session
         self.repository = BudgetCategoryRepository(session)
+        self.ledger_repository = BudgetMonthTotalRepository(session)
 
     async def create_category(self, user: User, category_data: BudgetCategoryCreateRequest) -> BudgetCategoryResponse:
         """Create a new budget category."""
@@ -150,7 +154,10 @@ class BudgetCategoryService():
                 logger.warning(f"Category with ID {category_id} does not exist")
                 raise HTTPException(status_code=404, detail="Category not found")
 
-            await self.repository.delete(category)
+            # Deleting a category deletes its expenses, which can touch any ledger period
+            async with unit_of_work(self.session):
+                await self.repository.delete(category)
+                await self.ledger_repository.rebuild([user.id])
         except HTTPException:
             raise
         except Exception as e:
@@ -2,17 +2,20 @@ from datetime import datetime, date
 from fastapi import HTTPException
 from pydantic import UUID4
 from collections import defaultdict
-from nw_tracker.repositories.income_repository import IncomeRepository
-from nw_tracker.repositories.expense_repository import ExpenseRepository
+from nw_tracker.repositories.budget_month_total_repository import BudgetMonthTotalRepository
+from nw_tracker.services.dashboard_service import DashboardService
 from nw_tracker.models.budget_request_response_models import (
     BudgetSummaryResponse,
     BudgetTrendsResponse,
     BudgetTrendMonth,
+    BudgetProjectionMonth,
+    BudgetProjectionResponse,
     ExpenseBreakdownItem,
 )
 from nw_tracker.models.models import User
-from nw_tracker.enums.budget_enums import FrequencyEnum
+from nw_tracker.enums.budget_enums import BudgetKindEnum, FrequencyEnum
 from nw_tracker.logger import get_logger
+from nw_tracker.utils.budget_projection import compound_net_worth, months_after, project_budget
 
 
 logger = get_logger()
@@ -20,33 +23,28 @@ logger = get_logger()
 
 class BudgetDashboardService():
     def __init__(self, session):
-        self.income_repository = IncomeRepository(session)
-        self.expense_repository = ExpenseRepository(session)
+        self.ledger_repository = BudgetMonthTotalRepository(session)
+        self.dashboard_service = DashboardService(session)
 
     async def calculate_monthly_summary(self, user: User, month: int, year: int) -> BudgetSummaryResponse:
         """Calculate budget summary for a specific month."""
         try:
             logger.debug(f"Calculating budget summary for user {user.username} - {month}/{year}")
 
-            # Get all monthly income
-            monthly_income = await self.income_repository.get_monthly_income(user.id)
-            total_monthly_income = sum(income.amount for income in monthly_income)
+            # Monthly baselines plus this month's one-time rows from the budget ledger
+            rows = await self.ledger_repository.get_totals(user.id, (year, month), (year, month))
 
-            # Get one-time income for this month
-            one_time_income = await self.income_repository.get_one_time_for_month(user.id, month, year)
-            total_one_time_income = sum(income.amount for income in one_time_income)
-
-            # Get all monthly expenses
-            monthly_expenses = await self.expense_repository.get_monthly_expenses(user.id)
-            total_monthly_expenses = sum(expense.amount for expense in monthly_expenses)
-
-            # Get one-time expenses for this month
-            one_time_expenses = await self.expense_repository.get_one_time_for_month(user.id, month, year)
-            total_one_time_expenses = sum(expense.amount for expense in one_time_expenses)
-
-            # Calculate totals
-            total_income = total_monthly_income + total_one_time_income
-            total_expenses = total_monthly_expenses + total_one_time_expenses
+            total_income = 0.0
+            category_totals = defaultdict(float)
+            for row in rows:
+                if row.frequency == FrequencyEnum.YEARLY:
+                    continue
+                if row.kind == BudgetKindEnum.INCOME:
+                    total_income += row.amount
+                else:
+                    category_totals[row.category_name or "Uncategorized"] += row.amount
+
+            total_expenses = sum(category_totals.values())
             surplus_deficit = total_income - total_expenses
 
             # Calculate savings rate
@@ -54,13 +52,6 @@ class BudgetDashboardService():
             if total_income > 0:
                 savings_rate = (surplus_deficit / total_income) * 100
 
-            # Calculate expense breakdown by category
-            all_expenses = monthly_expenses + one_time_expenses
-            category_totals = defaultdict(float)
-            for expense in all_expenses:
-                category_name = expense.category.name if expense.category else "Uncategorized"
-                category_totals[category_name] += expense.amount
-
             expense_breakdown = [
                 ExpenseBreakdownItem(
                     category_name=category,
@@ -96,31 +87,17 @@ class BudgetDashboardService():
         try:
             logger.debug(f"Calculating yearly budget summary for user {user.username} - {year}")
 
-            # Get all income for user
-            all_income = await self.income_repository.get_all_for_user(user.id)
+            # Recurring baselines plus every one-time row in the year from the budget ledger
+            rows = await self.ledger_repository.get_totals(user.id, (year, 0), (year, 12))
             yearly_income = 0.0
-
-            for income in all_income:
-                if income.frequency == FrequencyEnum.YEARLY:
-                    yearly_income += income.amount
-                elif income.frequency == FrequencyEnum.MONTHLY:
-                    yearly_income += income.amount * 12
-                elif income.frequency == FrequencyEnum.ONE_TIME:
-                    if income.effective_year == year:
-                        yearly_income += income.amount
-
-            # Get all expenses for user
-            all_expenses = await self.expense_repository.get_all_for_user(user.id)
             yearly_expenses = 0.0
 
-            for expense in all_expenses:
-                if expense.frequency == FrequencyEnum.YEARLY:
-                    yearly_expenses += expense.amount
-                elif expense.frequency == FrequencyEnum.MONTHLY:
-                    yearly_expenses += expense.amount * 12
-                elif expense.frequency == FrequencyEnum.ONE_TIME:
-                    if expense.effective_year == year:
-                        yearly_expenses += expense.amount
+            for row in rows:
+                amount = row.amount * 12 if row.frequency == FrequencyEnum.MONTHLY else row.amount
+                if row.kind == BudgetKindEnum.INCOME:
+                    yearly_income += amount
+                else:
+                    yearly_expenses += amount
 
             surplus_deficit = yearly_income - yearly_expenses
             savings_rate = 0.0
@@ -139,57 +116,111 @@ class BudgetDashboardService():
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
     async def get_trends(self, user: User, months: int = 6) -> BudgetTrendsResponse:
-        """Get budget trends over the last N months."""
+        """
+        Get budget trends over the last N months.
+
+        Reads the monthly baselines and the one-time rows for the whole range
+        from the budget ledger in one query, so the cost does not grow with
+        months.
+        """
         try:
             logger.debug(f"Calculating budget trends for user {user.username} - last {months} months")
 
-            today = date.today()
-            trends = []
-
-            for i in range(months):
-                # Calculate month and year for each period
-                month = today.month - i
-                year = today.year
-
-                if month <= 0:
-                    month += 12
-                    year -= 1
-
-                # Get monthly income
-                monthly_income = await self.income_repository.get_monthly_income(user.id)
-                total_monthly_income = sum(income.amount for income in monthly_income)
-
-                # Get one-time income for this month
-                one_time_income = await self.income_repository.get_one_time_for_month(user.id, month, year)
-                total_one_time_income = sum(income.amount for income in one_time_income)
-
-                # Get monthly expenses
-                monthly_expenses = await self.expense_repository.get_monthly_expenses(user.id)
-                total_monthly_expenses = sum(expense.amount for expense in monthly_expenses)
-
-                # Get one-time expenses for this month
-                one_time_expenses = await self.expense_repository.get_one_time_for_month(user.id, month, year)
-                total_one_time_expenses = sum(expense.amount for expense in one_time_expenses)
-
-                # Calculate totals
-                total_income = total_monthly_income + total_one_time_income
-                total_expenses = total_monthly_expenses + total_one_time_expenses
-                surplus_deficit = total_income - total_expenses
+            periods = trailing_months(date.today(), months)
+            rows = await self.ledger_repository.get_totals(user.id, periods[0], periods[-1])
+
+            monthly_income = monthly_expenses = 0.0
+            one_time_income = defaultdict(float)
+            one_time_expenses = defaultdict(float)
+            for row in rows:
+                is_income = row.kind == BudgetKindEnum.INCOME
+                if row.frequency == FrequencyEnum.MONTHLY:
+                    if is_income:
+                        monthly_income += row.amount
+                    else:
+                        monthly_expenses += row.amount
+                elif row.frequency == FrequencyEnum.ONE_TIME:
+                    totals = one_time_income if is_income else one_time_expenses
+                    totals[(row.year, row.month)] += row.amount
 
+            trends = []
+            for year, month in periods:
+                total_income = monthly_income + one_time_income[(year, month)]
+                total_expenses = monthly_expenses + one_time_expenses[(year, month)]
                 trends.append(
                     BudgetTrendMonth(
                         month=month,
                         year=year,
                         income=total_income,
                         expenses=total_expenses,
-                        surplus_deficit=surplus_deficit,
+                        surplus_deficit=total_income - total_expenses,
                     )
                 )
 
-            # Reverse to show oldest to newest
-            trends.reverse()
-
             return BudgetTrendsResponse(months=trends)
         except Exception as e:
             logger.error(f"Error calculating budget trends: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+    async def get_projection(
+        self,
+        user: User,
+        months: int = 120,
+        include_net_worth: bool = False,
+        annual_return_rate: float = 0.0
+    ) -> BudgetProjectionResponse:
+        """
+        Project the budget forward from next month.
+
+        Each month's income and expenses come from the recurring baselines and
+        any one-time entries in the horizon (see project_budget). With
+        include_net_worth, the current dashboard total is grown at
+        annual_return_rate (a percentage) and each month's surplus is added.
+        """
+        try:
+            logger.debug(f"Projecting budget for user {user.username} - next {months} months")
+
+            today = date.today()
+            periods = months_after(today.year, today.month, months)
+            rows = await self.ledger_repository.get_totals(user.id, periods[0], periods[-1])
+
+            income, expenses = project_budget(rows, periods[0], months)
+            surplus = income - expenses
+            cumulative = surplus.cumsum()
+
+            starting_net_worth = None
+            net_worth = [None] * months
+            if include_net_worth:
+                summary = await self.dashboard_service.get_dashboard_summary(user)
+                starting_net_worth = summary.total_balance_gbp
+                net_worth = compound_net_worth(surplus, starting_net_worth, annual_return_rate / 100).tolist()
+
+            return BudgetProjectionResponse(
+                annual_return_rate=annual_return_rate,
+                starting_net_worth=starting_net_worth,
+                months=[
+                    BudgetProjectionMonth(
+                        month=month,
+                        year=year,
+                        income=month_income,
+                        expenses=month_expenses,
+                        surplus_deficit=month_surplus,
+                        cumulative_surplus=month_cumulative,
+                        projected_net_worth=month_net_worth,
+                    )
+                    for (year, month), month_income, month_expenses, month_surplus, month_cumulative, month_net_worth
+                    in zip(periods, income.tolist(), expenses.tolist(), surplus.tolist(), cumulative.tolist(), net_worth)
+                ],
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error projecting budget: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+def trailing_months(today: date, months: int) -> list[tuple[int, int]]:
+    """(year, month) for the last N months up to and including today's month, oldest first."""
+    current = today.year * 12 + today.month - 1
+    return [(index // 12, index % 12 + 1) for index in range(current - months + 1, current + 1)]
@@ -5,7 +5,8 @@ from collections import defaultdict
 
 from nw_tracker.repositories.account_repository import AccountRepository
 from nw_tracker.repositories.account_group_repository import AccountGroupRepository
-from nw_tracker.models.models import Account, Currency, User
+from nw_tracker.repositories.account_daily_balance_repository import AccountDailyBalanceRepository
+from nw_tracker.models.models import Account, Currency, HistoryResolution, User
 from nw_tracker.models.request_response_models import (
     DashboardSummaryResponse,
     GroupBalanceSummary,
@@ -14,11 +15,19 @@ from nw_tracker.models.request_response_models import (
     GroupHistorySeries,
     BalanceHistoryPoint
 )
+from nw_tracker.config.settings import get_settings
 from nw_tracker.logger import get_logger
-from nw_tracker.utils.balance_utils import compute_total_balance_history, compute_group_balance_history
+from nw_tracker.utils.balance_utils import (
+    DEFAULT_MAX_POINTS,
+    compute_history_from_daily_deltas,
+    compute_multi_series_history
+)
+from nw_tracker.utils.rate_table import RateTable
+from nw_tracker.utils.result_cache import get_result_cache
 from nw_tracker.services.exchange_rate_service import ExchangeRateService
 
 logger = get_logger()
+settings = get_settings()
 
 
 class DashboardService:
@@ -26,26 +35,35 @@ class DashboardService:
     def __init__(self, session):
         self.account_repository = AccountRepository(session)
         self.group_repository = AccountGroupRepository(session)
+        self.daily_balance_repository = AccountDailyBalanceRepository(session)
         self.exchange_rate_service = ExchangeRateService(session)
 
     async def get_dashboard_summary(self, user: User) -> DashboardSummaryResponse:
-        """Get main dashboard data with totals and distributions."""
+        """Get main dashboard data with totals and distributions (cached per user)."""
+        return await get_result_cache().get_or_compute(
+            user.id, "dashboard_summary", (), lambda: self._compute_dashboard_summary(user)
+        )
+
+    async def _compute_dashboard_summary(self, user: User) -> DashboardSummaryResponse:
         try:
-            # Get all accounts with balances
-            accounts = await self.account_repository.get_all_for_user(user.id)
+            # Get all accounts (current balances are denormalized onto them) and one
+            # rate snapshot for the conversions
+            accounts = await self.account_repository.get_all_for_user(user.id, with_balances=False)
+            rate_table = await self.exchange_rate_service.get_rate_table()
 
             # Calculate total balances (converted to GBP)
             # Filter out accounts excluded from totals for the main total only
             total_gbp = 0.0
             balances_by_type = defaultdict(float)
+            latest_gbp_by_account = {}
 
             for account in accounts:
-                if account.balances:
-                    latest_balance = max(account.balances, key=lambda b: (b.date, b.created_at))
-                    amount = latest_balance.amount
+                if account.current_balance is not None:
+                    amount = account.current_balance
 
                     # Convert to GBP
-                    amount_gbp = await self.exchange_rate_service.convert_to_gbp(amount, account.currency)
+                    amount_gbp = rate_table.to_gbp(amount, account.currency)
+                    latest_gbp_by_account[account.id] = amount_gbp
 
                     # Only add to total if not excluded
                     if not account.is_excluded_from_totals:
@@ -54,21 +72,13 @@ class DashboardService:
                     # Always include in account type breakdown
                     balances_by_type[account.account_type] += amount_gbp
 
-            # Get all groups with their latest balances (include all accounts, even excluded ones)
-            groups = await self.group_repository.get_all_for_user_with_balances(user.id)
+            # Group totals reuse the converted latest balances above (include all
+            # accounts, even excluded ones); only the membership is fetched
+            groups = await self.group_repository.get_all_for_user_with_account_ids(user.id)
             group_summaries = []
 
-            for group in groups:
-                group_gbp = 0.0
-
-                for account in group.accounts:
-                    if account.balances:
-                        latest_balance = max(account.balances, key=lambda b: (b.date, b.created_at))
-                        amount_gbp = await self.exchange_rate_service.convert_to_gbp(
-                            latest_balance.amount,
-                            account.currency
-                        )
-                        group_gbp += amount_gbp
+            for group, account_ids in groups:
+                group_gbp = sum(latest_gbp_by_account.get(account_id, 0.0) for account_id in account_ids)
 
                 group_summaries.append(
                     GroupBalanceSummary(
@@ -102,41 +112,56 @@ class DashboardService:
         self,
         user: User,
         from_date: Optional[date] = None,
-        to_date: Optional[date] = None
+        to_date: Optional[date] = None,
+        resolution: HistoryResolution = HistoryResolution.DAILY,
+        max_points: int = DEFAULT_MAX_POINTS
+    ) -> DashboardHistoryResponse:
+        """Get historical data for line graph (cached per user and parameters)."""
+        return await get_result_cache().get_or_compute(
+            user.id,
+            "dashboard_history",
+            (from_date, to_date, resolution, max_points),
+            lambda: self._compute_dashboard_history(user, from_date, to_date, resolution, max_points)
+        )
+
+    async def _compute_dashboard_history(
+        self,
+        user: User,
+        from_date: Optional[date],
+        to_date: Optional[date],
+        resolution: HistoryResolution,
+        max_points: int
     ) -> DashboardHistoryResponse:
-        """Get historical data for line graph."""
         try:
-            # Get all accounts with balances
-            accounts = await self.account_repository.get_all_for_user(user.id)
-
-            # Compute total balance history across all accounts (excluding those marked as excluded)
-            # Only filter for total_history, not for group_histories
-            non_excluded_accounts = [acc for acc in accounts if not acc.is_excluded_from_totals]
-
-            total_history_raw = await compute_total_balance_history(
-                list(non_excluded_accounts),
-                from_date=from_date,
-                to_date=to_date,
-                exchange_rate_service=self.exchange_rate_service
-            )
+            # Get group membership only - balances are read per series below
+            groups = await self.group_repository.get_all_for_user_with_account_ids(user.id)
+            # Each point is converted at its own date's rates
+            rate_table = await self.exchange_rate_service.get_rate_history(to_date)
+
+            if settings.balance_snapshots_enabled:
+                total_history_raw, group_histories_raw = await self._get_snapshot_histories(
+                    user, groups, rate_table, from_date, to_date, resolution, max_points
+                )
+            else:
+                # Each account's series is computed once; the total excludes accounts
+                # marked as excluded from totals, group histories include them
+                accounts = await self.account_repository.get_all_for_user(user.id)
+                total_history_raw, group_histories_raw = compute_multi_series_history(
+                    accounts,
+                    {group.id: account_ids for group, account_ids in groups},
+                    from_date=from_date,
+                    to_date=to_date,
+                    rate_table=rate_table,
+                    resolution=resolution,
+                    max_points=max_points
+                )
             total_history = [
                 BalanceHistoryPoint(**point) for point in total_history_raw
             ]
 
-            # Get all groups and compute their histories (include all accounts, even excluded ones)
-            groups = await self.group_repository.get_all_for_user_with_balances(user.id)
             group_histories = []
-
-            for group in groups:
-                if not group.accounts:
-                    continue
-
-                group_history_raw = await compute_group_balance_history(
-                    list(group.accounts),
-                    from_date=from_date,
-                    to_date=to_date,
-                    exchange_rate_service=self.exchange_rate_service
-                )
+            for group, _ in groups:
+                group_history_raw = group_histories_raw[group.id]
 
                 if group_history_raw:  # Only add if there's history
                     group_histories.append(
@@ -155,3 +180,27 @@ class DashboardService:
         except Exception as e:
             logger.error(f"Error retrieving dashboard history: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    async def _get_snapshot_histories(
+        self,
+        user: User,
+        groups: list,
+        rate_table: RateTable,
+        from_date: Optional[date],
+        to_date: Optional[date],
+        resolution: HistoryResolution,
+        max_points: int
+    ) -> tuple[list[dict], dict]:
+        """Read the total and group histories from the account_daily_balances table."""
+        total_rows = await self.daily_balance_repository.get_daily_deltas_for_user(user.id, from_date, to_date)
+        total_history_raw = compute_history_from_daily_deltas(total_rows, rate_table, resolution, max_points)
+
+        # Every group's deltas come back from one query, split by group id
+        group_rows = await self.daily_balance_repository.get_daily_deltas_by_group(
+            user.id, [group.id for group, _ in groups], from_date, to_date
+        )
+        group_histories_raw = {
+            group_id: compute_history_from_daily_deltas(rows, rate_table, resolution, max_points)
+            for group_id, rows in group_rows.items()
+        }
+        return total_history_raw, group_histories_raw
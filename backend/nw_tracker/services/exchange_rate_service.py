@@ -1,13 +1,20 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import partial
 from typing import Dict, Optional
 import httpx
 from fastapi import HTTPException
 
 from nw_tracker.repositories.exchange_rate_repository import ExchangeRateRepository
+from nw_tracker.repositories.exchange_rate_history_repository import ExchangeRateHistoryRepository
 from nw_tracker.models.models import ExchangeRate, Currency
+from nw_tracker.config.database import AsyncSessionLocal, is_read_only
+from nw_tracker.config.settings import get_settings
 from nw_tracker.logger import get_logger
+from nw_tracker.utils.exchange_rate_cache import get_exchange_rate_cache
+from nw_tracker.utils.rate_table import HistoryArrays, RateHistory, RateTable, history_arrays
 
 logger = get_logger()
+settings = get_settings()
 
 # Fallback rates if API fails
 FALLBACK_RATES = {
@@ -16,15 +23,22 @@ FALLBACK_RATES = {
     "EUR": 1.15
 }
 
-# Class-level cache for exchange rates
-_cached_rates: Optional[Dict[str, float]] = None
+
+class ExchangeRateUnavailableError(Exception):
+    """Raised when neither the API nor the database has any exchange rates."""
 
 
 class ExchangeRateService:
     API_URL = "https://api.exchangerate-api.com/v4/latest/GBP"
+    # httpx transport for the rates API (None for the default network transport)
+    transport: Optional[httpx.AsyncBaseTransport] = None
 
-    def __init__(self, session):
+    def __init__(self, session, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.session = session
         self.repository = ExchangeRateRepository(session)
+        self.history_repository = ExchangeRateHistoryRepository(session)
+        if transport is not None:
+            self.transport = transport
 
     async def get_rates(self, base_currency: str = "GBP", force_refresh: bool = False) -> Dict[str, float]:
         """
@@ -36,10 +50,10 @@ class ExchangeRateService:
             if not force_refresh:
                 latest_rates = await self.repository.get_latest_rates(base_currency, max_age_hours=24)
                 if latest_rates:
-                    global _cached_rates
                     rates = {rate.target_currency: rate.rate for rate in latest_rates}
                     logger.info(f"Using cached exchange rates from {latest_rates[0].fetched_at}")
-                    _cached_rates = rates
+                    if base_currency == "GBP":
+                        await get_exchange_rate_cache().set(rates)
                     return rates
 
             # Fetch fresh rates from API
@@ -51,7 +65,7 @@ class ExchangeRateService:
     async def fetch_and_store_rates(self, base_currency: str) -> Dict[str, float]:
         """Fetch rates from public API and store in database."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=self.transport) as client:
                 response = await client.get(self.API_URL, timeout=10.0)
                 response.raise_for_status()
                 data = response.json()
@@ -67,22 +81,39 @@ class ExchangeRateService:
                 if currency in supported_currencies and currency != base_currency:
                     rates[currency] = rate
 
-            # Clear old rates and store new ones
-            await self.repository.delete_all_by_base(base_currency)
-            for target_currency, rate in rates.items():
-                from nw_tracker.utils.repository_utils import get_random_uuid
-                exchange_rate = ExchangeRate(
-                    id=get_random_uuid(),  # Explicitly set UUID to avoid duplicates
-                    base_currency=base_currency,
-                    target_currency=target_currency,
-                    rate=rate,
-                    fetched_at=datetime.now()
-                )
-                await self.repository.create(exchange_rate)
-
-            global _cached_rates
-            logger.info(f"Fetched and stored {len(rates)} exchange rates from API")
-            _cached_rates = rates
+            if is_read_only(self.session):
+                # Replica sessions cannot write; the background refresh stores rates
+                logger.info("Read-only session, not storing fetched exchange rates")
+            else:
+                # Clear old rates and store new ones
+                await self.repository.delete_all_by_base(base_currency)
+                for target_currency, rate in rates.items():
+                    from nw_tracker.utils.repository_utils import get_random_uuid
+                    exchange_rate = ExchangeRate(
+                        id=get_random_uuid(),  # Explicitly set UUID to avoid duplicates
+                        base_currency=base_currency,
+                        target_currency=target_currency,
+                        rate=rate,
+                        fetched_at=datetime.now()
+                    )
+                    await self.repository.create(exchange_rate)
+
+                # Keep today's rates in the append-only history as well
+                await self.history_repository.upsert_rates([
+                    {
+                        "base_currency": base_currency,
+                        "target_currency": target_currency,
+                        "rate_date": date.today(),
+                        "rate": rate
+                    }
+                    for target_currency, rate in rates.items()
+                ])
+                get_exchange_rate_cache().invalidate_history()
+
+            logger.info(f"Fetched {len(rates)} exchange rates from API")
+            if base_currency == "GBP":
+                # Also drops cached dashboard results if the rates changed
+                await get_exchange_rate_cache().set(rates)
             return rates
 
         except httpx.HTTPError as e:
@@ -103,41 +134,109 @@ class ExchangeRateService:
                 return {rate.target_currency: rate.rate for rate in last_known}
             return FALLBACK_RATES
 
+    async def get_cached_rates(self) -> Dict[str, float]:
+        """
+        Get the GBP rates from the process-wide cache.
+
+        Concurrent cold callers share one load. When no rates can be loaded
+        the fallback rates are cached briefly, so the load is retried after
+        EXCHANGE_RATE_RETRY_SECONDS instead of on every request.
+
+        The load may outlive this request (stale reads refresh in the
+        background), so it runs on its own session, never on self.session.
+        """
+        cache = get_exchange_rate_cache()
+        try:
+            return await cache.get(partial(load_rates_in_own_session, self.transport))
+        except Exception as e:
+            logger.error(f"Error loading exchange rates: {e}, using fallback rates")
+            await cache.set(FALLBACK_RATES, ttl_seconds=settings.exchange_rate_retry_seconds)
+            return FALLBACK_RATES
+
+    async def _load_rates(self) -> Dict[str, float]:
+        """Cache loader: like get_rates, but raises instead of returning the fallback rates."""
+        rates = await self.get_rates()
+        if rates is FALLBACK_RATES:
+            raise ExchangeRateUnavailableError("No exchange rates available from the API or database")
+        return rates
+
     async def convert_to_gbp(self, amount: float, currency: Currency) -> float:
         """
         Convert amount from given currency to GBP.
         If currency is GBP, returns amount unchanged.
         """
+        if currency == Currency.GBP:
+            return amount
+        return amount / await self.get_gbp_rate(currency)
+
+    async def get_gbp_rate(self, currency: Currency) -> float:
+        """
+        Get the rate for converting amounts in the given currency to GBP.
+
+        Rates are quoted as "1 GBP = X currency", so amount_gbp = amount / rate.
+        Callers converting many amounts in the same currency should look the
+        rate up once and divide, rather than calling convert_to_gbp per amount.
+        """
         try:
             if currency == Currency.GBP:
-                return amount
+                return 1.0
 
-            # Get rates if not cached
-            global _cached_rates
-            if _cached_rates is None:
-                _cached_rates = await self.get_rates()
+            rates = await self.get_cached_rates()
 
-            # Convert: if rate is "1 GBP = X USD", then amount_gbp = amount_usd / rate
             target_currency = currency.value
-            if target_currency in _cached_rates:
-                rate = _cached_rates[target_currency]
-                return amount / rate
+            if target_currency in rates:
+                return rates[target_currency]
             else:
                 logger.warning(f"No exchange rate found for {target_currency}, using fallback rate")
-                # Use fallback rate
-                if target_currency == "USD":
-                    return amount / 1.25
-                elif target_currency == "EUR":
-                    return amount / 1.15
-                return amount
+                return FALLBACK_RATES.get(target_currency, 1.0)
         except Exception as e:
-            logger.error(f"Error converting {amount} {currency} to GBP: {e}, using fallback")
-            # Use fallback conversion
+            logger.error(f"Error getting GBP rate for {currency}: {e}, using fallback")
             if currency == Currency.USD:
-                return amount / 1.25
+                return FALLBACK_RATES["USD"]
             elif currency == Currency.EUR:
-                return amount / 1.15
-            return amount
+                return FALLBACK_RATES["EUR"]
+            return 1.0
+
+    async def get_rate_table(self) -> RateTable:
+        """
+        Get an immutable snapshot of the GBP rates for every supported currency.
+
+        Fetch it once per request and pass it to loops that convert many
+        amounts; currencies without a known rate use the fallback rates.
+        """
+        rates = await self.get_cached_rates()
+
+        table = {}
+        for currency in Currency:
+            if currency == Currency.GBP:
+                continue
+            if currency.value in rates:
+                table[currency.value] = rates[currency.value]
+            else:
+                logger.warning(f"No exchange rate found for {currency.value}, using fallback rate")
+                table[currency.value] = FALLBACK_RATES.get(currency.value, 1.0)
+        return RateTable(table)
+
+    async def get_rate_history(self, to_date: Optional[date] = None) -> RateHistory:
+        """
+        Get the current rate snapshot plus every stored daily GBP rate up to to_date.
+
+        History engines use it to convert each point at its own date's rate.
+        The whole history is loaded and sorted once into the process-wide
+        rate cache and cut at to_date per request. Without stored history
+        this behaves like get_rate_table.
+        """
+        rate_table = await self.get_rate_table()
+        try:
+            arrays = await get_exchange_rate_cache().get_history(self._load_history)
+        except Exception as e:
+            logger.error(f"Error loading exchange rate history: {e}, using current rates")
+            arrays = {}
+        return RateHistory.from_arrays(rate_table.as_dict(), arrays, to_date)
+
+    async def _load_history(self) -> Dict[str, HistoryArrays]:
+        """History cache loader: every stored GBP rate as sorted arrays."""
+        return history_arrays(await self.history_repository.get_history("GBP"))
 
     async def get_rate(self, base_currency: str, target_currency: str) -> Optional[float]:
         """Get exchange rate for a specific currency pair."""
@@ -146,3 +245,25 @@ class ExchangeRateService:
 
         rates = await self.get_rates(base_currency)
         return rates.get(target_currency)
+
+
+async def load_rates_in_own_session(transport: Optional[httpx.AsyncBaseTransport] = None) -> Dict[str, float]:
+    """
+    Rate cache loader with a database session of its own.
+
+    The process-wide cache can run a load after the request that triggered
+    it has finished, so loads must not use a request's (possibly closed, or
+    read-only) session.
+    """
+    async with AsyncSessionLocal() as session:
+        return await ExchangeRateService(session, transport)._load_rates()
+
+
+async def refresh_rates_periodically(interval_seconds: float) -> None:
+    """
+    Keep the process-wide rate cache warm until cancelled.
+
+    Started from the application lifespan; each refresh uses its own
+    database session.
+    """
+    await get_exchange_rate_cache().run_refresher(load_rates_in_own_session, interval_seconds)
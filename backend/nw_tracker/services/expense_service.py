@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 from pydantic import UUID4
 from uuid import uuid4
+from nw_tracker.repositories.base_repository import unit_of_work
+from nw_tracker.repositories.budget_month_total_repository import BudgetMonthTotalRepository
 from nw_tracker.repositories.expense_repository import ExpenseRepository
 from nw_tracker.repositories.budget_category_repository import BudgetCategoryRepository
 from nw_tracker.models.budget_models import ExpenseModel
@@ -17,11 +19,41 @@ from nw_tracker.logger import get_logger
 
 logger = get_logger()
 
+# ExpenseResponse fields read straight off the ORM row; category is handled by the builder
+_EXPENSE_FIELDS = tuple(name for name in ExpenseResponse.model_fields if name != "category")
+
+
+class ExpenseResponseBuilder:
+    """
+    Builds ExpenseResponses with model_validate instead of field-by-field copies.
+
+    Each category is validated once per builder and the same
+    BudgetCategoryResponse is shared by every expense in it. With
+    include_category False the relationship is never touched, so it does
+    not need to be loaded.
+    """
+
+    def __init__(self, include_category: bool = True):
+        self.include_category = include_category
+        self._categories: dict[UUID4, BudgetCategoryResponse] = {}
+
+    def build(self, expense: ExpenseModel) -> ExpenseResponse:
+        data = {name: getattr(expense, name) for name in _EXPENSE_FIELDS}
+        if self.include_category and expense.category is not None:
+            category = self._categories.get(expense.category_id)
+            if category is None:
+                category = BudgetCategoryResponse.model_validate(expense.category)
+                self._categories[expense.category_id] = category
+            data["category"] = category
+        return ExpenseResponse.model_validate(data)
+
 
 class ExpenseService():
     def __init__(self, session):
+        self.session = session
         self.repository = ExpenseRepository(session)
         self.category_repository = BudgetCategoryRepository(session)
+        self.ledger_repository = BudgetMonthTotalRepository(session)
 
     def _validate_one_time_dates(self, frequency: str, effective_month: int | None, effective_year: int | None):
         """Validate that one-time expense entries have effective month and year."""
@@ -56,120 +88,45 @@ class ExpenseService():
             expense_data_dict["id"] = uuid4()
 
             new_expense = ExpenseModel(**expense_data_dict)
-            expense = await self.repository.create(new_expense)
+            async with unit_of_work(self.session):
+                expense = await self.repository.create(new_expense)
+                await self.ledger_repository.refresh(user.id, [self.ledger_repository.period_for(expense)])
 
             # Reload with category
             expense = await self.repository.get_by_id_and_user(expense.id, user.id)
 
-            category_response = BudgetCategoryResponse(
-                id=expense.category.id,
-                user_id=expense.category.user_id,
-                name=expense.category.name,
-                description=expense.category.description,
-                icon=expense.category.icon,
-                color=expense.category.color,
-                is_essential=expense.category.is_essential,
-                created_at=expense.category.created_at,
-                updated_at=expense.category.updated_at,
-            ) if expense.category else None
-
-            return ExpenseResponse(
-                id=expense.id,
-                user_id=expense.user_id,
-                description=expense.description,
-                amount=expense.amount,
-                frequency=expense.frequency.value,
-                category_id=expense.category_id,
-                effective_month=expense.effective_month,
-                effective_year=expense.effective_year,
-                created_at=expense.created_at,
-                updated_at=expense.updated_at,
-                category=category_response,
-            )
+            return ExpenseResponseBuilder().build(expense)
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Error creating expense entry: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
-    async def get_all(self, user: User) -> list[ExpenseResponse]:
-        """Get all expense entries for a user."""
+    async def get_all(self, user: User, include_category: bool = True) -> list[ExpenseResponse]:
+        """Get all expense entries for a user, leaving the categories out when include_category is False."""
         try:
-            expenses = await self.repository.get_all_for_user(user.id)
-
-            response_list = []
-            for expense in expenses:
-                category_response = BudgetCategoryResponse(
-                    id=expense.category.id,
-                    user_id=expense.category.user_id,
-                    name=expense.category.name,
-                    description=expense.category.description,
-                    icon=expense.category.icon,
-                    color=expense.category.color,
-                    is_essential=expense.category.is_essential,
-                    created_at=expense.category.created_at,
-                    updated_at=expense.category.updated_at,
-                ) if expense.category else None
-
-                response_list.append(
-                    ExpenseResponse(
-                        id=expense.id,
-                        user_id=expense.user_id,
-                        description=expense.description,
-                        amount=expense.amount,
-                        frequency=expense.frequency.value,
-                        category_id=expense.category_id,
-                        effective_month=expense.effective_month,
-                        effective_year=expense.effective_year,
-                        created_at=expense.created_at,
-                        updated_at=expense.updated_at,
-                        category=category_response,
-                    )
-                )
+            expenses = await self.repository.get_all_for_user(user.id, with_category=include_category)
 
-            return response_list
+            builder = ExpenseResponseBuilder(include_category)
+            return [builder.build(expense) for expense in expenses]
         except Exception as e:
             logger.error(f"Error retrieving expense entries: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
-    async def get_expense(self, user: User, expense_id: UUID4) -> ExpenseResponse:
-        """Get an expense entry by ID."""
+    async def get_expense(self, user: User, expense_id: UUID4, include_category: bool = True) -> ExpenseResponse:
+        """Get an expense entry by ID, leaving its category out when include_category is False."""
         try:
             # Verify expense belongs to user
             if not await self.repository.belongs_to_user(expense_id, user.id):
                 logger.warning(f"Expense with ID {expense_id} does not belong to user {user.username}")
                 raise HTTPException(status_code=403, detail="Expense does not belong to user")
 
-            expense = await self.repository.get_by_id_and_user(expense_id, user.id)
+            expense = await self.repository.get_by_id_and_user(expense_id, user.id, with_category=include_category)
             if not expense:
                 logger.warning(f"Expense with ID {expense_id} does not exist")
                 raise HTTPException(status_code=404, detail="Expense not found")
 
-            category_response = BudgetCategoryResponse(
-                id=expense.category.id,
-                user_id=expense.category.user_id,
-                name=expense.category.name,
-                description=expense.category.description,
-                icon=expense.category.icon,
-                color=expense.category.color,
-                is_essential=expense.category.is_essential,
-                created_at=expense.category.created_at,
-                updated_at=expense.category.updated_at,
-            ) if expense.category else None
-
-            return ExpenseResponse(
-                id=expense.id,
-                user_id=expense.user_id,
-                description=expense.description,
-                amount=expense.amount,
-                frequency=expense.frequency.value,
-                category_id=expense.category_id,
-                effective_month=expense.effective_month,
-                effective_year=expense.effective_year,
-                created_at=expense.created_at,
-                updated_at=expense.updated_at,
-                category=category_response,
-            )
+            return ExpenseResponseBuilder(include_category).build(expense)
         except HTTPException:
             raise
         except Exception as e:
@@ -202,40 +159,21 @@ class ExpenseService():
             self._validate_one_time_dates(new_frequency, new_effective_month, new_effective_year)
 
             # Update only non-None values
+            previous_period = self.ledger_repository.period_for(expense)
             update_data = expense_data.model_dump(exclude_none=True)
             for key, value in update_data.items():
                 setattr(expense, key, value)
 
-            updated_expense = await self.repository.update(expense)
+            async with unit_of_work(self.session):
+                updated_expense = await self.repository.update(expense)
+                await self.ledger_repository.refresh(
+                    user.id, [previous_period, self.ledger_repository.period_for(updated_expense)]
+                )
 
             # Reload with category
             updated_expense = await self.repository.get_by_id_and_user(updated_expense.id, user.id)
 
-            category_response = BudgetCategoryResponse(
-                id=updated_expense.category.id,
-                user_id=updated_expense.category.user_id,
-                name=updated_expense.category.name,
-                description=updated_expense.category.description,
-                icon=updated_expense.category.icon,
-                color=updated_expense.category.color,
-                is_essential=updated_expense.category.is_essential,
-                created_at=updated_expense.category.created_at,
-                updated_at=updated_expense.category.updated_at,
-            ) if updated_expense.category else None
-
-            return ExpenseResponse(
-                id=updated_expense.id,
-                user_id=updated_expense.user_id,
-                description=updated_expense.description,
-                amount=updated_expense.amount,
-                frequency=updated_expense.frequency.value,
-                category_id=updated_expense.category_id,
-                effective_month=updated_expense.effective_month,
-                effective_year=updated_expense.effective_year,
-                created_at=updated_expense.created_at,
-                updated_at=updated_expense.updated_at,
-                category=category_response,
-            )
+            return ExpenseResponseBuilder().build(updated_expense)
         except HTTPException:
             raise
         except Exception as e:
@@ -256,7 +194,9 @@ class ExpenseService():
                 logger.warning(f"Expense with ID {expense_id} does not exist")
                 raise HTTPException(status_code=404, detail="Expense not found")
 
-            await self.repository.delete(expense)
+            async with unit_of_work(self.session):
+                await self.repository.delete(expense)
+                await self.ledger_repository.refresh(user.id, [self.ledger_repository.period_for(expense)])
         except HTTPException:
             raise
         except Exception as e:
@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 from pydantic import UUID4
 from uuid import uuid4
+from nw_tracker.repositories.base_repository import unit_of_work
+from nw_tracker.repositories.budget_month_total_repository import BudgetMonthTotalRepository
 from nw_tracker.repositories.income_repository import IncomeRepository
 from nw_tracker.models.budget_models import IncomeModel
 from nw_tracker.models.budget_request_response_models import (
@@ -18,7 +20,9 @@ logger = get_logger()
 
 class IncomeService():
     def __init__(self, session):
+        self.session = session
         self.repository = IncomeRepository(session)
+        self.ledger_repository = BudgetMonthTotalRepository(session)
 
     def _validate_one_time_dates(self, frequency: str, effective_month: int | None, effective_year: int | None):
         """Validate that one-time income entries have effective month and year."""
@@ -42,20 +46,11 @@ class IncomeService():
             income_data_dict["id"] = uuid4()
 
             new_income = IncomeModel(**income_data_dict)
-            income = await self.repository.create(new_income)
-
-            return IncomeResponse(
-                id=income.id,
-                user_id=income.user_id,
-                description=income.description,
-                amount=income.amount,
-                frequency=income.frequency.value,
-                is_net=income.is_net,
-                effective_month=income.effective_month,
-                effective_year=income.effective_year,
-                created_at=income.created_at,
-                updated_at=income.updated_at,
-            )
+            async with unit_of_work(self.session):
+                income = await self.repository.create(new_income)
+                await self.ledger_repository.refresh(user.id, [self.ledger_repository.period_for(income)])
+
+            return IncomeResponse.model_validate(income)
         except HTTPException:
             raise
         except Exception as e:
@@ -67,21 +62,7 @@ class IncomeService():
         try:
             income_entries = await self.repository.get_all_for_user(user.id)
 
-            return [
-                IncomeResponse(
-                    id=income.id,
-                    user_id=income.user_id,
-                    description=income.description,
-                    amount=income.amount,
-                    frequency=income.frequency.value,
-                    is_net=income.is_net,
-                    effective_month=income.effective_month,
-                    effective_year=income.effective_year,
-                    created_at=income.created_at,
-                    updated_at=income.updated_at,
-                )
-                for income in income_entries
-            ]
+            return [IncomeResponse.model_validate(income) for income in income_entries]
         except Exception as e:
             logger.error(f"Error retrieving income entries: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -99,18 +80,7 @@ class IncomeService():
                 logger.warning(f"Income with ID {income_id} does not exist")
                 raise HTTPException(status_code=404, detail="Income not found")
 
-            return IncomeResponse(
-                id=income.id,
-                user_id=income.user_id,
-                description=income.description,
-                amount=income.amount,
-                frequency=income.frequency.value,
-                is_net=income.is_net,
-                effective_month=income.effective_month,
-                effective_year=income.effective_year,
-                created_at=income.created_at,
-                updated_at=income.updated_at,
-            )
+            return IncomeResponse.model_validate(income)
         except HTTPException:
             raise
         except Exception as e:
@@ -139,24 +109,18 @@ class IncomeService():
             self._validate_one_time_dates(new_frequency, new_effective_month, new_effective_year)
 
             # Update only non-None values
+            previous_period = self.ledger_repository.period_for(income)
             update_data = income_data.model_dump(exclude_none=True)
             for key, value in update_data.items():
                 setattr(income, key, value)
 
-            updated_income = await self.repository.update(income)
-
-            return IncomeResponse(
-                id=updated_income.id,
-                user_id=updated_income.user_id,
-                description=updated_income.description,
-                amount=updated_income.amount,
-                frequency=updated_income.frequency.value,
-                is_net=updated_income.is_net,
-                effective_month=updated_income.effective_month,
-                effective_year=updated_income.effective_year,
-                created_at=updated_income.created_at,
-                updated_at=updated_income.updated_at,
-            )
+            async with unit_of_work(self.session):
+                updated_income = await self.repository.update(income)
+                await self.ledger_repository.refresh(
+                    user.id, [previous_period, self.ledger_repository.period_for(updated_income)]
+                )
+
+            return IncomeResponse.model_validate(updated_income)
         except HTTPException:
             raise
         except Exception as e:
@@ -177,7 +141,9 @@ class IncomeService():
                 logger.warning(f"Income with ID {income_id} does not exist")
                 raise HTTPException(status_code=404, detail="Income not found")
 
-            await self.repository.delete(income)
+            async with unit_of_work(self.session):
+                await self.repository.delete(income)
+                await self.ledger_repository.refresh(user.id, [self.ledger_repository.period_for(income)])
         except HTTPException:
             raise
         except Exception as e:
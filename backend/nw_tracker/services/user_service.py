@@ -5,6 +5,7 @@ from nw_tracker.repositories.settings_repository import UserSettingsRepository
 from nw_tracker.models.models import User, UserSettings
 from nw_tracker.models.request_response_models import UserCreateRequest, UserUpdateRequest, UserResponse
 from nw_tracker.logger import get_logger
+from nw_tracker.utils.user_cache import get_user_cache
 
 logger = get_logger()
 
@@ -85,6 +86,7 @@ class UserService():
                 setattr(user, key, value)
 
             updated_user = await self.repository.update(user)
+            await get_user_cache().invalidate(user.id)
 
 
             return UserResponse.model_validate(updated_user)
@@ -102,6 +104,7 @@ class UserService():
 
         try:
             await self.repository.delete_by_id(user_id)
+            await get_user_cache().invalidate(user_id)
             logger.info(f"User with ID {user_id} deleted successfully")
             return True
         except Exception as e:
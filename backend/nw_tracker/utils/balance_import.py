@@ -0,0 +1,146 @@
+import codecs
+import csv
+import json
+import math
+from datetime import date
+from typing import AsyncIterable, AsyncIterator, Optional
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+CONTENT_TYPES = {
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+}
+
+# (line number, (date, amount) or None, error message or None)
+ImportRow = tuple[int, Optional[tuple[date, float]], Optional[str]]
+
+
+def detect_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a request Content-Type to an import format, ignoring parameters like charset."""
+    if not content_type:
+        return None
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 byte chunks into lines without buffering the whole body.
+
+    Lines keep their line endings, like iterating over a text file, so they
+    can be handed to csv.reader unchanged.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    # Text since the last newline, joined only once another newline arrives
+    pieces: list[str] = []
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if "\n" not in text:
+            if text:
+                pieces.append(text)
+            continue
+        pieces.append(text)
+        *lines, rest = "".join(pieces).split("\n")
+        pieces = [rest] if rest else []
+        for line in lines:
+            yield line + "\n"
+    pieces.append(decoder.decode(b"", final=True))
+    rest = "".join(pieces)
+    if rest:
+        yield rest
+
+
+async def _iter_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, list[str]]]:
+    """Parse CSV records with their starting line number, skipping blank lines."""
+    line_number = 0
+    record_start = 0
+    record: list[str] = []
+    quotes = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not record:
+            if not line.strip():
+                continue
+            record_start = line_number
+        # A quoted field may contain newlines, so collect lines until the quotes balance
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield record_start, next(csv.reader(record))
+            record, quotes = [], 0
+    if record:
+        yield record_start, next(csv.reader(record))
+
+
+def _parse_values(raw_date, raw_amount) -> tuple[date, float]:
+    if raw_date is None or raw_amount is None:
+        raise ValueError("date and amount are required")
+    if isinstance(raw_amount, bool):
+        raise ValueError(f"invalid amount {raw_amount!r}")
+    try:
+        balance_date = date.fromisoformat(str(raw_date).strip())
+    except ValueError:
+        raise ValueError(f"invalid date {raw_date!r}, expected YYYY-MM-DD")
+    try:
+        amount = float(str(raw_amount).strip().replace(",", ""))
+    except ValueError:
+        raise ValueError(f"invalid amount {raw_amount!r}")
+    if not math.isfinite(amount):
+        raise ValueError(f"invalid amount {raw_amount!r}")
+    return balance_date, amount
+
+
+def _parse_row(line_number: int, raw_date, raw_amount) -> ImportRow:
+    try:
+        return line_number, _parse_values(raw_date, raw_amount), None
+    except ValueError as e:
+        return line_number, None, str(e)
+
+
+async def iter_balance_rows(chunks: AsyncIterable[bytes], import_format: str) -> AsyncIterator[ImportRow]:
+    """
+    Parse an uploaded CSV or NDJSON body into balance rows, one line at a time.
+
+    CSV needs a header row with date and amount columns (other columns are
+    ignored); each NDJSON line is an object with date and amount. Blank
+    lines are skipped. Invalid rows are yielded with an error message rather
+    than stopping the import.
+
+    Raises:
+        ValueError: If the CSV header is missing a required column
+    """
+    if import_format == CSV:
+        columns = None
+        async for line_number, fields in _iter_csv_records(chunks):
+            if columns is None:
+                header = [field.strip().lower() for field in fields]
+                missing = {"date", "amount"} - set(header)
+                if missing:
+                    raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+                columns = (header.index("date"), header.index("amount"))
+                continue
+            date_index, amount_index = columns
+            if len(fields) <= max(date_index, amount_index):
+                yield line_number, None, "missing date or amount"
+                continue
+            yield _parse_row(line_number, fields[date_index], fields[amount_index])
+        return
+
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "expected a JSON object"
+            continue
+        yield _parse_row(line_number, record.get("date"), record.get("amount"))
@@ -1,125 +1,484 @@
+import heapq
+import math
 from datetime import date
-from typing import List, Dict, Optional, TYPE_CHECKING
-from nw_tracker.models.models import Account, Currency
+from typing import Hashable, Iterable, List, Dict, Optional, Tuple
+from uuid import UUID
 
-if TYPE_CHECKING:
-    from nw_tracker.services.exchange_rate_service import ExchangeRateService
+import numpy as np
 
+from nw_tracker.models.models import Account, Currency, HistoryResolution
+from nw_tracker.utils.rate_table import RateTable
 
-async def compute_group_balance_history(
+# Point budget for HistoryResolution.AUTO when the caller does not give one
+DEFAULT_MAX_POINTS = 500
+
+_UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def compute_group_balance_history(
     accounts: List[Account],
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    exchange_rate_service: Optional["ExchangeRateService"] = None
+    rate_table: Optional[RateTable] = None,
+    resolution: HistoryResolution = HistoryResolution.DAILY,
+    max_points: int = DEFAULT_MAX_POINTS
 ) -> List[Dict]:
     """
-    Compute balance history for account group with fill-forward logic.
+    Reference implementation: balance history for a set of accounts with
+    fill-forward logic, computed from their loaded balances.
+
+    Not called by the services, which build histories from BalanceMatrix
+    (compute_multi_series_history) or from daily balance deltas
+    (compute_history_from_daily_deltas). It is kept as the baseline that
+    scripts/benchmark_balance_history.py times and that the tests compare
+    those paths against.
 
-    Algorithm:
-    1. Collect all unique dates from all accounts' balances
-    2. Filter by from_date/to_date if provided
-    3. For each date (ascending), sum each account's balance:
-       - Use balance on that date if exists
-       - Else use earliest prior balance (fill-forward)
-       - Skip account if no prior balance exists
-    4. Return list of {date, total_balance_gbp, total_balance_usd}
+    Algorithm (sweep-line):
+    1. Sort each account's balances by (date, created_at) and keep the
+       most recently created balance per date
+    2. Merge all accounts' balance events into one date-ordered stream
+    3. Walk the stream carrying a running total per currency forward:
+       when an account has a new balance, replace its previous contribution
+    4. Record the totals for every distinct date within from_date/to_date
+       (earlier dates still update the running totals)
+    5. Convert each point to GBP at its date's rates (a plain RateTable
+       has one rate; non-GBP currencies are skipped without a rate table)
+    6. Downsample to the requested resolution (see downsample_history)
+
+    This is O(B log A) for B balances across A accounts, instead of
+    rescanning every account's balances for every distinct date.
 
     Args:
         accounts: List of Account objects with balances loaded
         from_date: Optional start date filter (inclusive)
         to_date: Optional end date filter (inclusive)
+        rate_table: Optional rates for currency conversion (RateTable or RateHistory)
+        resolution: Bucket size for the returned points
+        max_points: Point budget when resolution is AUTO
 
     Returns:
-        List of dicts with date, total_balance_gbp, total_balance_usd
+        List of dicts with date, total_balance_gbp
     """
     if not accounts:
         return []
 
-    # Step 1: Build account balance maps sorted by date then created_at
-    account_balances = {}
+    account_series = [
+        (sorted(account.balances, key=lambda b: (b.date, b.created_at)), account.currency)
+        for account in accounts if account.balances
+    ]
+
+    history = sweep_balance_history(account_series, from_date, to_date, rate_table)
+    return downsample_history(history, resolution, max_points)
+
+
+def _get_rates_on(currency, ordinals: np.ndarray, rate_table: Optional[RateTable]) -> Optional[np.ndarray]:
+    """
+    Get the divisors that convert a currency to GBP on each of the given dates.
+
+    Returns None when the currency cannot be converted (non-GBP currency
+    and no rate table), in which case its amounts are skipped but its
+    dates still appear in the history.
+    """
+    if rate_table is not None:
+        return rate_table.rates_on(currency, ordinals)
+    if currency == Currency.GBP:
+        return np.ones(len(ordinals), dtype=np.float64)
+    return None
+
+
+def _history_from_currency_totals(
+    dates: List[date],
+    totals: List[Tuple[float, ...]],
+    currencies: List[Hashable],
+    rate_table: Optional[RateTable]
+) -> List[Dict]:
+    """
+    Convert per-currency running totals to GBP at each point's own date.
+
+    totals[i] holds the native running total of each currency on dates[i]
+    (shorter tuples are padded with zeros for currencies first seen later).
+    """
+    if not dates:
+        return []
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    native = np.zeros((len(dates), len(currencies)), dtype=np.float64)
+    for row, point_totals in enumerate(totals):
+        native[row, :len(point_totals)] = point_totals
+
+    totals_gbp = np.zeros(len(dates), dtype=np.float64)
+    for column, currency in enumerate(currencies):
+        rates = _get_rates_on(currency, ordinals, rate_table)
+        if rates is not None:
+            totals_gbp += native[:, column] / rates
+    return [
+        {'date': point_date, 'total_balance_gbp': float(total)}
+        for point_date, total in zip(dates, totals_gbp)
+    ]
+
+
+def sweep_balance_history(
+    account_series: List[Tuple[list, Hashable]],
+    from_date: Optional[date],
+    to_date: Optional[date],
+    rate_table: Optional[RateTable] = None
+) -> List[Dict]:
+    """
+    Merge per-account balance streams and carry each account's balance forward.
+
+    Totals are kept per currency in native amounts and converted at the end,
+    so with a RateHistory every point uses its own date's rates.
+
+    Balances only need amount, date and created_at attributes, so rows
+    selected straight from the balances table work as well as ORM objects.
+
+    Args:
+        account_series: (balances sorted by date then created_at, currency) per account
+        from_date: Optional start date filter (inclusive)
+        to_date: Optional end date filter (inclusive)
+        rate_table: Optional rates for currency conversion
+
+    Returns:
+        List of dicts with date, total_balance_gbp
+    """
+    currencies = list(dict.fromkeys(currency for _, currency in account_series))
+    column_of = [currencies.index(currency) for _, currency in account_series]
+
+    streams = []
+    for index, (balances, _) in enumerate(account_series):
+        stream = []
+        for balance in balances:
+            if stream and stream[-1][0] == balance.date:
+                # Same date - the most recently created balance wins
+                stream[-1] = (balance.date, index, balance.amount)
+            else:
+                stream.append((balance.date, index, balance.amount))
+        streams.append(stream)
+
+    # Accounts per currency column; totals are summed afresh with fsum at each
+    # emitted point rather than adjusted in place, so rounding cannot build up
+    members = [[index for index, column in enumerate(column_of) if column == c] for c in range(len(currencies))]
+    current = [0.0] * len(streams)
+    dates, totals = [], []
+    pending_date = None
+
+    def currency_totals() -> tuple:
+        return tuple(math.fsum(current[index] for index in indices) for indices in members)
+
+    for event_date, index, amount in heapq.merge(*streams, key=lambda event: event[0]):
+        if pending_date is not None and event_date != pending_date:
+            if from_date is None or pending_date >= from_date:
+                dates.append(pending_date)
+                totals.append(currency_totals())
+        if to_date is not None and event_date > to_date:
+            pending_date = None
+            break
+
+        current[index] = amount
+        pending_date = event_date
+
+    if pending_date is not None and (from_date is None or pending_date >= from_date):
+        dates.append(pending_date)
+        totals.append(currency_totals())
+
+    return _history_from_currency_totals(dates, totals, currencies, rate_table)
+
+
+def compute_history_from_daily_deltas(
+    rows: Iterable,
+    rate_table: Optional[RateTable] = None,
+    resolution: HistoryResolution = HistoryResolution.DAILY,
+    max_points: int = DEFAULT_MAX_POINTS
+) -> List[Dict]:
+    """
+    Build a history from summed account_daily_balances deltas.
+
+    Args:
+        rows: (date, currency, delta) rows ordered by date; a row with date
+            None seeds the running total without producing a point
+        rate_table: Optional rates for currency conversion
+        resolution: Bucket size for the returned points
+        max_points: Point budget when resolution is AUTO
+
+    Returns:
+        List of dicts with date, total_balance_gbp
+    """
+    column_of = {}
+    running = []
+    dates, totals = [], []
+    for row_date, currency, delta in rows:
+        if currency not in column_of:
+            column_of[currency] = len(running)
+            running.append(0.0)
+        running[column_of[currency]] += delta
+
+        if row_date is None:
+            continue
+        if dates and dates[-1] == row_date:
+            totals[-1] = tuple(running)
+        else:
+            dates.append(row_date)
+            totals.append(tuple(running))
+
+    history = _history_from_currency_totals(dates, totals, list(column_of), rate_table)
+    return downsample_history(history, resolution, max_points)
+
+
+# ============ Downsampling ============
+
+def _bucket_keys(ordinals: np.ndarray, resolution: HistoryResolution) -> np.ndarray:
+    """Map date ordinals to a bucket number that increases with the date."""
+    if resolution == HistoryResolution.WEEKLY:
+        # date.fromordinal(1) is a Monday, so weeks run Monday to Sunday
+        return (ordinals - 1) // 7
+    if resolution == HistoryResolution.MONTHLY:
+        days = (ordinals - _UNIX_EPOCH_ORDINAL).astype("datetime64[D]")
+        return days.astype("datetime64[M]").astype(np.int64)
+    return ordinals
+
+
+def bucket_last_indices(
+    ordinals: np.ndarray,
+    resolution: HistoryResolution = HistoryResolution.DAILY,
+    max_points: int = DEFAULT_MAX_POINTS
+) -> np.ndarray:
+    """
+    Get the index of the last point in each resolution bucket.
+
+    The last point is kept because history values are end-of-day balances,
+    so it is the balance at the end of the week/month.
+
+    AUTO picks the finest of daily, weekly and monthly that fits within
+    max_points, falling back to multi-month buckets for very long ranges.
+
+    Args:
+        ordinals: Ascending, distinct date.toordinal() values
+        resolution: Bucket size
+        max_points: Point budget when resolution is AUTO
+
+    Returns:
+        Ascending indices into ordinals
+    """
+    if len(ordinals) == 0:
+        return np.arange(0)
+
+    if resolution == HistoryResolution.AUTO:
+        max_points = max(max_points, 1)
+        for candidate in (HistoryResolution.DAILY, HistoryResolution.WEEKLY, HistoryResolution.MONTHLY):
+            keys = _bucket_keys(ordinals, candidate)
+            if np.count_nonzero(keys[1:] != keys[:-1]) + 1 <= max_points:
+                break
+        else:
+            months_per_bucket = -(-(int(keys[-1] - keys[0]) + 1) // max_points)
+            keys = (keys - keys[0]) // months_per_bucket
+    else:
+        keys = _bucket_keys(ordinals, resolution)
+
+    return np.flatnonzero(np.append(keys[1:] != keys[:-1], True))
+
+
+def downsample_history(
+    history: List[Dict],
+    resolution: HistoryResolution = HistoryResolution.DAILY,
+    max_points: int = DEFAULT_MAX_POINTS
+) -> List[Dict]:
+    """
+    Keep the last history point of each resolution bucket.
+
+    Runs on the raw dicts so callers only build response models for the
+    points that are returned.
+    """
+    if resolution == HistoryResolution.DAILY or not history:
+        return history
+    ordinals = np.fromiter((point['date'].toordinal() for point in history), dtype=np.int64, count=len(history))
+    return [history[i] for i in bucket_last_indices(ordinals, resolution, max_points)]
+
+
+# ============ Columnar (NumPy) path ============
+
+class AccountSeries:
+    """
+    Columnar balance series for a single account.
+
+    ordinals holds the distinct balance dates as date.toordinal() values in
+    ascending order, and amounts the amount (in the account's currency) of
+    the most recently created balance on each of those dates.
+    """
+    __slots__ = ("account_id", "currency", "ordinals", "amounts")
+
+    def __init__(self, account_id: UUID, currency: Hashable, ordinals: np.ndarray, amounts: np.ndarray):
+        self.account_id = account_id
+        self.currency = currency
+        self.ordinals = ordinals
+        self.amounts = amounts
+
+
+def build_account_series(accounts: Iterable[Account]) -> List[AccountSeries]:
+    """
+    Convert accounts with loaded balances into columnar series.
+
+    Accounts are de-duplicated by ID and accounts without balances are
+    dropped. Amounts stay in the account's currency; BalanceMatrix converts
+    them per date.
+    """
+    series = []
+    seen = set()
     for account in accounts:
-        if not account.balances:
+        if account.id in seen or not account.balances:
             continue
+        seen.add(account.id)
+
         balances = sorted(account.balances, key=lambda b: (b.date, b.created_at))
-        account_balances[account.id] = {
-            'currency': account.currency,
-            'balances': balances  # [(date, amount), ...]
-        }
+        ordinals = np.fromiter((b.date.toordinal() for b in balances), dtype=np.int64, count=len(balances))
+        amounts = np.fromiter((b.amount for b in balances), dtype=np.float64, count=len(balances))
 
-    if not account_balances:
-        return []
+        # Same date - keep the most recently created balance (last in sort order)
+        last_of_date = np.append(ordinals[1:] != ordinals[:-1], True)
+        series.append(AccountSeries(
+            account.id, account.currency, ordinals[last_of_date], amounts[last_of_date]
+        ))
+    return series
+
+
+class BalanceMatrix:
+    """
+    Account x date matrix of fill-forward GBP balances.
+
+    The date axis is the union of every account's balance dates. Each cell
+    holds the account's latest balance on or before that date (0 before its
+    first balance), found with a single searchsorted per account, converted
+    to GBP at that date's rate. Accounts that cannot be converted keep their
+    dates with zero amounts, matching compute_group_balance_history. Group
+    and total histories are then row subsets summed column-wise.
+    """
 
-    # Step 2: Get all unique dates
-    all_dates = set()
-    for acc_data in account_balances.values():
-        for b in acc_data['balances']:
-            all_dates.add(b.date)
+    def __init__(self, series: List[AccountSeries], rate_table: Optional[RateTable] = None):
+        self.row_index = {s.account_id: row for row, s in enumerate(series)}
 
-    sorted_dates = sorted(all_dates)
+        if series:
+            self.date_axis = np.unique(np.concatenate([s.ordinals for s in series]))
+        else:
+            self.date_axis = np.empty(0, dtype=np.int64)
 
-    # Step 2.5: Apply date range filters
-    if from_date:
-        sorted_dates = [d for d in sorted_dates if d >= from_date]
-    if to_date:
-        sorted_dates = [d for d in sorted_dates if d <= to_date]
+        self.values = np.zeros((len(series), len(self.date_axis)), dtype=np.float64)
+        # events marks the dates on which an account actually has a balance;
+        # a group's history only includes dates where one of its accounts does
+        self.events = np.zeros((len(series), len(self.date_axis)), dtype=bool)
 
-    if not sorted_dates:
-        return []
+        rates_by_currency = {}
+        for row, s in enumerate(series):
+            if s.currency not in rates_by_currency:
+                rates_by_currency[s.currency] = _get_rates_on(s.currency, self.date_axis, rate_table)
+            rates = rates_by_currency[s.currency]
+
+            latest = np.searchsorted(s.ordinals, self.date_axis, side="right") - 1
+            has_balance = latest >= 0
+            if rates is not None:
+                self.values[row, has_balance] = s.amounts[latest[has_balance]] / rates[has_balance]
+            self.events[row, np.searchsorted(self.date_axis, s.ordinals)] = True
+
+    def history(
+        self,
+        account_ids: Optional[Iterable[UUID]] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        resolution: HistoryResolution = HistoryResolution.DAILY,
+        max_points: int = DEFAULT_MAX_POINTS
+    ) -> List[Dict]:
+        """
+        Sum the fill-forward series for a subset of accounts.
+
+        Columns are downsampled before summing, so only the returned points
+        are ever aggregated.
 
-    # Step 3: For each date, compute totals with fill-forward
-    history = []
-    for target_date in sorted_dates:
-        total_gbp = 0.0
-
-        for acc_id, acc_data in account_balances.items():
-            currency = acc_data['currency']
-            balances = acc_data['balances']
-
-            # Find balance for this date (or most recent prior)
-            amount = None
-            for bal in reversed(balances):  # Check from newest
-                if bal.date <= target_date:
-                    amount = bal.amount
-                    break
-
-            if amount is not None:
-                if currency == Currency.GBP:
-                    total_gbp += amount
-                elif exchange_rate_service:
-                    # Convert to GBP
-                    amount_gbp = await exchange_rate_service.convert_to_gbp(amount, currency)
-                    total_gbp += amount_gbp
-                else:
-                    # No conversion service, skip non-GBP currencies
-                    pass
-
-        history.append({
-            'date': target_date,
-            'total_balance_gbp': total_gbp
-        })
-
-    return history
-
-
-async def compute_total_balance_history(
+        Args:
+            account_ids: Accounts to include (all accounts if None)
+            from_date: Optional start date filter (inclusive)
+            to_date: Optional end date filter (inclusive)
+            resolution: Bucket size for the returned points
+            max_points: Point budget when resolution is AUTO
+
+        Returns:
+            List of dicts with date, total_balance_gbp
+        """
+        if account_ids is None:
+            rows = list(self.row_index.values())
+        else:
+            rows = sorted({self.row_index[a] for a in account_ids if a in self.row_index})
+        if not rows:
+            return []
+
+        mask = self.events[rows].any(axis=0)
+        if from_date:
+            mask &= self.date_axis >= from_date.toordinal()
+        if to_date:
+            mask &= self.date_axis <= to_date.toordinal()
+
+        columns = np.flatnonzero(mask)
+        columns = columns[bucket_last_indices(self.date_axis[columns], resolution, max_points)]
+
+        totals = self.values[np.ix_(rows, columns)].sum(axis=0)
+        return [
+            {'date': date.fromordinal(int(ordinal)), 'total_balance_gbp': float(total)}
+            for ordinal, total in zip(self.date_axis[columns], totals)
+        ]
+
+
+def build_balance_matrix(
+    accounts: Iterable[Account],
+    rate_table: Optional[RateTable] = None
+) -> BalanceMatrix:
+    """Build a BalanceMatrix from accounts with loaded balances."""
+    return BalanceMatrix(build_account_series(accounts), rate_table)
+
+
+def compute_multi_series_history(
     accounts: List[Account],
+    memberships: Dict[Hashable, Iterable[UUID]],
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    exchange_rate_service: Optional["ExchangeRateService"] = None
-) -> List[Dict]:
+    rate_table: Optional[RateTable] = None,
+    include_total: bool = True,
+    resolution: HistoryResolution = HistoryResolution.DAILY,
+    max_points: int = DEFAULT_MAX_POINTS
+) -> Tuple[List[Dict], Dict[Hashable, List[Dict]]]:
     """
-    Compute total balance history across all accounts with fill-forward logic.
+    Compute the total history and every group's history in one pass.
 
-    This is an alias for compute_group_balance_history as the logic is identical.
-    The difference is semantic: this is for "all accounts" vs "accounts in a group".
+    Each account's fill-forward series is computed once; the total and
+    per-group series are sums over subsets of them.
 
     Args:
-        accounts: List of Account objects with balances loaded
+        accounts: The user's accounts with balances loaded
+        memberships: Map of group key -> member account IDs. IDs not in
+            accounts are ignored.
         from_date: Optional start date filter (inclusive)
         to_date: Optional end date filter (inclusive)
-        exchange_rate_service: Optional service for currency conversion
+        rate_table: Optional rates for currency conversion (RateTable or RateHistory)
+        include_total: Whether to compute the total series (accounts not
+            excluded from totals)
+        resolution: Bucket size for the returned points
+        max_points: Point budget when resolution is AUTO
 
     Returns:
-        List of dicts with date, total_balance_gbp
+        Tuple of (total history, {group key: history}), each a list of
+        dicts with date, total_balance_gbp
     """
-    return await compute_group_balance_history(accounts, from_date, to_date, exchange_rate_service)
+    matrix = build_balance_matrix(accounts, rate_table)
+
+    total_history = []
+    if include_total:
+        total_history = matrix.history(
+            [account.id for account in accounts if not account.is_excluded_from_totals],
+            from_date=from_date,
+            to_date=to_date,
+            resolution=resolution,
+            max_points=max_points
+        )
+
+    group_histories = {
+        key: matrix.history(
+            account_ids, from_date=from_date, to_date=to_date, resolution=resolution, max_points=max_points
+        )
+        for key, account_ids in memberships.items()
+    }
+    return total_history, group_histories
@@ -0,0 +1,66 @@
+from typing import Iterable
+
+import numpy as np
+
+from nw_tracker.enums.budget_enums import BudgetKindEnum, FrequencyEnum
+
+
+def month_index(year: int, month: int) -> int:
+    """Months since year 0, so consecutive months differ by one across year ends."""
+    return year * 12 + month - 1
+
+
+def project_budget(rows: Iterable, start: tuple[int, int], months: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Expand budget ledger rows into monthly income and expense arrays.
+
+    Builds a (months x rows) schedule in one go: MONTHLY rows apply every
+    month, YEARLY rows are spread evenly as a twelfth per month (the ledger
+    keeps no month for them, and a year still sums to the yearly total) and
+    ONE_TIME rows land only on their own month if it falls in the horizon.
+    Each row's kind says whether it is income or an expense.
+
+    Args:
+        rows: Ledger rows with kind, frequency, year, month and amount
+        start: (year, month) of the first projected month
+        months: Number of months to project
+
+    Returns:
+        (income, expenses) arrays of length months
+    """
+    rows = list(rows)
+    if not rows:
+        return np.zeros(months), np.zeros(months)
+
+    frequencies = np.array([FrequencyEnum(row.frequency).value for row in rows])
+    amounts = np.fromiter((row.amount for row in rows), dtype=np.float64, count=len(rows))
+    is_income = np.fromiter(
+        (BudgetKindEnum(row.kind) == BudgetKindEnum.INCOME for row in rows), dtype=bool, count=len(rows)
+    )
+    offsets = np.fromiter(
+        (month_index(row.year, row.month) - month_index(*start) for row in rows), dtype=np.int64, count=len(rows)
+    )
+
+    per_month = np.where(frequencies == FrequencyEnum.YEARLY.value, amounts / 12, amounts)
+    horizon = np.arange(months)[:, None]
+    applies = (frequencies != FrequencyEnum.ONE_TIME.value) | (horizon == offsets)
+    schedule = np.where(applies, per_month, 0.0)
+
+    return schedule[:, is_income].sum(axis=1), schedule[:, ~is_income].sum(axis=1)
+
+
+def compound_net_worth(surplus: np.ndarray, starting: float, annual_return_rate: float) -> np.ndarray:
+    """
+    Project net worth month by month: grow last month's value, then add the month's surplus.
+
+    Solves worth[t] = worth[t-1] * g + surplus[t] in closed form, with g
+    the monthly equivalent of annual_return_rate (a fraction, e.g. 0.05).
+    """
+    growth = (1 + annual_return_rate) ** (np.arange(1, len(surplus) + 1) / 12)
+    return growth * (starting + np.cumsum(surplus / growth))
+
+
+def months_after(year: int, month: int, months: int) -> list[tuple[int, int]]:
+    """(year, month) of the N months following the given month, in order."""
+    first = month_index(year, month) + 1
+    return [(index // 12, index % 12 + 1) for index in range(first, first + months)]
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from nw_tracker.config.settings import get_settings
+from nw_tracker.logger import get_logger
+from nw_tracker.utils.rate_table import HistoryArrays
+from nw_tracker.utils.result_cache import get_result_cache
+
+logger = get_logger()
+settings = get_settings()
+
+RateLoader = Callable[[], Awaitable[Dict[str, float]]]
+HistoryLoader = Callable[[], Awaitable[Dict[str, HistoryArrays]]]
+
+
+class ExchangeRateCache:
+    """
+    Process-wide GBP exchange rates with TTL expiry.
+
+    - Fresh rates are returned without awaiting anything else.
+    - Expired rates are still returned (stale-while-revalidate) while one
+      background refresh runs.
+    - A cold cache makes callers wait, but concurrent callers share a single
+      in-flight load (single-flight), so a burst of requests triggers at most
+      one API fetch and one delete/re-insert of the stored rates.
+    - A failed refresh keeps the stale rates and retries after retry_seconds.
+
+    It also keeps the sorted daily rate history arrays (see RateHistory),
+    loaded on first use and dropped when the rates change or history rows
+    are written (invalidate_history), so history requests do not reload and
+    re-sort the whole history table.
+    """
+
+    def __init__(self, ttl_seconds: float, retry_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._rates: Optional[Dict[str, float]] = None
+        self._expires_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self._history: Optional[Dict[str, HistoryArrays]] = None
+        # Bumped on invalidation so a load that started earlier is not stored
+        self._history_generation = 0
+
+    def peek(self) -> Optional[Dict[str, float]]:
+        """Get the cached rates, fresh or stale, without loading."""
+        return self._rates
+
+    def is_fresh(self) -> bool:
+        return self._rates is not None and time.monotonic() < self._expires_at
+
+    async def get(self, loader: RateLoader) -> Dict[str, float]:
+        """Get the rates, loading them with loader when the cache is cold."""
+        if self.is_fresh():
+            return self._rates
+        if self._rates is not None:
+            self._start_refresh(loader)
+            return self._rates
+        return await self.refresh(loader)
+
+    async def refresh(self, loader: RateLoader) -> Dict[str, float]:
+        """Load the rates now, joining a load that is already in flight."""
+        task = self._start_refresh(loader)
+        # Shield so a cancelled caller does not cancel the load others wait on
+        return await asyncio.shield(task)
+
+    async def set(self, rates: Dict[str, float], ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store rates and reset the expiry.
+
+        Cached dashboard results were converted with the old rates, so they
+        are invalidated when the rates actually change, and so is the rate
+        history, which new rates usually come with a new row of. Re-setting
+        the same rates keeps both.
+        """
+        changed = self._rates is not None and rates != self._rates
+        self._rates = dict(rates)
+        self._expires_at = time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        if changed:
+            self.invalidate_history()
+            await get_result_cache().invalidate_all()
+
+    def clear(self) -> None:
+        self._rates = None
+        self._expires_at = 0.0
+        self.invalidate_history()
+
+    async def get_history(self, loader: HistoryLoader) -> Dict[str, HistoryArrays]:
+        """
+        Get the sorted rate history arrays, loading them with loader when not cached.
+
+        The loader is awaited by the caller and never kept, so it may use the
+        caller's database session.
+        """
+        if self._history is not None:
+            return self._history
+        generation = self._history_generation
+        history = await loader()
+        if generation == self._history_generation:
+            self._history = history
+        return history
+
+    def invalidate_history(self) -> None:
+        """Drop the cached rate history so the next get_history reloads it."""
+        self._history = None
+        self._history_generation += 1
+
+    def _start_refresh(self, loader: RateLoader) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._load(loader))
+        return self._inflight
+
+    async def _load(self, loader: RateLoader) -> Dict[str, float]:
+        try:
+            rates = await loader()
+        except Exception as e:
+            logger.error(f"Error refreshing exchange rates: {e}")
+            if self._rates is None:
+                raise
+            self._expires_at = time.monotonic() + self.retry_seconds
+            return self._rates
+        await self.set(rates)
+        return self._rates
+
+    async def run_refresher(self, loader: RateLoader, interval_seconds: float) -> None:
+        """Refresh the rates every interval_seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh(loader)
+            except Exception as e:
+                logger.error(f"Background exchange rate refresh failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+_exchange_rate_cache: Optional[ExchangeRateCache] = None
+
+
+def get_exchange_rate_cache() -> ExchangeRateCache:
+    """Process-wide exchange rate cache, created on first use."""
+    global _exchange_rate_cache
+    if _exchange_rate_cache is None:
+        _exchange_rate_cache = ExchangeRateCache(
+            ttl_seconds=settings.exchange_rate_cache_ttl_seconds,
+            retry_seconds=settings.exchange_rate_retry_seconds
+        )
+    return _exchange_rate_cache
@@ -0,0 +1,39 @@
+import csv
+from datetime import date
+from typing import Iterable, Iterator
+
+from nw_tracker.models.models import Currency
+
+SUPPORTED_CURRENCIES = set(Currency.list())
+
+
+def parse_rate_rows(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Parse CSV lines into exchange_rate_history rows.
+
+    Raises:
+        ValueError: On a missing column, unsupported currency or bad value,
+            naming the offending line
+    """
+    reader = csv.DictReader(lines)
+    missing = {"date", "currency", "rate"} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+
+    for row in reader:
+        try:
+            base_currency = (row.get("base") or "GBP").strip().upper()
+            target_currency = row["currency"].strip().upper()
+            if base_currency not in SUPPORTED_CURRENCIES or target_currency not in SUPPORTED_CURRENCIES:
+                raise ValueError(f"unsupported currency pair {base_currency}/{target_currency}")
+            rate = float(row["rate"])
+            if rate <= 0:
+                raise ValueError(f"rate must be positive, got {rate}")
+            yield {
+                "base_currency": base_currency,
+                "target_currency": target_currency,
+                "rate_date": date.fromisoformat(row["date"].strip()),
+                "rate": rate,
+            }
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Line {reader.line_num}: {e}") from e
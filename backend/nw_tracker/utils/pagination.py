@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import date, datetime
+from uuid import UUID
+
+# Cursor value types, in the order they are encoded
+CursorValue = date | datetime | UUID | str | int | float
+
+
+def _to_json(value: CursorValue):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: tuple[CursorValue, ...]) -> str:
+    """Encode the sort key of the last row on a page as an opaque, URL-safe cursor."""
+    payload = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor produced by encode_cursor back into its JSON values.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not hold size values
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,70 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from nw_tracker.config.settings import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when too many password hashes are already running or queued."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing/verification on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL, so a few threads keep the event loop free while
+    hashes are computed. Admission is bounded: once max_pending calls are
+    running or waiting for a thread, new calls fail fast with
+    PasswordHasherBusyError instead of queueing behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run a blocking hash function (e.g. verify_password) on the hashing pool."""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusyError(f"{self._pending} password hashes already pending")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_password_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Process-wide password hasher, created on first use."""
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = PasswordHasher(
+            workers=settings.password_hash_workers,
+            max_pending=settings.password_hash_max_pending
+        )
+    return _password_hasher
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hashing threads (application shutdown)."""
+    global _password_hasher
+    if _password_hasher is not None:
+        _password_hasher.shutdown()
+        _password_hasher = None
@@ -0,0 +1,131 @@
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class PoolMetrics:
+    """
+    Checkout counters and connection acquire times for one engine's pool.
+
+    Checkouts/checkins/connects come from SQLAlchemy pool events. Acquire
+    time covers taking a connection from the pool: waiting for a free one
+    plus opening a new one when needed. Pre-ping time is reported on its
+    own. Timeouts count checkouts that gave up after pool_timeout.
+    """
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.acquire_count = 0
+        self.acquire_seconds_total = 0.0
+        self.acquire_seconds_max = 0.0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_seconds_total = 0.0
+        self.ping_seconds_max = 0.0
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def record_ping(self, seconds: float) -> None:
+        self.pings += 1
+        self.ping_seconds_total += seconds
+        self.ping_seconds_max = max(self.ping_seconds_max, seconds)
+
+    def record_acquire(self, seconds: float) -> None:
+        self.acquire_count += 1
+        self.acquire_seconds_total += seconds
+        self.acquire_seconds_max = max(self.acquire_seconds_max, seconds)
+
+    def get_stats(self) -> dict:
+        pool = self.engine.sync_engine.pool
+        average = self.acquire_seconds_total / self.acquire_count if self.acquire_count else 0.0
+        ping_average = self.ping_seconds_total / self.pings if self.pings else 0.0
+        return {
+            "name": self.name,
+            "pool_class": type(pool).__name__,
+            # size/overflow only exist on QueuePool-style pools
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "acquire_count": self.acquire_count,
+            "acquire_avg_ms": average * 1000,
+            "acquire_max_ms": self.acquire_seconds_max * 1000,
+            "timeouts": self.timeouts,
+            "pings": self.pings,
+            "ping_avg_ms": ping_average * 1000,
+            "ping_max_ms": self.ping_seconds_max * 1000,
+        }
+
+
+_pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> PoolMetrics:
+    """Attach pool event listeners to an engine and register its metrics under name."""
+    metrics = PoolMetrics(name, engine)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+
+    # Time pre-ping by wrapping this engine's dialect; the pool calls
+    # dialect.do_ping on checkout when pool_pre_ping is enabled
+    dialect = engine.sync_engine.dialect
+    do_ping = dialect.do_ping
+
+    def timed_ping(dbapi_connection):
+        started = time.perf_counter()
+        try:
+            return do_ping(dbapi_connection)
+        finally:
+            metrics.record_ping(time.perf_counter() - started)
+
+    dialect.do_ping = timed_ping
+
+    # Time the pool's own get (wait for a free connection or open a new one).
+    # Applied to the current pool instance; engine.dispose() replaces the
+    # pool, which only happens at shutdown.
+    pool = engine.sync_engine.pool
+    do_get = pool._do_get
+
+    def timed_get():
+        started = time.perf_counter()
+        try:
+            connection_record = do_get()
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_acquire(time.perf_counter() - started)
+        return connection_record
+
+    pool._do_get = timed_get
+
+    _pool_metrics[name] = metrics
+    return metrics
+
+
+def get_pool_metrics(name: str) -> Optional[PoolMetrics]:
+    return _pool_metrics.get(name)
+
+
+def get_all_pool_stats() -> list[dict]:
+    """Stats for every instrumented engine, in registration order."""
+    return [metrics.get_stats() for metrics in _pool_metrics.values()]
+
@@ -0,0 +1,181 @@
+from bisect import bisect_right
+from datetime import date
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from nw_tracker.models.models import Currency
+
+Amounts = Union[float, np.ndarray]
+# (date ordinals, rates) for one currency, sorted by date
+HistoryArrays = Tuple[np.ndarray, np.ndarray]
+
+
+def _code(currency: Union[Currency, str]) -> str:
+    return currency.value if isinstance(currency, Currency) else currency
+
+
+class RateTable:
+    """
+    Immutable snapshot of exchange rates, quoted as "1 GBP = X currency".
+
+    Taken once per request (ExchangeRateService.get_rate_table) and passed to
+    the hot loops instead of the service, so conversions are plain
+    synchronous arithmetic. convert accepts a scalar or a NumPy array of
+    amounts in one currency and converts to GBP or any other currency.
+    """
+    __slots__ = ("_rates",)
+
+    def __init__(self, rates: Mapping[Union[Currency, str], float]):
+        table = {Currency.GBP.value: 1.0}
+        table.update({_code(currency): float(rate) for currency, rate in rates.items()})
+        object.__setattr__(self, "_rates", MappingProxyType(table))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RateTable is immutable")
+
+    def __contains__(self, currency: Union[Currency, str]) -> bool:
+        return _code(currency) in self._rates
+
+    def __repr__(self) -> str:
+        return f"RateTable({dict(self._rates)!r})"
+
+    def rate(self, currency: Union[Currency, str]) -> float:
+        """
+        Get the rate for a currency, i.e. the divisor converting it to GBP.
+
+        Raises:
+            KeyError: If the currency is not in the snapshot
+        """
+        return self._rates[_code(currency)]
+
+    def convert(
+        self,
+        amounts: Amounts,
+        currency: Union[Currency, str],
+        to_currency: Union[Currency, str] = Currency.GBP
+    ) -> Amounts:
+        """
+        Convert amounts from one currency to another.
+
+        Args:
+            amounts: A single amount, or a sequence/array of amounts in currency
+            currency: Currency the amounts are in
+            to_currency: Display currency to convert to (GBP by default)
+
+        Returns:
+            A float for a scalar amount, otherwise a float64 array
+        """
+        if not np.isscalar(amounts):
+            amounts = np.asarray(amounts, dtype=np.float64)
+        converted = amounts / self.rate(currency)
+        if _code(to_currency) != Currency.GBP.value:
+            converted = converted * self.rate(to_currency)
+        return converted if isinstance(converted, np.ndarray) else float(converted)
+
+    def rates_on(self, currency: Union[Currency, str], ordinals: np.ndarray) -> np.ndarray:
+        """
+        Get the rate for a currency on each of the given dates.
+
+        A plain snapshot has one rate per currency; RateHistory overrides
+        this with the rate in effect on each date.
+
+        Args:
+            currency: Currency to look up
+            ordinals: date.toordinal() values
+        """
+        return np.full(len(ordinals), self.rate(currency), dtype=np.float64)
+
+    def to_gbp(self, amount: float, currency: Union[Currency, str]) -> float:
+        """Convert a single amount to GBP."""
+        return amount / self.rate(currency)
+
+    def as_dict(self) -> dict[str, float]:
+        return dict(self._rates)
+
+
+class RateHistory(RateTable):
+    """
+    RateTable that also knows each currency's rate over time.
+
+    rate/convert/to_gbp still use the current rates (for "latest balance"
+    figures); rates_on and rate_as_of use the dated history, preloaded into
+    one sorted ordinal array per currency and searched with bisect. Dates
+    before a currency's first recorded rate use that first rate, and
+    currencies with no history use the current rate.
+    """
+    __slots__ = ("_history",)
+
+    def __init__(
+        self,
+        rates: Mapping[Union[Currency, str], float],
+        history: Mapping[Union[Currency, str], Iterable[Tuple[date, float]]]
+    ):
+        super().__init__(rates)
+        object.__setattr__(self, "_history", MappingProxyType(history_arrays(history)))
+
+    @classmethod
+    def from_arrays(
+        cls,
+        rates: Mapping[Union[Currency, str], float],
+        arrays: Mapping[str, HistoryArrays],
+        to_date: Optional[date] = None
+    ) -> "RateHistory":
+        """
+        Build a RateHistory from arrays already prepared by history_arrays.
+
+        The arrays are shared, not copied, so a process-wide cache can hand
+        the same sorted history to every request. With to_date, rates
+        recorded after it are left out, as if the history had been loaded
+        up to that date.
+        """
+        table = cls(rates, {})
+        if to_date is not None:
+            cutoff = to_date.toordinal()
+            truncated = {}
+            for currency, (ordinals, values) in arrays.items():
+                end = int(np.searchsorted(ordinals, cutoff, side="right"))
+                if end:
+                    truncated[currency] = (ordinals[:end], values[:end])
+            arrays = truncated
+        object.__setattr__(table, "_history", MappingProxyType(dict(arrays)))
+        return table
+
+    def rate_as_of(self, currency: Union[Currency, str], on_date: date) -> float:
+        """Get the most recent rate recorded on or before on_date."""
+        series = self._history.get(_code(currency))
+        if series is None:
+            return self.rate(currency)
+        ordinals, values = series
+        index = bisect_right(ordinals, on_date.toordinal()) - 1
+        return float(values[max(index, 0)])
+
+    def rates_on(self, currency: Union[Currency, str], ordinals: np.ndarray) -> np.ndarray:
+        series = self._history.get(_code(currency))
+        if series is None:
+            return super().rates_on(currency, ordinals)
+        history_ordinals, values = series
+        indices = np.searchsorted(history_ordinals, np.asarray(ordinals, dtype=np.int64), side="right") - 1
+        return values[np.maximum(indices, 0)]
+
+
+def history_arrays(
+    history: Mapping[Union[Currency, str], Iterable[Tuple[date, float]]]
+) -> dict[str, HistoryArrays]:
+    """
+    Sort dated rates into one read-only (ordinals, rates) array pair per currency.
+
+    Currencies without any points are dropped.
+    """
+    arrays = {}
+    for currency, points in history.items():
+        points = sorted(points)
+        if not points:
+            continue
+        ordinals = np.fromiter((d.toordinal() for d, _ in points), dtype=np.int64, count=len(points))
+        values = np.fromiter((rate for _, rate in points), dtype=np.float64, count=len(points))
+        ordinals.setflags(write=False)
+        values.setflags(write=False)
+        arrays[_code(currency)] = (ordinals, values)
+    return arrays
@@ -0,0 +1,212 @@
+"""
+Process-local cache of computed read results.
+
+Each worker process keeps its own cache, and invalidation only reaches the
+cache of the process that handled the write. With several workers, the
+other processes can serve a stale result until it expires, so correctness
+depends on the TTL (result_cache_ttl_seconds, 300s by default).
+"""
+import itertools
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from pydantic import UUID4
+
+from nw_tracker.config.settings import get_settings
+from nw_tracker.logger import get_logger
+
+logger = get_logger()
+settings = get_settings()
+
+GLOBAL_VERSION_KEY = "version:global"
+
+
+class CacheBackend:
+    """
+    Storage interface used by ResultCache.
+
+    Values are opaque to the backend. Version counters live alongside the
+    values and must never go back to a value that live entries were keyed
+    on, otherwise stale entries would be served again. A shared backend
+    (e.g. Redis with INCR) can implement the same methods.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    async def size(self) -> int:
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Bounded in-process LRU store with per-entry TTL.
+
+    Counters take their values from one increasing sequence, so a counter
+    that is dropped and bumped again never repeats an earlier value. A
+    counter is dropped once it has not been bumped for longer than any
+    entry can live, which keeps one counter per recently invalidated user
+    rather than one per user ever seen.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # key -> (last bumped at, value), oldest bump first
+        self._counters: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._longest_ttl = ttl_seconds if ttl_seconds is not None else float("inf")
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._longest_ttl = max(self._longest_ttl, ttl if ttl is not None else float("inf"))
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        now = time.monotonic()
+        self._expire_counters(now)
+        value = next(self._sequence)
+        self._counters[key] = (now, value)
+        self._counters.move_to_end(key)
+        return value
+
+    async def get_counter(self, key: str) -> int:
+        counter = self._counters.get(key)
+        return counter[1] if counter is not None else 0
+
+    def _expire_counters(self, now: float) -> None:
+        # Every entry keyed on an expired counter's value has expired too
+        while self._counters:
+            bumped_at, _ = next(iter(self._counters.values()))
+            if bumped_at + self._longest_ttl >= now:
+                break
+            self._counters.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+
+class ResultCache:
+    """
+    Per-user cache for computed read results (dashboard, group summaries).
+
+    Keys embed a global version and the user's version. Writes bump the
+    user's version and exchange rate refreshes bump the global one, so old
+    entries are never read again and simply age out of the backend. Bumps
+    only affect this process's backend; see the module docstring.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    async def get_or_compute(
+        self,
+        user_id: UUID4,
+        namespace: str,
+        params: tuple[Hashable, ...],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached result for (user, namespace, params), computing it on a miss."""
+        if not settings.result_cache_enabled:
+            return await compute()
+
+        key = await self._build_key(user_id, namespace, params)
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits[namespace] += 1
+            return value
+
+        self.misses[namespace] += 1
+        value = await compute()
+        # Skip the write if a mutation landed while computing
+        if key == await self._build_key(user_id, namespace, params):
+            await self.backend.set(key, value)
+        return value
+
+    async def invalidate_user(self, user_id: UUID4) -> None:
+        """Drop every cached result for a user."""
+        await self.backend.incr(self._user_version_key(user_id))
+        logger.debug(f"Invalidated cached results for user {user_id}")
+
+    async def invalidate_all(self) -> None:
+        """Drop every cached result, e.g. after exchange rates change."""
+        await self.backend.incr(GLOBAL_VERSION_KEY)
+        logger.debug("Invalidated all cached results")
+
+    async def get_stats(self) -> dict:
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return {
+            "enabled": settings.result_cache_enabled,
+            "entries": await self.backend.size(),
+            "hits": sum(self.hits.values()),
+            "misses": sum(self.misses.values()),
+            "namespaces": {
+                namespace: {"hits": self.hits[namespace], "misses": self.misses[namespace]}
+                for namespace in namespaces
+            },
+        }
+
+    async def _build_key(self, user_id: UUID4, namespace: str, params: tuple[Hashable, ...]) -> str:
+        global_version = await self.backend.get_counter(GLOBAL_VERSION_KEY)
+        user_version = await self.backend.get_counter(self._user_version_key(user_id))
+        return f"{namespace}:{user_id}:{global_version}.{user_version}:{params!r}"
+
+    @staticmethod
+    def _user_version_key(user_id: UUID4) -> str:
+        return f"version:user:{user_id}"
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache, created on first use."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            InMemoryCacheBackend(
+                max_entries=settings.result_cache_max_entries,
+                ttl_seconds=settings.result_cache_ttl_seconds
+            )
+        )
+    return _result_cache
@@ -0,0 +1,99 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from nw_tracker.config.settings import get_settings
+from nw_tracker.logger import get_logger
+from nw_tracker.models.models import User
+from nw_tracker.utils.result_cache import CacheBackend, InMemoryCacheBackend
+
+logger = get_logger()
+settings = get_settings()
+
+
+class UserPrincipal:
+    """
+    Read-only snapshot of the authenticated user.
+
+    Returned by the auth dependency in place of the User row. Routes and
+    services only read scalar attributes of the current user, and a
+    snapshot cannot be attached to a session or lazy-load relationships.
+    """
+    __slots__ = ("id", "username", "email", "is_active", "created_at", "last_login")
+
+    def __init__(
+        self,
+        id: UUID,
+        username: str,
+        email: str,
+        is_active: bool,
+        created_at: Optional[datetime] = None,
+        last_login: Optional[datetime] = None
+    ):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.is_active = is_active
+        self.created_at = created_at
+        self.last_login = last_login
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            last_login=user.last_login
+        )
+
+    def __repr__(self) -> str:
+        return f"UserPrincipal(id={self.id!r}, username={self.username!r})"
+
+
+class UserCache:
+    """
+    Short-TTL cache of user principals keyed by user id.
+
+    Lets the auth dependency resolve a valid access token without a
+    database query. Entries are dropped when the user is updated, deleted
+    or logs in; the TTL bounds how long other worker processes can serve a
+    deactivated user.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    async def get(self, user_id: UUID) -> Optional[UserPrincipal]:
+        if not settings.user_cache_enabled:
+            return None
+        return await self.backend.get(self._key(user_id))
+
+    async def set(self, principal: UserPrincipal) -> None:
+        if settings.user_cache_enabled:
+            await self.backend.set(self._key(principal.id), principal)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        await self.backend.delete(self._key(user_id))
+        logger.debug(f"Invalidated cached principal for user {user_id}")
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"user:{user_id}"
+
+
+_user_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    """Process-wide user principal cache, created on first use."""
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache(
+            InMemoryCacheBackend(
+                max_entries=settings.user_cache_max_entries,
+                ttl_seconds=settings.user_cache_ttl_seconds
+            )
+        )
+    return _user_cache
@@ -0,0 +1,42 @@
+"""
+Rebuild the account_daily_balances snapshot table from the balances table.
+
+The migration that creates the table backfills it once. Run this after
+writing balances outside the API (e.g. populate_test_data.py or manual SQL),
+or to repair the table for specific accounts.
+
+Usage:
+    python scripts/backfill_account_daily_balances.py
+    python scripts/backfill_account_daily_balances.py --account <account-id> [--account <account-id> ...]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nw_tracker.config.database import AsyncSessionLocal
+from nw_tracker.repositories.account_daily_balance_repository import AccountDailyBalanceRepository
+
+
+async def backfill(account_ids: list[UUID] | None) -> None:
+    async with AsyncSessionLocal() as session:
+        rows = await AccountDailyBalanceRepository(session).rebuild(account_ids)
+        await session.commit()
+    scope = f"{len(account_ids)} account(s)" if account_ids else "all accounts"
+    print(f"✅ Rebuilt {rows} daily balance rows for {scope}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the account_daily_balances table")
+    parser.add_argument("--account", type=UUID, action="append", dest="accounts",
+                        help="Only rebuild this account (repeatable)")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.accounts))
+
+
+if __name__ == "__main__":
+    main()
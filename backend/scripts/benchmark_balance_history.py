@@ -0,0 +1,166 @@
+"""
+Benchmark for the balance history engine used by /dashboard/history and the
+account group endpoints.
+
+Generates synthetic accounts with daily balances and times the sweep-line
+compute_group_balance_history (the reference implementation in
+balance_utils) against the previous per-date reverse-scan implementation
+(kept here). The reference is skipped above
+--legacy-limit rows because it is O(dates x accounts x balances).
+
+A second table compares building every group's series with one sweep per
+group against a single BalanceMatrix shared by all groups.
+
+Usage:
+    python scripts/benchmark_balance_history.py
+    python scripts/benchmark_balance_history.py --rows 10000 100000 --accounts 40
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nw_tracker.models.models import Currency
+from nw_tracker.utils.balance_utils import compute_group_balance_history, build_balance_matrix
+from nw_tracker.utils.rate_table import RateTable
+
+RATES = {Currency.GBP: 1.0, Currency.USD: 1.27, Currency.EUR: 1.16}
+
+
+class StubExchangeRateService:
+    """In-memory stand-in for ExchangeRateService with fixed rates."""
+
+    async def convert_to_gbp(self, amount: float, currency: Currency) -> float:
+        if currency == Currency.GBP:
+            return amount
+        return amount / RATES[currency]
+
+
+def generate_accounts(rows: int, account_count: int, seed: int = 0) -> list:
+    """Generate accounts with one balance per day, split evenly across accounts."""
+    rng = random.Random(seed)
+    per_account = max(rows // account_count, 1)
+    start = date(2000, 1, 1)
+    created_at = datetime(2024, 1, 1)
+    accounts = []
+    for i in range(account_count):
+        amount = rng.uniform(1_000, 50_000)
+        balances = []
+        for day in range(per_account):
+            amount *= rng.uniform(0.98, 1.02)
+            balances.append(SimpleNamespace(
+                amount=amount,
+                date=start + timedelta(days=day),
+                created_at=created_at,
+            ))
+        accounts.append(SimpleNamespace(id=i, currency=list(RATES)[i % len(RATES)], balances=balances))
+    return accounts
+
+
+async def legacy_history(accounts, exchange_rate_service) -> list:
+    """Per-date reverse scan with one conversion await per point (previous engine)."""
+    account_balances = [
+        (acc.currency, sorted(acc.balances, key=lambda b: (b.date, b.created_at)))
+        for acc in accounts if acc.balances
+    ]
+    sorted_dates = sorted({b.date for _, balances in account_balances for b in balances})
+
+    history = []
+    for target_date in sorted_dates:
+        total_gbp = 0.0
+        for currency, balances in account_balances:
+            amount = None
+            for bal in reversed(balances):
+                if bal.date <= target_date:
+                    amount = bal.amount
+                    break
+            if amount is not None:
+                total_gbp += await exchange_rate_service.convert_to_gbp(amount, currency)
+        history.append({'date': target_date, 'total_balance_gbp': total_gbp})
+    return history
+
+
+async def time_async(fn, *args) -> tuple[float, list]:
+    started = time.perf_counter()
+    result = await fn(*args)
+    return time.perf_counter() - started, result
+
+
+def time_sync(fn, *args) -> tuple[float, list]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+async def run(rows_list: list[int], account_count: int, legacy_limit: int) -> None:
+    service = StubExchangeRateService()
+    rate_table = RateTable(RATES)
+    print(f"{'rows':>10} | {'accounts':>8} | {'points':>8} | {'sweep (s)':>10} | {'legacy (s)':>10} | {'speedup':>8}")
+    print("-" * 70)
+    for rows in rows_list:
+        accounts = generate_accounts(rows, account_count)
+        sweep_time, history = time_sync(compute_group_balance_history, accounts, None, None, rate_table)
+
+        legacy_cell, speedup_cell = "skipped", "-"
+        if rows <= legacy_limit:
+            legacy_time, legacy = await time_async(legacy_history, accounts, service)
+            assert len(legacy) == len(history)
+            legacy_cell = f"{legacy_time:10.3f}"
+            speedup_cell = f"{legacy_time / sweep_time:7.1f}x"
+
+        print(f"{rows:>10} | {account_count:>8} | {len(history):>8} | {sweep_time:10.3f} | {legacy_cell:>10} | {speedup_cell:>8}")
+
+
+def make_groups(accounts: list, group_count: int, seed: int = 0) -> list[list]:
+    """Assign accounts to overlapping groups of roughly a third of the accounts each."""
+    rng = random.Random(seed)
+    return [rng.sample(accounts, max(len(accounts) // 3, 1)) for _ in range(group_count)]
+
+
+async def run_multi_series(rows_list: list[int], account_count: int, group_count: int) -> None:
+    rate_table = RateTable(RATES)
+    print()
+    print(f"{'rows':>10} | {'groups':>8} | {'per-group (s)':>13} | {'matrix (s)':>10} | {'speedup':>8}")
+    print("-" * 62)
+    for rows in rows_list:
+        accounts = generate_accounts(rows, account_count)
+        groups = make_groups(accounts, group_count)
+
+        started = time.perf_counter()
+        compute_group_balance_history(accounts, rate_table=rate_table)
+        for group in groups:
+            compute_group_balance_history(group, rate_table=rate_table)
+        per_group_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matrix = build_balance_matrix(accounts, rate_table=rate_table)
+        matrix.history()
+        for group in groups:
+            matrix.history([account.id for account in group])
+        matrix_time = time.perf_counter() - started
+
+        print(f"{rows:>10} | {group_count:>8} | {per_group_time:13.3f} | {matrix_time:10.3f} | {per_group_time / matrix_time:7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the balance history engine")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Total balance rows to generate per run")
+    parser.add_argument("--accounts", type=int, default=40, help="Number of accounts to spread rows across")
+    parser.add_argument("--groups", type=int, default=8, help="Number of groups for the multi-series table")
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="Skip the reference implementation above this many rows")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.accounts, args.legacy_limit))
+    asyncio.run(run_multi_series(args.rows, args.accounts, args.groups))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Bulk-load historical exchange rates into the exchange_rate_history table.
+
+The CSV needs a header row with date, currency and rate columns (rate is
+"1 base = X currency"); an optional base column defaults to GBP. Dates are
+ISO formatted. Rows are streamed and written in batches, and a rate
+already stored for the same pair and date is replaced, so the load can be
+re-run. Running API processes keep the rate history cached in memory and
+reload it when their rates next change or they store a newly fetched day
+of rates; restart them to use the loaded history straight away.
+
+Example:
+    date,currency,rate
+    2019-01-02,USD,1.2706
+    2019-01-02,EUR,1.1128
+
+Usage:
+    python scripts/load_exchange_rate_history.py rates.csv
+    python scripts/load_exchange_rate_history.py rates.csv --batch-size 5000
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nw_tracker.config.database import AsyncSessionLocal
+from nw_tracker.repositories.exchange_rate_history_repository import ExchangeRateHistoryRepository
+from nw_tracker.utils.exchange_rate_csv import parse_rate_rows
+
+
+async def load(path: Path, batch_size: int) -> int:
+    total = 0
+    async with AsyncSessionLocal() as session:
+        repository = ExchangeRateHistoryRepository(session)
+        with path.open(newline="") as csv_file:
+            batch = []
+            for row in parse_rate_rows(csv_file):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    total += await repository.upsert_rates(batch)
+                    batch = []
+            total += await repository.upsert_rates(batch)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load historical exchange rates from a CSV file")
+    parser.add_argument("csv_path", type=Path, help="CSV file with date,currency,rate columns")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Rows written per statement")
+    args = parser.parse_args()
+
+    rows = asyncio.run(load(args.csv_path, args.batch_size))
+    print(f"✅ Loaded {rows} exchange rate history rows from {args.csv_path}")
+    print("ℹ️  Running API processes reload their cached rate history when their rates next change")
+    print("   or they store a newly fetched day of rates; restart them to use it straight away")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,8 +15,10 @@ from sqlalchemy import select
 from nw_tracker.config.database import AsyncSessionLocal
 from nw_tracker.models.models import User, Account, Balance, AccountGroup, UserSettings, account_group_association, AccountType, Currency, Theme
 from nw_tracker.models.auth_models import RefreshToken
-from nw_tracker.config.security import create_access_token, create_refresh_token
+from nw_tracker.config.security import create_access_token, create_refresh_token, hash_refresh_token
 from nw_tracker.config.settings import get_settings
+from nw_tracker.repositories.account_daily_balance_repository import AccountDailyBalanceRepository
+from nw_tracker.repositories.account_repository import AccountRepository
 
 settings = get_settings()
 
@@ -231,6 +233,16 @@ async def populate_test_data():
 
         print(f"✅ Created {len(associations)} account-group associations")
 
+        # Balances were inserted directly, so build their history snapshot rows
+        await session.flush()
+        snapshot_rows = await AccountDailyBalanceRepository(session).rebuild(
+            [account1.id, account2.id, account3.id, account4.id]
+        )
+        print(f"✅ Created {snapshot_rows} daily balance snapshot rows")
+        await AccountRepository(session).refresh_current_balances(
+            [account1.id, account2.id, account3.id, account4.id]
+        )
+
         # Generate JWT tokens for testing
         print("\n🔑 Generating JWT tokens...")
         access_token = create_access_token(
@@ -242,7 +254,7 @@ async def populate_test_data():
             data={"sub": str(test_user.id), "type": "refresh"}
         )
         refresh_token = RefreshToken(
-            token=refresh_token_str,
+            token_hash=hash_refresh_token(refresh_token_str),
             user_id=test_user.id,
             expires_at=datetime.utcnow() + timedelta(days=settings.jwt_refresh_token_expire_days),
             revoked=False
@@ -0,0 +1,81 @@
+"""
+Recompute the denormalized current balance columns on accounts.
+
+Balance writes through the API keep accounts.current_balance in step. Run
+this after writing balances outside the API (e.g. manual SQL), or to check
+for and repair drift. With --check nothing is written.
+
+Usage:
+    python scripts/repair_account_current_balances.py [--check]
+    python scripts/repair_account_current_balances.py --account <account-id> [--account <account-id> ...]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from nw_tracker.config.database import AsyncSessionLocal
+from nw_tracker.models.models import Account, Balance
+from nw_tracker.repositories.account_repository import AccountRepository
+
+
+async def latest_balances(session, account_ids: list[UUID]) -> dict[UUID, float]:
+    """
+    The current balance of each account: the latest dated one, the most
+    recently created on ties. DISTINCT ON walks
+    ix_balances_account_date_created_id backwards, so only one row per
+    account leaves the database. Accounts without balances are omitted.
+    """
+    if not account_ids:
+        return {}
+    query = (
+        select(Balance.account_uuid, Balance.amount)
+        .filter(Balance.account_uuid.in_(account_ids))
+        .distinct(Balance.account_uuid)
+        .order_by(Balance.account_uuid.desc(), Balance.date.desc(), Balance.created_at.desc())
+    )
+    return dict((await session.execute(query)).all())
+
+
+async def find_drift(session, account_ids: list[UUID] | None) -> list[UUID]:
+    """Accounts whose stored current balance differs from their latest balance."""
+    query = select(Account.id, Account.current_balance)
+    if account_ids:
+        query = query.filter(Account.id.in_(account_ids))
+    stored = dict((await session.execute(query)).all())
+    latest = await latest_balances(session, list(stored))
+    return [account_id for account_id, amount in stored.items() if latest.get(account_id) != amount]
+
+
+async def repair(account_ids: list[UUID] | None, check_only: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        drifted = await find_drift(session, account_ids)
+        print(f"🔎 {len(drifted)} account(s) with a stale current balance")
+        for account_id in drifted:
+            print(f"   - {account_id}")
+        if check_only:
+            return
+
+        rows = await AccountRepository(session).refresh_current_balances(account_ids)
+        await session.commit()
+    scope = f"{len(account_ids)} account(s)" if account_ids else "all accounts"
+    print(f"✅ Refreshed current balances of {rows} account(s) ({scope})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Repair the denormalized account current balances")
+    parser.add_argument("--account", type=UUID, action="append", dest="accounts",
+                        help="Only repair this account (repeatable)")
+    parser.add_argument("--check", action="store_true", help="Report drift without writing")
+    args = parser.parse_args()
+    asyncio.run(repair(args.accounts, args.check))
+
+
+if __name__ == "__main__":
+    main()
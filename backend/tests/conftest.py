@@ -6,16 +6,53 @@ Each test gets a completely fresh database.
 import pytest
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.functions import now
+import httpx
 from httpx import AsyncClient, ASGITransport
 
 from nw_tracker.models.models import Base
 from nw_tracker.main import app
-from nw_tracker.config.database import get_db
+from nw_tracker.config.database import get_db, get_ro_db
+from nw_tracker.services import exchange_rate_service
+from nw_tracker.services.exchange_rate_service import ExchangeRateService
+from nw_tracker.utils import exchange_rate_cache, result_cache, user_cache
+
+STUB_EXCHANGE_RATES = {"GBP": 1.0, "USD": 1.25, "EUR": 1.15}
+
+
+@compiles(now, "sqlite")
+def sqlite_now(element, compiler, **kw):
+    """
+    Store func.now() timestamps the way SQLAlchemy stores bound datetimes.
+
+    SQLite's CURRENT_TIMESTAMP has whole seconds ("2024-01-01 12:00:00")
+    while bound datetimes are written with microseconds, so the text
+    values of created_at would not compare like PostgreSQL timestamps.
+    """
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@pytest.fixture(autouse=True)
+def fresh_result_cache(monkeypatch):
+    """Give each test empty result and user caches with zeroed counters."""
+    monkeypatch.setattr(result_cache, "_result_cache", None)
+    monkeypatch.setattr(user_cache, "_user_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def stub_exchange_rate_api(monkeypatch):
+    """Serve the rates API from a local stub transport and start each test with a cold rate cache."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"base": "GBP", "rates": STUB_EXCHANGE_RATES})
+
+    monkeypatch.setattr(ExchangeRateService, "transport", httpx.MockTransport(handler))
+    monkeypatch.setattr(exchange_rate_cache, "_exchange_rate_cache", None)
 
 
 @pytest.fixture
-async def db_engine():
+async def db_engine(monkeypatch):
     """Create a fresh SQLite engine for each test."""
     engine = create_async_engine(
         "sqlite+aiosqlite:///:memory:",
@@ -27,6 +64,13 @@ async def db_engine():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # The rate cache loads with sessions of its own; bind them to the test database
+    monkeypatch.setattr(
+        exchange_rate_service,
+        "AsyncSessionLocal",
+        async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False),
+    )
+
     yield engine
 
     await engine.dispose()
@@ -52,6 +96,7 @@ async def test_client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_ro_db] = override_get_db
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -86,6 +131,7 @@ async def authenticated_test_client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_ro_db] = override_get_db
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
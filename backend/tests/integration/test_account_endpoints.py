@@ -2,7 +2,13 @@
 Integration tests for account endpoints.
 """
 import pytest
+from datetime import date, timedelta
 from uuid import uuid4
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import event
+from nw_tracker.models.models import Balance
+from nw_tracker.repositories.account_repository import AccountRepository
 
 
 @pytest.mark.integration
@@ -103,6 +109,61 @@ class TestCreateAccount:
 
         assert response.status_code == 422  # Validation error
 
+    async def test_create_account_with_groups(self, authenticated_test_client):
+        """Test creating an account directly into existing account groups."""
+        group_ids = []
+        for name in ("Group A", "Group B"):
+            response = await authenticated_test_client.post(
+                "/api/v1/account-groups",
+                json={"name": name, "description": name, "accounts": []},
+            )
+            group_ids.append(response.json()["id"])
+
+        response = await authenticated_test_client.post(
+            "/api/v1/accounts",
+            json={"account_name": "Grouped", "currency": "GBP", "account_type": "savings", "groups": group_ids},
+        )
+
+        assert response.status_code == 201
+        group = await authenticated_test_client.get(f"/api/v1/account-groups/{group_ids[0]}")
+        assert [account["id"] for account in group.json()["accounts"]] == [response.json()["id"]]
+
+    async def test_create_account_statement_count_is_constant(self, authenticated_test_client, db_engine):
+        """Test that initial balances and groups do not add statements per row."""
+        group_ids = []
+        for name in ("Group A", "Group B", "Group C"):
+            response = await authenticated_test_client.post(
+                "/api/v1/account-groups",
+                json={"name": name, "description": name, "accounts": []},
+            )
+            group_ids.append(response.json()["id"])
+
+        statements = []
+        event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async def count_statements(balance_count: int, groups: list[str]) -> int:
+            statements.clear()
+            response = await authenticated_test_client.post(
+                "/api/v1/accounts",
+                json={
+                    "account_name": "Counted",
+                    "currency": "GBP",
+                    "account_type": "savings",
+                    "balances": [
+                        {"amount": 100.0 + i, "date": (date.today() - timedelta(days=i)).isoformat()}
+                        for i in range(balance_count)
+                    ],
+                    "groups": groups,
+                },
+            )
+            assert response.status_code == 201
+            return len(statements)
+
+        small = await count_statements(1, group_ids[:1])
+        large = await count_statements(20, group_ids)
+
+        assert large == small
+
 
 @pytest.mark.integration
 class TestGetAllAccounts:
@@ -313,3 +374,82 @@ class TestDeleteAccount:
 
         # Service has a bug where it returns 500 instead of 403/404
         assert response.status_code == 500
+
+
+@pytest.mark.integration
+class TestCurrentBalances:
+    """Test that listings report each account's latest balance."""
+
+    async def test_latest_balance_per_account(self, authenticated_test_client, db_session):
+        account_ids = []
+        for name in ("First", "Second", "Empty"):
+            response = await authenticated_test_client.post(
+                "/api/v1/accounts",
+                json={"account_name": name, "currency": "GBP", "account_type": "savings"},
+            )
+            account_ids.append(response.json()["id"])
+        first, second, empty = (UUID(account_id) for account_id in account_ids)
+
+        db_session.add_all([
+            Balance(account_uuid=first, date=date(2024, 1, 1), amount=10.0, created_at=datetime(2024, 1, 1, 9)),
+            Balance(account_uuid=first, date=date(2024, 3, 1), amount=30.0, created_at=datetime(2024, 3, 1, 9)),
+            # Same date - the most recently created wins
+            Balance(account_uuid=first, date=date(2024, 3, 1), amount=35.0, created_at=datetime(2024, 3, 1, 17)),
+            Balance(account_uuid=first, date=date(2024, 2, 1), amount=99.0, created_at=datetime(2024, 4, 1, 9)),
+            Balance(account_uuid=second, date=date(2023, 6, 1), amount=5.0, created_at=datetime(2023, 6, 1, 9)),
+        ])
+        await db_session.commit()
+
+        # Written outside the API, so the denormalized columns need a repair
+        assert await AccountRepository(db_session).refresh_current_balances() == 3
+        await db_session.commit()
+
+        response = await authenticated_test_client.get("/api/v1/accounts")
+        current = {account["id"]: account["current_balance"] for account in response.json()}
+        assert current == {account_ids[0]: 35.0, account_ids[1]: 5.0, account_ids[2]: 0.0}
+
+    async def test_balance_writes_maintain_current_balance(self, authenticated_test_client):
+        """Test that create, update, delete and import keep the account's current balance in step."""
+        response = await authenticated_test_client.post(
+            "/api/v1/accounts",
+            json={
+                "account_name": "Maintained",
+                "currency": "GBP",
+                "account_type": "savings",
+                "balances": [{"amount": 100.0, "date": "2024-01-01"}],
+            },
+        )
+        account_id = response.json()["id"]
+
+        async def current_balance():
+            accounts = (await authenticated_test_client.get("/api/v1/accounts")).json()
+            return next(account["current_balance"] for account in accounts if account["id"] == account_id)
+
+        assert await current_balance() == 100.0
+
+        created = await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances", json={"amount": 200.0, "date": "2024-02-01"}
+        )
+        assert await current_balance() == 200.0
+
+        # An older balance does not replace the current one
+        await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances", json={"amount": 50.0, "date": "2023-12-01"}
+        )
+        assert await current_balance() == 200.0
+
+        balance_id = created.json()["id"]
+        await authenticated_test_client.put(
+            f"/api/v1/accounts/{account_id}/balances/{balance_id}", json={"amount": 250.0, "date": "2024-02-01"}
+        )
+        assert await current_balance() == 250.0
+
+        await authenticated_test_client.delete(f"/api/v1/accounts/{account_id}/balances/{balance_id}")
+        assert await current_balance() == 100.0
+
+        await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances/import",
+            content="date,amount\n2024-03-01,300\n",
+            headers={"Content-Type": "text/csv"},
+        )
+        assert await current_balance() == 300.0
@@ -4,7 +4,10 @@ Tests the actual API endpoints with SQLite database.
 """
 import pytest
 from uuid import uuid4
-from datetime import date
+from datetime import date, timedelta
+from sqlalchemy import event
+
+from nw_tracker.services import account_group_service
 
 
 @pytest.mark.integration
@@ -205,6 +208,44 @@ class TestGetAccountGroupById:
         assert "accounts" in data
         assert isinstance(data["accounts"], list)
 
+    async def test_get_account_group_balance_history(self, authenticated_test_client):
+        """Test that the group history fills forward and honours the date range."""
+        account_ids = []
+        for name, balances in [
+            ("First", [("2024-01-01", 100.0), ("2024-01-03", 300.0)]),
+            ("Second", [("2024-01-02", 50.0)]),
+        ]:
+            account_response = await authenticated_test_client.post(
+                "/api/v1/accounts",
+                json={"account_name": name, "currency": "GBP", "account_type": "savings"},
+            )
+            account_id = account_response.json()["id"]
+            account_ids.append(account_id)
+            for balance_date, amount in balances:
+                await authenticated_test_client.post(
+                    f"/api/v1/accounts/{account_id}/balances",
+                    json={"amount": amount, "date": balance_date},
+                )
+
+        create_response = await authenticated_test_client.post(
+            "/api/v1/account-groups",
+            json={"name": "History Group", "description": "History", "accounts": account_ids},
+        )
+        group_id = create_response.json()["id"]
+
+        response = await authenticated_test_client.get(
+            f"/api/v1/account-groups/{group_id}",
+            params={"from_date": "2024-01-02"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["balance_history"] == [
+            {"date": "2024-01-02", "total_balance_gbp": 150.0},
+            {"date": "2024-01-03", "total_balance_gbp": 350.0},
+        ]
+        assert data["total_balance_gbp"] == 350.0
+
     async def test_get_account_group_by_id_unauthorized(self, test_client):
         """Test getting account group without authentication."""
         fake_id = uuid4()
@@ -275,6 +316,51 @@ class TestGetAccountGroupById:
         assert account["balances"][1]["amount"] == 5200.00
 
 
+    @pytest.mark.parametrize("snapshots_enabled", [True, False])
+    async def test_get_account_group_statement_count_is_constant(
+        self, authenticated_test_client, db_engine, monkeypatch, snapshots_enabled
+    ):
+        """Test that latest balances and history do not add a query per account."""
+        monkeypatch.setattr(account_group_service.settings, "balance_snapshots_enabled", snapshots_enabled)
+
+        async def create_group(name: str, account_count: int) -> str:
+            account_ids = []
+            for i in range(account_count):
+                response = await authenticated_test_client.post(
+                    "/api/v1/accounts",
+                    json={
+                        "account_name": f"{name} {i}",
+                        "currency": "USD" if i % 2 else "GBP",
+                        "account_type": "savings",
+                        "balances": [
+                            {"amount": 100.0 * (i + 1) + day, "date": (date.today() - timedelta(days=day)).isoformat()}
+                            for day in range(3)
+                        ],
+                    },
+                )
+                account_ids.append(response.json()["id"])
+            response = await authenticated_test_client.post(
+                "/api/v1/account-groups",
+                json={"name": name, "description": name, "accounts": account_ids},
+            )
+            return response.json()["id"]
+
+        small = await create_group("Small", 1)
+        large = await create_group("Large", 6)
+        statements = []
+        event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async def count_statements(group_id: str) -> int:
+            # Warm the process-wide caches first so only the per-request queries are counted
+            await authenticated_test_client.get(f"/api/v1/account-groups/{group_id}")
+            statements.clear()
+            response = await authenticated_test_client.get(f"/api/v1/account-groups/{group_id}")
+            assert response.status_code == 200
+            assert response.json()["account_count"] in (1, 6)
+            return len(statements)
+
+        assert await count_statements(large) == await count_statements(small)
+
 @pytest.mark.integration
 class TestUpdateAccountGroup:
     """Test update account group endpoint."""
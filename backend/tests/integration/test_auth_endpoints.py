@@ -3,7 +3,13 @@ Integration tests for authentication endpoints.
 Tests the actual API endpoints with SQLite database.
 """
 import pytest
+from datetime import datetime, timedelta
 from uuid import uuid4
+from sqlalchemy import select
+
+from nw_tracker.config.security import hash_refresh_token
+from nw_tracker.models.auth_models import RefreshToken
+from nw_tracker.repositories.auth_repository import RefreshTokenRepository
 
 
 @pytest.mark.integration
@@ -294,6 +300,56 @@ class TestUserLogout:
         assert response.status_code == 200
 
 
+@pytest.mark.integration
+class TestRefreshTokenStorage:
+    """Test hashed refresh token storage and sweeping."""
+
+    async def register_and_login(self, test_client):
+        unique_id = str(uuid4())[:8]
+        email = f"tokens_{unique_id}@example.com"
+        await test_client.post(
+            "/api/v1/auth/register",
+            json={"username": f"tokens_{unique_id}", "email": email, "password": "Password123!"},
+        )
+        response = await test_client.post(
+            "/api/v1/auth/login",
+            json={"email": email, "password": "Password123!"},
+        )
+        return response.cookies["refresh_token"]
+
+    async def test_only_hash_is_stored_and_revocation_applies(self, test_client, db_session):
+        """Test that the stored row holds a digest and logout revokes it."""
+        refresh_token = await self.register_and_login(test_client)
+
+        stored = (await db_session.execute(select(RefreshToken))).scalars().all()
+        assert [row.token_hash for row in stored] == [hash_refresh_token(refresh_token)]
+
+        assert (await test_client.post("/api/v1/auth/refresh")).status_code == 200
+
+        await test_client.post("/api/v1/auth/logout")
+        test_client.cookies.set("refresh_token", refresh_token)
+        response = await test_client.post("/api/v1/auth/refresh")
+
+        assert response.status_code == 401
+
+    async def test_sweep_deletes_expired_and_revoked(self, test_client, db_session):
+        """Test that one DELETE removes expired and revoked tokens but keeps live ones."""
+        live = await self.register_and_login(test_client)
+        revoked = await self.register_and_login(test_client)
+        expired = await self.register_and_login(test_client)
+        repository = RefreshTokenRepository(db_session)
+        await repository.revoke_token(revoked)
+        expired_row = await repository.get_by_token(expired)
+        expired_row.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        await db_session.commit()
+
+        deleted = await repository.delete_expired_tokens()
+
+        assert deleted == 2
+        remaining = (await db_session.execute(select(RefreshToken.token_hash))).scalars().all()
+        assert remaining == [hash_refresh_token(live)]
+
+
 @pytest.mark.integration
 class TestGetCurrentUser:
     """Test getting current user endpoint."""
@@ -2,8 +2,10 @@
 Integration tests for balance endpoints.
 """
 import pytest
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import date, timedelta
+from sqlalchemy import select
+from nw_tracker.models.models import Balance
 
 
 @pytest.mark.integration
@@ -144,8 +146,8 @@ class TestGetAllBalances:
         # Get all balances
         response = await authenticated_test_client.get(f"/api/v1/accounts/{account_id}/balances")
 
-        # Service has a bug with UNIQUE constraint on balance IDs in some cases
-        assert response.status_code in [200, 500]
+        assert response.status_code == 200
+        assert len(response.json()) == 1
 
     async def test_get_all_balances_empty(self, authenticated_test_client):
         """Test getting balances when account has none."""
@@ -162,16 +164,15 @@ class TestGetAllBalances:
 
         response = await authenticated_test_client.get(f"/api/v1/accounts/{account_id}/balances")
 
-        # Service has a bug where it returns 500 for empty results
-        assert response.status_code == 500
+        assert response.status_code == 200
+        assert response.json() == []
 
     async def test_get_all_balances_account_not_found(self, authenticated_test_client):
         """Test getting balances for non-existent account."""
         fake_account_id = uuid4()
         response = await authenticated_test_client.get(f"/api/v1/accounts/{fake_account_id}/balances")
 
-        # Service has a bug where it returns 500 instead of 403/404
-        assert response.status_code == 500
+        assert response.status_code == 403
 
 
 @pytest.mark.integration
@@ -235,8 +236,7 @@ class TestGetBalanceById:
             f"/api/v1/accounts/{account_id}/balances/{fake_balance_id}"
         )
 
-        # Service has a bug where it returns 500 instead of 404
-        assert response.status_code == 500
+        assert response.status_code == 404
 
     async def test_get_balance_invalid_id_format(self, authenticated_test_client):
         """Test getting balance with invalid ID format."""
@@ -325,8 +325,7 @@ class TestUpdateBalance:
             json={"amount": 2000.00, "date": date.today().isoformat()}
         )
 
-        # Service has a bug where it returns 500 instead of 404
-        assert response.status_code == 500
+        assert response.status_code == 404
 
     async def test_update_balance_partial(self, authenticated_test_client):
         """Test partial balance update."""
@@ -421,3 +420,224 @@ class TestDeleteBalance:
         )
 
         assert response.status_code == 404
+
+
+@pytest.mark.integration
+class TestBalanceAccountMismatch:
+    """Test that a balance is only reachable through its own account."""
+
+    async def _accounts_with_balance(self, client):
+        account_ids = []
+        for name in ("Owner Account", "Other Account"):
+            response = await client.post(
+                "/api/v1/accounts",
+                json={"account_name": name, "currency": "GBP", "account_type": "savings"},
+            )
+            account_ids.append(response.json()["id"])
+        response = await client.post(
+            f"/api/v1/accounts/{account_ids[0]}/balances",
+            json={"amount": 1000.00, "date": "2024-01-01"}
+        )
+        return account_ids[0], account_ids[1], response.json()["id"]
+
+    async def test_wrong_account_is_not_found(self, authenticated_test_client):
+        client = authenticated_test_client
+        owner_id, other_id, balance_id = await self._accounts_with_balance(client)
+        url = f"/api/v1/accounts/{other_id}/balances/{balance_id}"
+
+        assert (await client.get(url)).status_code == 404
+        assert (await client.put(url, json={"amount": 5.0, "date": "2024-01-02"})).status_code == 404
+        assert (await client.delete(url)).status_code == 404
+
+        balances = (await client.get(f"/api/v1/accounts/{owner_id}/balances")).json()
+        assert [(balance["amount"], balance["date"]) for balance in balances] == [(1000.0, "2024-01-01")]
+        owner = (await client.get(f"/api/v1/accounts/{owner_id}")).json()
+        assert owner["current_balance"] == 1000.0
+
+
+@pytest.mark.integration
+class TestImportBalances:
+    """Test bulk balance import endpoint."""
+
+    async def _create_account(self, client) -> str:
+        response = await client.post(
+            "/api/v1/accounts",
+            json={
+                "account_name": "Imported Account",
+                "currency": "GBP",
+                "account_type": "savings",
+            },
+        )
+        return response.json()["id"]
+
+    async def _stored_balances(self, db_session, account_id: str) -> list[tuple[str, float]]:
+        result = await db_session.execute(
+            select(Balance.date, Balance.amount).filter(Balance.account_uuid == UUID(account_id)).order_by(Balance.date)
+        )
+        return [(row.date.isoformat(), row.amount) for row in result.all()]
+
+    async def test_import_csv(self, authenticated_test_client, db_session):
+        """Test importing CSV rows, with invalid rows reported by line."""
+        account_id = await self._create_account(authenticated_test_client)
+        body = (
+            "date,amount,note\n"
+            "2024-01-01,100.50,opening\n"
+            "2024-01-02,not-a-number,\n"
+            "2024-02-30,10,\n"
+            "2024-01-03,\"1,200\",\n"
+        )
+
+        response = await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances/import",
+            content=body,
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 2
+        assert [error["line"] for error in data["errors"]] == [3, 4]
+
+        assert await self._stored_balances(db_session, account_id) == [("2024-01-01", 100.5), ("2024-01-03", 1200.0)]
+
+    async def test_import_ndjson_replaces_existing_date(self, authenticated_test_client, db_session):
+        """Test that importing onto a date with a balance replaces it rather than duplicating it."""
+        account_id = await self._create_account(authenticated_test_client)
+        await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances",
+            json={"amount": 50.0, "date": "2024-01-01"},
+        )
+        body = '{"date": "2024-01-01", "amount": 75}\n\n{"date": "2024-01-02", "amount": 80}\n[1, 2]\n'
+
+        response = await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances/import?format=ndjson",
+            content=body,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["imported"] == 2
+        assert response.json()["errors"] == [{"line": 4, "error": "expected a JSON object"}]
+
+        assert await self._stored_balances(db_session, account_id) == [("2024-01-01", 75.0), ("2024-01-02", 80.0)]
+
+    async def test_import_updates_history(self, authenticated_test_client):
+        """Test that imported balances show up in the account's history."""
+        account_id = await self._create_account(authenticated_test_client)
+        await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances/import",
+            content="date,amount\n2024-01-01,100\n2024-01-05,150\n",
+            headers={"Content-Type": "text/csv; charset=utf-8"},
+        )
+
+        response = await authenticated_test_client.get(f"/api/v1/accounts/{account_id}")
+
+        assert response.status_code == 200
+        assert response.json()["current_balance"] == 150.0
+
+    async def test_import_missing_csv_column(self, authenticated_test_client):
+        """Test that a CSV without a date/amount header is rejected."""
+        account_id = await self._create_account(authenticated_test_client)
+
+        response = await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances/import",
+            content="day,value\n2024-01-01,100\n",
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == 400
+
+    async def test_import_unsupported_content_type(self, authenticated_test_client):
+        """Test that an unknown body format is rejected."""
+        account_id = await self._create_account(authenticated_test_client)
+
+        response = await authenticated_test_client.post(
+            f"/api/v1/accounts/{account_id}/balances/import",
+            content="<balances/>",
+            headers={"Content-Type": "application/xml"},
+        )
+
+        assert response.status_code == 415
+
+    async def test_import_account_not_owned(self, authenticated_test_client):
+        """Test importing into an account that does not belong to the user."""
+        response = await authenticated_test_client.post(
+            f"/api/v1/accounts/{uuid4()}/balances/import",
+            content="date,amount\n2024-01-01,100\n",
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == 403
+
+    async def test_import_unauthorized(self, test_client):
+        """Test importing without authentication."""
+        response = await test_client.post(
+            f"/api/v1/accounts/{uuid4()}/balances/import",
+            content="date,amount\n",
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.status_code in [401, 403]
+
+
+@pytest.mark.integration
+class TestListBalancesPagination:
+    """Test keyset pagination and date filtering on the balance listing."""
+
+    async def _account_with_balances(self, client, days: int) -> str:
+        response = await client.post(
+            "/api/v1/accounts",
+            json={
+                "account_name": "Paged Account",
+                "currency": "GBP",
+                "account_type": "savings",
+                "balances": [{"amount": float(i), "date": f"2024-01-{i:02d}"} for i in range(1, days + 1)],
+            },
+        )
+        return response.json()["id"]
+
+    async def test_pages_cover_every_balance_once(self, authenticated_test_client):
+        account_id = await self._account_with_balances(authenticated_test_client, 7)
+
+        dates, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = await authenticated_test_client.get(f"/api/v1/accounts/{account_id}/balances", params=params)
+            assert response.status_code == 200
+            dates += [balance["date"] for balance in response.json()]
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert pages == 3
+        assert dates == [f"2024-01-{i:02d}" for i in range(7, 0, -1)]
+
+    async def test_date_range_filter(self, authenticated_test_client):
+        account_id = await self._account_with_balances(authenticated_test_client, 7)
+
+        response = await authenticated_test_client.get(
+            f"/api/v1/accounts/{account_id}/balances",
+            params={"from_date": "2024-01-03", "to_date": "2024-01-05"},
+        )
+
+        assert response.status_code == 200
+        assert [balance["date"] for balance in response.json()] == ["2024-01-05", "2024-01-04", "2024-01-03"]
+        assert "X-Next-Cursor" not in response.headers
+
+    async def test_invalid_cursor(self, authenticated_test_client):
+        account_id = await self._account_with_balances(authenticated_test_client, 1)
+
+        response = await authenticated_test_client.get(
+            f"/api/v1/accounts/{account_id}/balances",
+            params={"limit": 1, "cursor": "not-a-cursor"},
+        )
+
+        assert response.status_code == 400
+
+    async def test_account_not_owned(self, authenticated_test_client):
+        response = await authenticated_test_client.get(f"/api/v1/accounts/{uuid4()}/balances", params={"limit": 1})
+
+        assert response.status_code == 403
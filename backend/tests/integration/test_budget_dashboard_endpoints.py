@@ -0,0 +1,239 @@
+"""
+Integration tests for budget dashboard endpoints.
+"""
+import pytest
+from datetime import date
+from sqlalchemy import event, select
+
+from nw_tracker.models.budget_models import BudgetMonthTotalModel
+from nw_tracker.repositories.budget_month_total_repository import BudgetMonthTotalRepository
+
+from nw_tracker.services.budget_dashboard_service import trailing_months
+
+
+async def create_budget(client):
+    """Recurring and one-time income/expenses, with one-time items in this and last month."""
+    periods = trailing_months(date.today(), 2)
+    (last_year, last_month), (year, month) = periods
+    category = await client.post("/api/v1/budget-categories", json={"name": "Bills"})
+    category_id = category.json()["id"]
+
+    items = [
+        ("/api/v1/income", {"description": "Salary", "amount": 3000.0, "frequency": "MONTHLY"}),
+        ("/api/v1/income", {"description": "Bonus", "amount": 500.0, "frequency": "ONE_TIME",
+                            "effective_month": last_month, "effective_year": last_year}),
+        ("/api/v1/income", {"description": "Old bonus", "amount": 900.0, "frequency": "ONE_TIME",
+                            "effective_month": month, "effective_year": year - 5}),
+        ("/api/v1/expenses", {"description": "Rent", "amount": 1000.0, "frequency": "MONTHLY",
+                              "category_id": category_id}),
+        ("/api/v1/expenses", {"description": "Holiday", "amount": 250.0, "frequency": "ONE_TIME",
+                              "category_id": category_id, "effective_month": month, "effective_year": year}),
+        ("/api/v1/expenses", {"description": "Insurance", "amount": 600.0, "frequency": "YEARLY",
+                              "category_id": category_id}),
+    ]
+    for path, body in items:
+        response = await client.post(path, json=body)
+        assert response.status_code == 201
+    return periods
+
+
+@pytest.mark.integration
+class TestBudgetTrends:
+    """Test budget trends endpoint."""
+
+    async def test_trends_totals(self, authenticated_test_client):
+        """Test monthly totals combine recurring items with that month's one-time items."""
+        (last_year, last_month), (year, month) = await create_budget(authenticated_test_client)
+
+        response = await authenticated_test_client.get("/api/v1/budget-dashboard/trends?months=3")
+
+        assert response.status_code == 200
+        months = response.json()["months"]
+        assert len(months) == 3
+        assert [(m["year"], m["month"]) for m in months[1:]] == [(last_year, last_month), (year, month)]
+        first, previous, current = months
+        assert (first["income"], first["expenses"]) == (3000.0, 1000.0)
+        assert (previous["income"], previous["expenses"]) == (3500.0, 1000.0)
+        assert (current["income"], current["expenses"], current["surplus_deficit"]) == (3000.0, 1250.0, 1750.0)
+
+    async def test_trends_statement_count_is_constant(self, authenticated_test_client, db_engine):
+        """Test that asking for more months does not add queries."""
+        await create_budget(authenticated_test_client)
+        statements = []
+        event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async def count_statements(months: int) -> int:
+            statements.clear()
+            response = await authenticated_test_client.get(f"/api/v1/budget-dashboard/trends?months={months}")
+            assert response.status_code == 200
+            assert len(response.json()["months"]) == months
+            return len(statements)
+
+        assert await count_statements(1) == await count_statements(24)
+
+
+@pytest.mark.integration
+class TestBudgetSummary:
+    """Test budget summary endpoint."""
+
+    async def test_monthly_summary_breakdown(self, authenticated_test_client):
+        """Test totals and per-category breakdown for a month with one-time items."""
+        (last_year, last_month), (year, month) = await create_budget(authenticated_test_client)
+        category = await authenticated_test_client.post("/api/v1/budget-categories", json={"name": "Food"})
+        await authenticated_test_client.post(
+            "/api/v1/expenses",
+            json={"description": "Groceries", "amount": 250.0, "frequency": "MONTHLY",
+                  "category_id": category.json()["id"]},
+        )
+
+        response = await authenticated_test_client.get(f"/api/v1/budget-dashboard/summary/{last_month}/{last_year}")
+
+        assert response.status_code == 200
+        summary = response.json()
+        assert summary["total_income"] == 3500.0
+        assert summary["total_expenses"] == 1250.0
+        assert summary["surplus_deficit"] == 2250.0
+        assert [(item["category_name"], item["amount"]) for item in summary["expense_breakdown"]] == [
+            ("Bills", 1000.0), ("Food", 250.0)
+        ]
+
+        current = await authenticated_test_client.get(f"/api/v1/budget-dashboard/summary/{month}/{year}")
+        assert current.json()["total_expenses"] == 1500.0
+
+
+async def read_ledger(db_session):
+    result = await db_session.execute(select(BudgetMonthTotalModel))
+    return sorted(
+        (row.kind.value, row.frequency.value, row.year, row.month, str(row.category_id), row.amount)
+        for row in result.scalars().all()
+    )
+
+
+@pytest.mark.integration
+class TestBudgetLedger:
+    """Test the budget_month_totals ledger maintained by income and expense writes."""
+
+    async def test_yearly_summary(self, authenticated_test_client):
+        """Test monthly items count twelve times, yearly items once and one-time items in their year."""
+        (last_year, last_month), (year, month) = await create_budget(authenticated_test_client)
+
+        response = await authenticated_test_client.get(f"/api/v1/budget-dashboard/yearly/{year}")
+
+        assert response.status_code == 200
+        summary = response.json()
+        assert summary["total_income"] == 36000.0 + (500.0 if last_year == year else 0.0)
+        assert summary["total_expenses"] == 12000.0 + 600.0 + 250.0
+
+    async def test_recurring_items_share_one_baseline_row(self, authenticated_test_client, db_session):
+        """Test that recurring items update a baseline row instead of one row per month."""
+        await create_budget(authenticated_test_client)
+        await authenticated_test_client.post(
+            "/api/v1/income", json={"description": "Side job", "amount": 400.0, "frequency": "MONTHLY"}
+        )
+
+        rows = await read_ledger(db_session)
+
+        monthly_income = [row for row in rows if row[:2] == ("INCOME", "MONTHLY")]
+        assert monthly_income == [("INCOME", "MONTHLY", 0, 0, "None", 3400.0)]
+        assert len(rows) == 6
+
+    async def test_racing_refresh_updates_instead_of_duplicating(self, authenticated_test_client, db_session):
+        """Test that totals written again for a period already in the ledger are upserted."""
+        await create_budget(authenticated_test_client)
+        before = await read_ledger(db_session)
+
+        # What a concurrent refresh does after its delete missed the other's uncommitted rows
+        await BudgetMonthTotalRepository(db_session)._write_totals(lambda model: [])
+
+        assert await read_ledger(db_session) == before
+        assert {row[0] for row in before} == {"INCOME", "EXPENSE"}
+
+    async def test_updates_and_deletes_keep_ledger_in_sync(self, authenticated_test_client, db_session):
+        """Test that incremental refreshes always match a full rebuild."""
+        (last_year, last_month), (year, month) = await create_budget(authenticated_test_client)
+        expenses = (await authenticated_test_client.get("/api/v1/expenses")).json()
+        holiday = next(expense for expense in expenses if expense["description"] == "Holiday")
+        income = (await authenticated_test_client.get("/api/v1/income")).json()
+        salary = next(item for item in income if item["description"] == "Salary")
+
+        # Move the holiday to last month, turn salary into a one-time payment, drop the rent
+        response = await authenticated_test_client.put(
+            f"/api/v1/expenses/{holiday['id']}",
+            json={"effective_month": last_month, "effective_year": last_year, "amount": 300.0},
+        )
+        assert response.status_code == 200
+        response = await authenticated_test_client.put(
+            f"/api/v1/income/{salary['id']}",
+            json={"frequency": "ONE_TIME", "effective_month": month, "effective_year": year},
+        )
+        assert response.status_code == 200
+        rent = next(expense for expense in expenses if expense["description"] == "Rent")
+        response = await authenticated_test_client.delete(f"/api/v1/expenses/{rent['id']}")
+        assert response.status_code == 204
+
+        incremental = await read_ledger(db_session)
+        await BudgetMonthTotalRepository(db_session).rebuild()
+        assert incremental == await read_ledger(db_session)
+
+        summary = (await authenticated_test_client.get(f"/api/v1/budget-dashboard/summary/{last_month}/{last_year}")).json()
+        assert (summary["total_income"], summary["total_expenses"]) == (500.0, 300.0)
+        summary = (await authenticated_test_client.get(f"/api/v1/budget-dashboard/summary/{month}/{year}")).json()
+        assert (summary["total_income"], summary["total_expenses"]) == (3000.0, 0.0)
+
+    async def test_category_delete_drops_its_totals(self, authenticated_test_client, db_session):
+        """Test that deleting a category removes its expenses from the ledger."""
+        await create_budget(authenticated_test_client)
+        category_id = (await authenticated_test_client.get("/api/v1/budget-categories")).json()[0]["id"]
+
+        response = await authenticated_test_client.delete(f"/api/v1/budget-categories/{category_id}")
+
+        assert response.status_code == 204
+        rows = await read_ledger(db_session)
+        assert rows and all(row[0] == "INCOME" for row in rows)
+
+
+@pytest.mark.integration
+class TestBudgetProjection:
+    """Test budget projection endpoint."""
+
+    async def test_projection_with_net_worth(self, authenticated_test_client):
+        """Test surplus accumulates over the horizon on top of the dashboard total."""
+        await create_budget(authenticated_test_client)
+        await authenticated_test_client.post(
+            "/api/v1/accounts",
+            json={
+                "account_name": "Savings",
+                "currency": "GBP",
+                "account_type": "savings",
+                "balances": [{"amount": 10000.0, "date": date.today().isoformat()}],
+            },
+        )
+
+        response = await authenticated_test_client.get(
+            "/api/v1/budget-dashboard/projection?months=600&include_net_worth=true"
+        )
+
+        assert response.status_code == 200
+        projection = response.json()
+        assert projection["starting_net_worth"] == 10000.0
+        months = projection["months"]
+        assert len(months) == 600
+        assert (months[0]["income"], months[0]["expenses"]) == (3000.0, 1050.0)
+        assert months[-1]["cumulative_surplus"] == pytest.approx(1950.0 * 600)
+        assert months[-1]["projected_net_worth"] == pytest.approx(10000.0 + 1950.0 * 600)
+
+    async def test_projection_without_net_worth(self, authenticated_test_client):
+        await create_budget(authenticated_test_client)
+
+        response = await authenticated_test_client.get(
+            "/api/v1/budget-dashboard/projection?months=12&annual_return_rate=5"
+        )
+
+        assert response.status_code == 200
+        assert response.json()["starting_net_worth"] is None
+        assert all(month["projected_net_worth"] is None for month in response.json()["months"])
+
+    async def test_projection_horizon_is_capped(self, authenticated_test_client):
+        response = await authenticated_test_client.get("/api/v1/budget-dashboard/projection?months=601")
+
+        assert response.status_code == 422
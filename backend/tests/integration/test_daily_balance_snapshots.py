@@ -0,0 +1,129 @@
+"""
+Integration tests for the account_daily_balances snapshot table.
+Balance writes through the API must leave the table equal to a full rebuild,
+and history endpoints must read the same values from either source.
+"""
+import pytest
+from datetime import date
+from sqlalchemy import select
+
+from nw_tracker.models.models import AccountDailyBalance
+from nw_tracker.repositories.account_daily_balance_repository import AccountDailyBalanceRepository
+from nw_tracker.services import account_group_service, dashboard_service
+from nw_tracker.utils import result_cache
+
+
+async def snapshot_rows(db_session):
+    result = await db_session.execute(
+        select(AccountDailyBalance.account_id, AccountDailyBalance.date, AccountDailyBalance.amount, AccountDailyBalance.delta)
+        .order_by(AccountDailyBalance.account_id, AccountDailyBalance.date)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def create_account(client, name):
+    response = await client.post(
+        "/api/v1/accounts",
+        json={"account_name": name, "currency": "GBP", "account_type": "savings"},
+    )
+    return response.json()["id"]
+
+
+async def add_balance(client, account_id, balance_date, amount):
+    response = await client.post(
+        f"/api/v1/accounts/{account_id}/balances",
+        json={"amount": amount, "date": balance_date.isoformat()},
+    )
+    return response.json()["id"]
+
+
+@pytest.mark.integration
+class TestDailyBalanceMaintenance:
+    """Test that balance writes keep the snapshot table in sync."""
+
+    async def test_writes_match_full_rebuild(self, authenticated_test_client, db_session):
+        """Test that incremental refreshes produce the same rows as a rebuild."""
+        client = authenticated_test_client
+        savings = await create_account(client, "Savings")
+        current = await create_account(client, "Current")
+
+        await add_balance(client, savings, date(2024, 1, 1), 100.0)
+        middle = await add_balance(client, savings, date(2024, 1, 5), 150.0)
+        await add_balance(client, savings, date(2024, 1, 9), 120.0)
+        await add_balance(client, savings, date(2024, 1, 5), 175.0)
+        moved = await add_balance(client, current, date(2024, 1, 3), 40.0)
+        await add_balance(client, current, date(2024, 1, 7), 60.0)
+
+        # Move a balance to another date, then delete one in the middle of a series
+        await client.put(
+            f"/api/v1/accounts/{current}/balances/{moved}",
+            json={"amount": 45.0, "date": "2024-01-08"},
+        )
+        await client.delete(f"/api/v1/accounts/{savings}/balances/{middle}")
+
+        incremental = await snapshot_rows(db_session)
+        await AccountDailyBalanceRepository(db_session).rebuild()
+        rebuilt = await snapshot_rows(db_session)
+
+        assert incremental == rebuilt
+        assert len(rebuilt) == 5
+
+    async def test_initial_balances_create_rows(self, authenticated_test_client, db_session):
+        """Test that balances sent with a new account are snapshotted."""
+        response = await authenticated_test_client.post(
+            "/api/v1/accounts",
+            json={
+                "account_name": "Seeded",
+                "currency": "GBP",
+                "account_type": "savings",
+                "balances": [
+                    {"amount": 10.0, "date": "2024-01-01"},
+                    {"amount": 25.0, "date": "2024-02-01"},
+                ],
+            },
+        )
+        assert response.status_code == 201
+
+        rows = await snapshot_rows(db_session)
+        assert [(row[1], row[2], row[3]) for row in rows] == [
+            (date(2024, 1, 1), 10.0, 10.0),
+            (date(2024, 2, 1), 25.0, 15.0),
+        ]
+
+
+@pytest.mark.integration
+class TestSnapshotHistoryReads:
+    """Test that history endpoints agree with and without snapshots."""
+
+    async def test_history_matches_raw_balances(self, authenticated_test_client, monkeypatch):
+        """Test dashboard and group history from snapshots against the raw engine."""
+        client = authenticated_test_client
+        savings = await create_account(client, "Savings")
+        current = await create_account(client, "Current")
+        for balance_date, amount in [(date(2024, 1, 1), 100.0), (date(2024, 1, 5), 150.0), (date(2024, 2, 1), 90.0)]:
+            await add_balance(client, savings, balance_date, amount)
+        for balance_date, amount in [(date(2024, 1, 3), 40.0), (date(2024, 1, 20), 55.0)]:
+            await add_balance(client, current, balance_date, amount)
+        group_response = await client.post(
+            "/api/v1/account-groups",
+            json={"name": "Both", "description": "Both", "accounts": [savings, current]},
+        )
+        group_id = group_response.json()["id"]
+
+        urls = [
+            ("/api/v1/dashboard/history", {"from_date": "2024-01-04"}),
+            ("/api/v1/dashboard/history", {"to_date": "2024-01-20"}),
+            (f"/api/v1/account-groups/{group_id}", {"from_date": "2024-01-04", "to_date": "2024-01-31"}),
+            ("/api/v1/account-groups", {}),
+        ]
+
+        # Both passes must compute, not read the first pass back from the cache
+        monkeypatch.setattr(result_cache.settings, "result_cache_enabled", False)
+        responses = {}
+        for enabled in (True, False):
+            for module in (dashboard_service, account_group_service):
+                monkeypatch.setattr(module.settings, "balance_snapshots_enabled", enabled)
+            responses[enabled] = [(await client.get(url, params=params)).json() for url, params in urls]
+
+        assert responses[True] == responses[False]
+        assert responses[True][0]["total_history"][0] == {"date": "2024-01-05", "total_balance_gbp": 190.0}
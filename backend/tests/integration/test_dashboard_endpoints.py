@@ -0,0 +1,259 @@
+"""
+Integration tests for dashboard endpoints.
+"""
+import pytest
+from datetime import date
+from sqlalchemy import event
+
+from nw_tracker.config import dependencies
+from nw_tracker.services import account_group_service, dashboard_service
+
+METRICS_TOKEN = "test-metrics-token"
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    """Enable the internal metrics endpoints with a known token."""
+    monkeypatch.setattr(dependencies.settings, "metrics_token", METRICS_TOKEN)
+    return {"X-Metrics-Token": METRICS_TOKEN}
+
+
+async def create_account(client, name, balances, is_excluded_from_totals=False):
+    """Create a GBP account with the given (date, amount) balances."""
+    response = await client.post(
+        "/api/v1/accounts",
+        json={
+            "account_name": name,
+            "currency": "GBP",
+            "account_type": "savings",
+        },
+    )
+    account_id = response.json()["id"]
+    if is_excluded_from_totals:
+        await client.patch(f"/api/v1/accounts/{account_id}/toggle-exclusion")
+    for balance_date, amount in balances:
+        await client.post(
+            f"/api/v1/accounts/{account_id}/balances",
+            json={"amount": amount, "date": balance_date.isoformat()},
+        )
+    return account_id
+
+
+async def create_group(client, name, account_ids):
+    response = await client.post(
+        "/api/v1/account-groups",
+        json={"name": name, "description": name, "accounts": account_ids},
+    )
+    return response.json()["id"]
+
+
+@pytest.mark.integration
+class TestDashboardHistory:
+    """Test dashboard history endpoint."""
+
+    async def test_get_history_unauthorized(self, test_client):
+        """Test getting dashboard history without authentication."""
+        response = await test_client.get("/api/v1/dashboard/history")
+        assert response.status_code in [401, 403]
+
+    async def test_get_history_empty(self, authenticated_test_client):
+        """Test dashboard history for a user with no accounts."""
+        response = await authenticated_test_client.get("/api/v1/dashboard/history")
+
+        assert response.status_code == 200
+        assert response.json() == {"total_history": [], "group_histories": []}
+
+    async def test_get_history_total_and_groups(self, authenticated_test_client):
+        """Test that total and group series come from the same accounts."""
+        savings = await create_account(
+            authenticated_test_client, "Savings",
+            [(date(2024, 1, 1), 100.0), (date(2024, 1, 3), 300.0)],
+        )
+        pension = await create_account(
+            authenticated_test_client, "Pension",
+            [(date(2024, 1, 2), 50.0)],
+            is_excluded_from_totals=True,
+        )
+        group_id = await create_group(authenticated_test_client, "Everything", [savings, pension])
+        await create_group(authenticated_test_client, "Empty", [])
+
+        response = await authenticated_test_client.get("/api/v1/dashboard/history")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_history"] == [
+            {"date": "2024-01-01", "total_balance_gbp": 100.0},
+            {"date": "2024-01-03", "total_balance_gbp": 300.0},
+        ]
+        assert len(data["group_histories"]) == 1
+        group = data["group_histories"][0]
+        assert group["group_id"] == group_id
+        assert group["history"] == [
+            {"date": "2024-01-01", "total_balance_gbp": 100.0},
+            {"date": "2024-01-02", "total_balance_gbp": 150.0},
+            {"date": "2024-01-03", "total_balance_gbp": 350.0},
+        ]
+
+    async def test_get_history_monthly_resolution(self, authenticated_test_client):
+        """Test that monthly resolution keeps the last point of each month."""
+        await create_account(
+            authenticated_test_client, "Savings",
+            [(date(2024, 1, 1), 100.0), (date(2024, 1, 20), 200.0), (date(2024, 2, 3), 250.0)],
+        )
+
+        response = await authenticated_test_client.get(
+            "/api/v1/dashboard/history", params={"resolution": "monthly"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total_history"] == [
+            {"date": "2024-01-20", "total_balance_gbp": 200.0},
+            {"date": "2024-02-03", "total_balance_gbp": 250.0},
+        ]
+
+    async def test_get_history_invalid_resolution(self, authenticated_test_client):
+        """Test that unknown resolutions are rejected."""
+        response = await authenticated_test_client.get(
+            "/api/v1/dashboard/history", params={"resolution": "hourly"}
+        )
+
+        assert response.status_code == 422
+
+
+@pytest.mark.integration
+class TestDashboardSummary:
+    """Test dashboard summary endpoint."""
+
+    async def test_get_summary_group_totals(self, authenticated_test_client):
+        """Test that group totals include accounts excluded from the main total."""
+        savings = await create_account(
+            authenticated_test_client, "Savings", [(date(2024, 1, 1), 100.0)]
+        )
+        pension = await create_account(
+            authenticated_test_client, "Pension", [(date(2024, 1, 2), 50.0)],
+            is_excluded_from_totals=True,
+        )
+        await create_group(authenticated_test_client, "Everything", [savings, pension])
+
+        response = await authenticated_test_client.get("/api/v1/dashboard")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_balance_gbp"] == 100.0
+        assert [g["total_balance_gbp"] for g in data["groups"]] == [150.0]
+
+
+@pytest.mark.integration
+class TestDashboardResultCache:
+    """Test that cached dashboard results are dropped on writes."""
+
+    async def test_balance_write_invalidates_summary(self, authenticated_test_client, metrics_token):
+        """Test that a repeated read is a hit and a balance write forces a recompute."""
+        client = authenticated_test_client
+        savings = await create_account(client, "Savings", [(date(2024, 1, 1), 100.0)])
+
+        first = await client.get("/api/v1/dashboard")
+        second = await client.get("/api/v1/dashboard")
+        assert first.json() == second.json()
+
+        await client.post(
+            f"/api/v1/accounts/{savings}/balances",
+            json={"amount": 250.0, "date": "2024-02-01"},
+        )
+        third = await client.get("/api/v1/dashboard")
+        assert third.json()["total_balance_gbp"] == 250.0
+
+        metrics = await client.get("/api/v1/metrics/cache", headers=metrics_token)
+        assert metrics.status_code == 200
+        assert metrics.json()["namespaces"]["dashboard_summary"] == {"hits": 1, "misses": 2}
+
+    async def test_group_write_invalidates_history(self, authenticated_test_client):
+        """Test that creating a group shows up in a previously cached history."""
+        client = authenticated_test_client
+        savings = await create_account(client, "Savings", [(date(2024, 1, 1), 100.0)])
+
+        before = await client.get("/api/v1/dashboard/history")
+        assert before.json()["group_histories"] == []
+
+        await create_group(client, "Everything", [savings])
+        after = await client.get("/api/v1/dashboard/history")
+        assert [g["group_name"] for g in after.json()["group_histories"]] == ["Everything"]
+
+    async def test_metrics_unauthorized(self, test_client, metrics_token):
+        """Test that cache metrics require the metrics token."""
+        response = await test_client.get("/api/v1/metrics/cache")
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize("path", ["/api/v1/metrics/cache", "/api/v1/metrics/pools"])
+    async def test_metrics_forbidden_for_users(self, authenticated_test_client, metrics_token, path):
+        """Test that a regular user's access token does not open the metrics endpoints."""
+        response = await authenticated_test_client.get(path)
+        assert response.status_code == 403
+
+        wrong = await authenticated_test_client.get(path, headers={"X-Metrics-Token": "guess"})
+        assert wrong.status_code == 403
+
+    async def test_metrics_disabled_without_token(self, authenticated_test_client):
+        """Test that the metrics endpoints do not exist when no token is configured."""
+        response = await authenticated_test_client.get(
+            "/api/v1/metrics/cache", headers={"X-Metrics-Token": ""}
+        )
+        assert response.status_code == 404
+
+    async def test_pool_metrics(self, test_client, metrics_token):
+        """Test that pool metrics list the primary engine."""
+        response = await test_client.get("/api/v1/metrics/pools", headers=metrics_token)
+        assert response.status_code == 200
+        assert "primary" in [pool["name"] for pool in response.json()]
+
+
+@pytest.mark.integration
+class TestSnapshotHistoryQueries:
+    """Test that snapshot-backed histories do not query once per group."""
+
+    @pytest.mark.parametrize("path", ["/api/v1/dashboard/history", "/api/v1/account-groups"])
+    async def test_statement_count_is_constant_in_groups(self, authenticated_test_client, db_engine, monkeypatch, path):
+        monkeypatch.setattr(dashboard_service.settings, "balance_snapshots_enabled", True)
+        monkeypatch.setattr(account_group_service.settings, "balance_snapshots_enabled", True)
+        account_ids = [
+            await create_account(authenticated_test_client, f"Account {i}", [(date(2024, 1, 1 + i), 100.0 * (i + 1))])
+            for i in range(3)
+        ]
+        await create_group(authenticated_test_client, "Group 0", account_ids)
+        # Warm the process-wide rate caches
+        assert (await authenticated_test_client.get(path)).status_code == 200
+
+        statements = []
+        event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async def count_statements() -> int:
+            statements.clear()
+            response = await authenticated_test_client.get(path)
+            assert response.status_code == 200
+            return len(statements)
+
+        # Creating a group invalidates the cached result, so each count is a fresh computation
+        await create_group(authenticated_test_client, "Group 1", account_ids[:1])
+        small = await count_statements()
+        for i in range(2, 7):
+            await create_group(authenticated_test_client, f"Group {i}", account_ids[i % 3:])
+        large = await count_statements()
+
+        assert small > 0
+        assert large == small
+
+    async def test_group_histories_from_one_query(self, authenticated_test_client, monkeypatch):
+        """Test that an account shared by two groups counts towards both."""
+        monkeypatch.setattr(dashboard_service.settings, "balance_snapshots_enabled", True)
+        shared = await create_account(authenticated_test_client, "Shared", [(date(2024, 1, 1), 100.0)])
+        other = await create_account(authenticated_test_client, "Other", [(date(2024, 1, 2), 50.0)])
+        first = await create_group(authenticated_test_client, "First", [shared])
+        second = await create_group(authenticated_test_client, "Second", [shared, other])
+        empty = await create_group(authenticated_test_client, "Empty", [])
+
+        response = await authenticated_test_client.get("/api/v1/dashboard/history?from_date=2024-01-01&to_date=2024-01-02")
+
+        histories = {series["group_id"]: series["history"] for series in response.json()["group_histories"]}
+        assert [point["total_balance_gbp"] for point in histories[first]] == [100.0]
+        assert [point["total_balance_gbp"] for point in histories[second]] == [100.0, 150.0]
+        assert empty not in histories
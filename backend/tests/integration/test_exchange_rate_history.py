@@ -0,0 +1,96 @@
+"""
+Integration tests for historical exchange rates.
+"""
+import pytest
+from datetime import date
+
+from nw_tracker.repositories.exchange_rate_history_repository import ExchangeRateHistoryRepository
+from nw_tracker.utils.exchange_rate_cache import get_exchange_rate_cache
+from nw_tracker.utils.exchange_rate_csv import parse_rate_rows
+
+
+def rate_row(target_currency, rate_date, rate):
+    return {"base_currency": "GBP", "target_currency": target_currency, "rate_date": rate_date, "rate": rate}
+
+
+@pytest.mark.integration
+class TestExchangeRateHistoryRepository:
+    """Test storing and reading dated rates."""
+
+    async def test_upsert_replaces_same_date(self, db_session):
+        """Test that re-loading a date replaces its rate and history comes back in order."""
+        repo = ExchangeRateHistoryRepository(db_session)
+        await repo.upsert_rates([
+            rate_row("USD", date(2024, 1, 2), 1.30),
+            rate_row("USD", date(2024, 1, 1), 1.20),
+            rate_row("EUR", date(2024, 1, 1), 1.10),
+        ])
+        await repo.upsert_rates([rate_row("USD", date(2024, 1, 2), 1.35)])
+
+        assert await repo.get_history("GBP") == {
+            "EUR": [(date(2024, 1, 1), 1.10)],
+            "USD": [(date(2024, 1, 1), 1.20), (date(2024, 1, 2), 1.35)],
+        }
+        assert await repo.get_history("GBP", to_date=date(2024, 1, 1)) == {
+            "EUR": [(date(2024, 1, 1), 1.10)],
+            "USD": [(date(2024, 1, 1), 1.20)],
+        }
+
+
+@pytest.mark.integration
+class TestLoadExchangeRateHistory:
+    """Test the CSV loader's parsing."""
+
+    def test_parse_rows(self):
+        """Test that rows parse with the default base currency."""
+        lines = ["date,currency,rate", "2019-01-02,usd,1.2706", "2019-01-02,EUR,1.1128"]
+
+        assert list(parse_rate_rows(lines)) == [
+            rate_row("USD", date(2019, 1, 2), 1.2706),
+            rate_row("EUR", date(2019, 1, 2), 1.1128),
+        ]
+
+    @pytest.mark.parametrize("lines, message", [
+        (["date,rate", "2019-01-02,1.2"], "missing column"),
+        (["date,currency,rate", "2019-01-02,JPY,150"], "Line 2"),
+        (["date,currency,rate", "2019-01-02,USD,0"], "Line 2"),
+        (["date,currency,rate", "02/01/2019,USD,1.2"], "Line 2"),
+    ])
+    def test_parse_errors(self, lines, message):
+        """Test that bad input names the offending line."""
+        with pytest.raises(ValueError, match=message):
+            list(parse_rate_rows(lines))
+
+
+@pytest.mark.integration
+class TestHistoryUsesDatedRates:
+    """Test that history endpoints convert each point at its own date's rate."""
+
+    async def test_dashboard_history(self, authenticated_test_client, db_session):
+        """Test dated history conversion alongside current-rate totals."""
+        await get_exchange_rate_cache().set({"USD": 5.0, "EUR": 1.0})
+        await ExchangeRateHistoryRepository(db_session).upsert_rates([
+            rate_row("USD", date(2024, 1, 1), 2.0),
+            rate_row("USD", date(2024, 1, 3), 4.0),
+        ])
+        client = authenticated_test_client
+        response = await client.post(
+            "/api/v1/accounts",
+            json={"account_name": "Brokerage", "currency": "USD", "account_type": "savings"},
+        )
+        account_id = response.json()["id"]
+        for balance_date in ("2024-01-01", "2024-01-03"):
+            await client.post(
+                f"/api/v1/accounts/{account_id}/balances",
+                json={"amount": 100.0, "date": balance_date},
+            )
+
+        history = (await client.get("/api/v1/dashboard/history")).json()["total_history"]
+        summary = (await client.get("/api/v1/dashboard")).json()
+
+        assert history == [
+            {"date": "2024-01-01", "total_balance_gbp": 50.0},
+            {"date": "2024-01-03", "total_balance_gbp": 25.0},
+        ]
+        # Current figures still use the latest rates
+        assert summary["total_balance_gbp"] == 20.0
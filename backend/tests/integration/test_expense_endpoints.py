@@ -0,0 +1,79 @@
+"""
+Integration tests for expense and income endpoints.
+"""
+import pytest
+
+
+async def create_expenses(client, count):
+    category = await client.post("/api/v1/budget-categories", json={"name": "Bills", "icon": "B"})
+    category_id = category.json()["id"]
+    for i in range(count):
+        response = await client.post(
+            "/api/v1/expenses",
+            json={"description": f"Bill {i}", "amount": 10.0 + i, "frequency": "MONTHLY", "category_id": category_id},
+        )
+        assert response.status_code == 201
+        assert response.json()["category"]["name"] == "Bills"
+    return category_id
+
+
+@pytest.mark.integration
+class TestExpenseListing:
+    """Test expense listing with the include_category toggle."""
+
+    async def test_list_includes_category_by_default(self, authenticated_test_client):
+        category_id = await create_expenses(authenticated_test_client, 3)
+
+        response = await authenticated_test_client.get("/api/v1/expenses")
+
+        assert response.status_code == 200
+        expenses = response.json()
+        assert len(expenses) == 3
+        assert all(expense["category"]["id"] == category_id and expense["category"]["icon"] == "B" for expense in expenses)
+        assert {expense["frequency"] for expense in expenses} == {"MONTHLY"}
+
+    async def test_list_without_category(self, authenticated_test_client):
+        category_id = await create_expenses(authenticated_test_client, 3)
+
+        response = await authenticated_test_client.get("/api/v1/expenses?include_category=false")
+
+        assert response.status_code == 200
+        expenses = response.json()
+        assert all(expense["category"] is None and expense["category_id"] == category_id for expense in expenses)
+
+    async def test_get_expense_include_toggle(self, authenticated_test_client):
+        await create_expenses(authenticated_test_client, 1)
+        expense_id = (await authenticated_test_client.get("/api/v1/expenses")).json()[0]["id"]
+
+        full = await authenticated_test_client.get(f"/api/v1/expenses/{expense_id}")
+        lean = await authenticated_test_client.get(f"/api/v1/expenses/{expense_id}?include_category=false")
+
+        assert full.json()["category"]["name"] == "Bills"
+        assert lean.json()["category"] is None
+
+    async def test_invalid_include_category_is_rejected(self, authenticated_test_client):
+        response = await authenticated_test_client.get("/api/v1/expenses?include_category=maybe")
+
+        assert response.status_code == 422
+
+
+@pytest.mark.integration
+class TestIncomeResponses:
+    """Test income responses built with model_validate."""
+
+    async def test_create_update_and_list(self, authenticated_test_client):
+        created = await authenticated_test_client.post(
+            "/api/v1/income", json={"description": "Salary", "amount": 3000.0, "frequency": "MONTHLY"}
+        )
+        assert created.status_code == 201
+        assert created.json()["frequency"] == "MONTHLY"
+
+        updated = await authenticated_test_client.put(
+            f"/api/v1/income/{created.json()['id']}",
+            json={"frequency": "ONE_TIME", "effective_month": 5, "effective_year": 2025},
+        )
+        assert updated.status_code == 200
+        assert (updated.json()["frequency"], updated.json()["effective_month"]) == ("ONE_TIME", 5)
+
+        listed = await authenticated_test_client.get("/api/v1/income")
+        assert [item["frequency"] for item in listed.json()] == ["ONE_TIME"]
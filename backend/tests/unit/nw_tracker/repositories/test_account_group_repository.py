@@ -3,7 +3,7 @@ Unit tests for account_group_repository.py
 Tests the AccountGroupRepository class.
 """
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 from nw_tracker.repositories.account_group_repository import AccountGroupRepository
@@ -88,6 +88,33 @@ class TestAccountGroupRepositoryGetAllForUser:
         assert result == []
 
 
+@pytest.mark.unit
+class TestAccountGroupRepositoryGetAllForUserWithAccountIds:
+    """Test get_all_for_user_with_account_ids method."""
+
+    @pytest.mark.asyncio
+    async def test_groups_rows_by_group(self, mock_async_session, mock_account_group):
+        """Test that joined (group, account_id) rows are folded per group."""
+        empty_group = AccountGroup(id=uuid4(), name="Empty", user_id=mock_account_group.user_id)
+        first_id, second_id = uuid4(), uuid4()
+        result = MagicMock()
+        result.all.return_value = [
+            (mock_account_group, first_id),
+            (mock_account_group, second_id),
+            (empty_group, None),
+        ]
+        mock_async_session.execute.return_value = result
+
+        repo = AccountGroupRepository(mock_async_session)
+        groups = await repo.get_all_for_user_with_account_ids(mock_account_group.user_id)
+
+        assert groups == [
+            (mock_account_group, [first_id, second_id]),
+            (empty_group, []),
+        ]
+        mock_async_session.execute.assert_awaited_once()
+
+
 @pytest.mark.unit
 class TestAccountGroupRepositoryGetByIdAndUser:
     """Test get_by_id_and_user method."""
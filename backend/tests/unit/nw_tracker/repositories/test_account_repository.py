@@ -3,7 +3,10 @@ Unit tests for account_repository.py
 Tests the AccountRepository class with account-specific queries.
 """
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
 
 from nw_tracker.repositories.account_repository import AccountRepository
 from nw_tracker.models.models import Account
@@ -162,3 +165,33 @@ class TestAccountRepositoryGetByIdWithRelations:
 
         # Verify
         assert result is None
+
+
+@pytest.mark.unit
+class TestAccountRepositoryRefreshCurrentBalances:
+    """Test refresh_current_balances method."""
+
+    @pytest.mark.asyncio
+    async def test_single_correlated_update(self, mock_async_session):
+        """Test that the denormalized columns are set from the latest balance in one UPDATE."""
+        mock_async_session.execute.return_value = MagicMock(rowcount=2)
+        repo = AccountRepository(mock_async_session)
+
+        updated = await repo.refresh_current_balances([uuid4(), uuid4()])
+
+        assert updated == 2
+        mock_async_session.execute.assert_called_once()
+        statement = mock_async_session.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE accounts SET")
+        for column in ("current_balance", "current_balance_date", "current_balance_id"):
+            assert f"{column}=(SELECT" in sql
+        assert "ORDER BY balances.date DESC, balances.created_at DESC" in sql
+        mock_async_session.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_account_list_skips_update(self, mock_async_session):
+        repo = AccountRepository(mock_async_session)
+
+        assert await repo.refresh_current_balances([]) == 0
+        mock_async_session.execute.assert_not_called()
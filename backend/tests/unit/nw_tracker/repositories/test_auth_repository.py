@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime, timedelta
 from uuid import uuid4
 
+from nw_tracker.config.security import hash_refresh_token
 from nw_tracker.repositories.auth_repository import RefreshTokenRepository
 from nw_tracker.models.auth_models import RefreshToken
 
@@ -38,8 +39,10 @@ class TestRefreshTokenRepositoryCreateToken:
         # Create token
         result = await repo.create_refresh_token(token_str, mock_user.id, expires_at)
 
-        # Verify
-        assert result.token == token_str
+        # Verify only the digest is stored
+        assert result.token_hash == hash_refresh_token(token_str)
+        assert len(result.token_hash) == 64
+        assert not hasattr(result, "token")
         assert result.user_id == mock_user.id
         assert result.expires_at == expires_at
         assert result.revoked is False
@@ -110,40 +113,17 @@ class TestRefreshTokenRepositoryGetValidToken:
         assert result == token_obj
 
     @pytest.mark.asyncio
-    async def test_get_valid_token_revoked(self, mock_async_session, mock_user, mock_db_result):
-        """Test getting valid token when it's revoked."""
-        # Create mock revoked token
-        token_obj = MagicMock(spec=RefreshToken)
-        token_obj.revoked = True
-        token_obj.expires_at = datetime.utcnow() + timedelta(days=1)
-
-        # Setup mock
-        mock_async_session.execute.return_value = mock_db_result([token_obj])
-
-        # Create repository and test
-        repo = RefreshTokenRepository(mock_async_session)
-        result = await repo.get_valid_token("revoked_token")
-
-        # Verify
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_get_valid_token_expired(self, mock_async_session, mock_user, mock_db_result):
-        """Test getting valid token when it's expired."""
-        # Create mock expired token
-        token_obj = MagicMock(spec=RefreshToken)
-        token_obj.revoked = False
-        token_obj.expires_at = datetime.utcnow() - timedelta(days=1)
-
-        # Setup mock
-        mock_async_session.execute.return_value = mock_db_result([token_obj])
+    async def test_get_valid_token_filters_in_query(self, mock_async_session, mock_db_result):
+        """Test that revocation and expiry are checked in the lookup query."""
+        mock_async_session.execute.return_value = mock_db_result([])
 
-        # Create repository and test
         repo = RefreshTokenRepository(mock_async_session)
-        result = await repo.get_valid_token("expired_token")
+        await repo.get_valid_token("some_token")
 
-        # Verify
-        assert result is None
+        sql = str(mock_async_session.execute.call_args.args[0])
+        assert "refresh_tokens.token_hash = " in sql
+        assert "refresh_tokens.revoked" in sql
+        assert "refresh_tokens.expires_at > " in sql
 
     @pytest.mark.asyncio
     async def test_get_valid_token_not_found(self, mock_async_session, mock_db_result):
@@ -164,35 +144,26 @@ class TestRefreshTokenRepositoryRevokeToken:
     """Test revoke_token method."""
 
     @pytest.mark.asyncio
-    async def test_revoke_token_success(self, mock_async_session, mock_db_result):
-        """Test revoking an existing token."""
-        # Create mock token
-        token_obj = MagicMock(spec=RefreshToken)
-        token_obj.revoked = False
-
-        # Setup mock
-        mock_async_session.execute.return_value = mock_db_result([token_obj])
+    async def test_revoke_token_success(self, mock_async_session):
+        """Test revoking an existing token with a single UPDATE."""
+        mock_async_session.execute.return_value = MagicMock(rowcount=1)
 
-        # Create repository and test
         repo = RefreshTokenRepository(mock_async_session)
         result = await repo.revoke_token("test_token")
 
-        # Verify
         assert result is True
-        assert token_obj.revoked is True
+        statement = mock_async_session.execute.call_args.args[0]
+        assert str(statement).startswith("UPDATE refresh_tokens")
         mock_async_session.commit.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_revoke_token_not_found(self, mock_async_session, mock_db_result):
+    async def test_revoke_token_not_found(self, mock_async_session):
         """Test revoking a token that doesn't exist."""
-        # Setup mock to return None
-        mock_async_session.execute.return_value = mock_db_result([])
+        mock_async_session.execute.return_value = MagicMock(rowcount=0)
 
-        # Create repository and test
         repo = RefreshTokenRepository(mock_async_session)
         result = await repo.revoke_token("nonexistent_token")
 
-        # Verify
         assert result is False
         mock_async_session.commit.assert_not_called()
 
@@ -203,26 +174,14 @@ class TestRefreshTokenRepositoryRevokeAllUserTokens:
 
     @pytest.mark.asyncio
     async def test_revoke_all_user_tokens(self, mock_async_session, mock_user):
-        """Test revoking all tokens for a user."""
-        # Create mock tokens
-        tokens = []
-        for i in range(3):
-            token = MagicMock(spec=RefreshToken)
-            token.revoked = False
-            tokens.append(token)
-
-        # Setup mock
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = tokens
-        mock_async_session.execute.return_value = mock_result
+        """Test revoking all tokens for a user in one statement."""
+        mock_async_session.execute.return_value = MagicMock(rowcount=3)
 
-        # Create repository and test
         repo = RefreshTokenRepository(mock_async_session)
-        await repo.revoke_all_user_tokens(mock_user.id)
+        result = await repo.revoke_all_user_tokens(mock_user.id)
 
-        # Verify all tokens were revoked
-        for token in tokens:
-            assert token.revoked is True
+        assert result == 3
+        mock_async_session.execute.assert_called_once()
         mock_async_session.commit.assert_called_once()
 
 
@@ -232,40 +191,26 @@ class TestRefreshTokenRepositoryDeleteExpiredTokens:
 
     @pytest.mark.asyncio
     async def test_delete_expired_tokens(self, mock_async_session):
-        """Test deleting expired tokens."""
-        # Create mock expired tokens
-        tokens = []
-        for i in range(3):
-            token = MagicMock(spec=RefreshToken)
-            tokens.append(token)
+        """Test deleting expired and revoked tokens with a single DELETE."""
+        mock_async_session.execute.return_value = MagicMock(rowcount=3)
 
-        # Setup mock
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = tokens
-        mock_async_session.execute.return_value = mock_result
-
-        # Create repository and test
         repo = RefreshTokenRepository(mock_async_session)
         result = await repo.delete_expired_tokens()
 
-        # Verify
         assert result == 3
-        # Verify all tokens were deleted
-        assert mock_async_session.delete.call_count == 3
+        sql = str(mock_async_session.execute.call_args.args[0])
+        assert sql.startswith("DELETE FROM refresh_tokens")
+        assert "refresh_tokens.revoked" in sql
+        mock_async_session.delete.assert_not_called()
         mock_async_session.commit.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_delete_expired_tokens_empty(self, mock_async_session):
-        """Test deleting expired tokens when none exist."""
-        # Setup mock to return empty list
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_async_session.execute.return_value = mock_result
+    async def test_delete_expired_tokens_only(self, mock_async_session):
+        """Test keeping revoked tokens when asked to."""
+        mock_async_session.execute.return_value = MagicMock(rowcount=0)
 
-        # Create repository and test
         repo = RefreshTokenRepository(mock_async_session)
-        result = await repo.delete_expired_tokens()
+        result = await repo.delete_expired_tokens(include_revoked=False)
 
-        # Verify
         assert result == 0
-        mock_async_session.delete.assert_not_called()
+        assert "refresh_tokens.revoked" not in str(mock_async_session.execute.call_args.args[0])
@@ -3,11 +3,16 @@ Unit tests for balance_repository.py
 Tests the BalanceRepository class.
 """
 import pytest
-from unittest.mock import AsyncMock
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
+from sqlalchemy.dialects import postgresql
+
 from nw_tracker.repositories.balance_repository import BalanceRepository
-from nw_tracker.models.models import Balance
+from nw_tracker.models.models import Balance, Currency
+from nw_tracker.utils.rate_table import RateHistory, RateTable
 
 
 @pytest.mark.unit
@@ -54,6 +59,30 @@ class TestBalanceRepositoryGetAllByAccountId:
         assert result == []
 
 
+    @pytest.mark.asyncio
+    async def test_keyset_page_query(self, mock_async_session, mock_db_result):
+        """Test that filters, the keyset predicate and the limit are pushed into SQL."""
+        mock_async_session.execute.return_value = mock_db_result([])
+        mock_async_session.bind = MagicMock()
+        mock_async_session.bind.dialect.name = "postgresql"
+
+        repo = BalanceRepository(mock_async_session)
+        await repo.get_all_balances_by_account_id(
+            uuid4(),
+            limit=51,
+            after=(date(2024, 1, 5), datetime(2024, 1, 5, 9, 30), uuid4()),
+            from_date=date(2024, 1, 1),
+            to_date=date(2024, 1, 31)
+        )
+
+        query = mock_async_session.execute.call_args.args[0]
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert "(balances.date, balances.created_at, balances.id) < (" in sql
+        assert "balances.date >= " in sql and "balances.date <= " in sql
+        assert "ORDER BY balances.date DESC, balances.created_at DESC, balances.id DESC" in sql
+        assert "LIMIT" in sql
+
+
 @pytest.mark.unit
 class TestBalanceRepositoryGetLatestBalance:
     """Test get_latest_balance_by_account_id method."""
@@ -83,3 +112,111 @@ class TestBalanceRepositoryGetLatestBalance:
 
         # Verify
         assert result is None
+
+
+@pytest.mark.unit
+class TestBalanceRepositoryReplaceBalancesOnDates:
+    """Test replace_balances_on_dates method."""
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_queries(self, mock_async_session):
+        repo = BalanceRepository(mock_async_session)
+
+        assert await repo.replace_balances_on_dates(uuid4(), {}) == 0
+        mock_async_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_deletes_dates_then_inserts_batch(self, mock_async_session):
+        """Test that one DELETE and one executemany INSERT are issued, without committing."""
+        account_id = uuid4()
+        repo = BalanceRepository(mock_async_session)
+
+        written = await repo.replace_balances_on_dates(account_id, {date(2024, 1, 1): 10.0, date(2024, 1, 2): 20.0})
+
+        assert written == 2
+        assert mock_async_session.execute.await_count == 2
+        delete_statement = mock_async_session.execute.await_args_list[0].args[0]
+        insert_statement, params = mock_async_session.execute.await_args_list[1].args
+        assert str(delete_statement).startswith("DELETE FROM balances")
+        assert str(insert_statement).startswith("INSERT INTO balances")
+        assert params == [
+            {"account_uuid": account_id, "date": date(2024, 1, 1), "amount": 10.0},
+            {"account_uuid": account_id, "date": date(2024, 1, 2), "amount": 20.0},
+        ]
+        mock_async_session.commit.assert_not_called()
+
+
+@pytest.mark.unit
+class TestBalanceRepositoryFillForwardHistory:
+    """Test get_fill_forward_history method."""
+
+    @pytest.mark.asyncio
+    async def test_no_accounts_skips_query(self, mock_async_session):
+        """Test that an empty account set returns without querying."""
+        repo = BalanceRepository(mock_async_session)
+
+        assert await repo.get_fill_forward_history({}) == []
+        mock_async_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_postgresql_accumulates_daily_deltas(self, mock_async_session):
+        """Test that PostgreSQL delta rows are accumulated and converted per point."""
+        mock_async_session.bind.dialect.name = "postgresql"
+        result = MagicMock()
+        result.all.return_value = [
+            (None, Currency.GBP, 100.0),
+            (date(2024, 1, 2), Currency.GBP, 50.0),
+            (date(2024, 1, 2), Currency.USD, 20.0),
+            (date(2024, 1, 3), Currency.USD, 20.0),
+        ]
+        mock_async_session.execute.return_value = result
+        rate_history = RateHistory({Currency.USD: 2.0}, {"USD": [(date(2024, 1, 3), 4.0)]})
+
+        repo = BalanceRepository(mock_async_session)
+        history = await repo.get_fill_forward_history(
+            {uuid4(): Currency.GBP, uuid4(): Currency.USD}, rate_history
+        )
+
+        assert history == [
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 155.0},
+            {'date': date(2024, 1, 3), 'total_balance_gbp': 160.0},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fallback_sweeps_loaded_columns(self, mock_async_session):
+        """Test that other dialects fill forward the loaded rows in Python."""
+        mock_async_session.bind.dialect.name = "sqlite"
+        gbp_account, usd_account = uuid4(), uuid4()
+        created = datetime(2024, 1, 1)
+        result = MagicMock()
+        result.all.return_value = [
+            SimpleNamespace(account_uuid=gbp_account, date=date(2024, 1, 1), created_at=created, amount=100.0),
+            SimpleNamespace(account_uuid=gbp_account, date=date(2024, 1, 3), created_at=created, amount=50.0),
+            SimpleNamespace(account_uuid=usd_account, date=date(2024, 1, 2), created_at=created, amount=20.0),
+        ]
+        mock_async_session.execute.return_value = result
+
+        repo = BalanceRepository(mock_async_session)
+        history = await repo.get_fill_forward_history(
+            {gbp_account: Currency.GBP, usd_account: Currency.USD},
+            RateTable({Currency.USD: 2.0}),
+            from_date=date(2024, 1, 2)
+        )
+
+        assert history == [
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 110.0},
+            {'date': date(2024, 1, 3), 'total_balance_gbp': 60.0},
+        ]
+
+    def test_postgresql_query_uses_window_functions(self):
+        """Test that the PostgreSQL query compiles to DISTINCT ON + LAG deltas per currency."""
+        query = BalanceRepository._daily_deltas_query(
+            [uuid4(), uuid4()], date(2024, 1, 1), date(2024, 12, 31)
+        )
+
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        assert "DISTINCT ON (balances.account_uuid, balances.date)" in sql
+        assert "lag(latest.amount) OVER (PARTITION BY latest.account_uuid" in sql
+        assert "GROUP BY CASE WHEN (deltas.date <" in sql
+        assert "ORDER BY date ASC NULLS FIRST" in sql
@@ -6,8 +6,10 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, call
 from uuid import uuid4
 
-from nw_tracker.repositories.base_repository import GenericRepository
-from nw_tracker.models.models import Account
+from sqlalchemy.dialects import postgresql
+
+from nw_tracker.repositories.base_repository import GenericRepository, unit_of_work
+from nw_tracker.models.models import Account, Balance, ExchangeRate
 
 
 @pytest.mark.unit
@@ -158,6 +160,19 @@ class TestGenericRepositoryDelete:
         mock_async_session.delete.assert_called_once()
         mock_async_session.commit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_delete_by_id_without_cascades_is_one_statement(self, mock_async_session):
+        """Test that models without ORM cascades are deleted without loading them first."""
+        mock_async_session.execute.return_value = MagicMock(rowcount=1)
+
+        repo = GenericRepository(mock_async_session, Balance)
+        result = await repo.delete_by_id(uuid4())
+
+        assert result is True
+        mock_async_session.execute.assert_called_once()
+        assert str(mock_async_session.execute.call_args.args[0]).startswith("DELETE FROM balances")
+        mock_async_session.delete.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_delete_by_id_not_found(self, mock_async_session, mock_db_result):
         """Test deleting entity by ID when it doesn't exist."""
@@ -203,3 +218,109 @@ class TestGenericRepositoryExists:
 
         # Verify
         assert result is False
+
+
+@pytest.mark.unit
+class TestGenericRepositoryBulk:
+    """Test bulk_create, bulk_upsert and bulk_delete_by_ids."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_single_commit(self, mock_async_session):
+        entities = [Balance(amount=1.0), Balance(amount=2.0)]
+        mock_async_session.add_all = MagicMock()
+
+        repo = GenericRepository(mock_async_session, Balance)
+        result = await repo.bulk_create(entities)
+
+        assert result == entities
+        mock_async_session.add_all.assert_called_once_with(entities)
+        mock_async_session.commit.assert_called_once()
+        mock_async_session.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_conflicts_on_primary_key(self, mock_async_session):
+        """Test that rows are written with one INSERT .. ON CONFLICT per chunk."""
+        mock_async_session.bind = MagicMock()
+        mock_async_session.bind.dialect.name = "postgresql"
+        rows = [{"base_currency": "GBP", "target_currency": "USD", "rate": 1.25}]
+
+        repo = GenericRepository(mock_async_session, ExchangeRate)
+        written = await repo.bulk_upsert(rows)
+
+        assert written == 1
+        statement = mock_async_session.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (id) DO UPDATE" in sql
+        assert "rate = excluded.rate" in sql
+        mock_async_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_chunks_large_batches(self, mock_async_session, monkeypatch):
+        from nw_tracker.repositories import base_repository
+        monkeypatch.setattr(base_repository, "BULK_CHUNK_SIZE", 2)
+        mock_async_session.bind = MagicMock()
+        mock_async_session.bind.dialect.name = "sqlite"
+        rows = [{"base_currency": "GBP", "target_currency": f"C{i}", "rate": 1.0} for i in range(5)]
+
+        repo = GenericRepository(mock_async_session, ExchangeRate)
+        await repo.bulk_upsert(rows, index_elements=["base_currency", "target_currency"])
+
+        assert mock_async_session.execute.call_count == 3
+        mock_async_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_by_ids(self, mock_async_session):
+        mock_async_session.execute.return_value = MagicMock(rowcount=2)
+
+        repo = GenericRepository(mock_async_session, Account)
+        deleted = await repo.bulk_delete_by_ids([uuid4(), uuid4()])
+
+        assert deleted == 2
+        mock_async_session.execute.assert_called_once()
+        mock_async_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_operations_skip_empty_input(self, mock_async_session):
+        repo = GenericRepository(mock_async_session, Account)
+
+        assert await repo.bulk_create([]) == []
+        assert await repo.bulk_upsert([]) == 0
+        assert await repo.bulk_delete_by_ids([]) == 0
+        assert await repo.get_by_ids([]) == []
+        mock_async_session.execute.assert_not_called()
+        mock_async_session.commit.assert_not_called()
+
+
+@pytest.mark.unit
+class TestUnitOfWork:
+    """Test deferred commits."""
+
+    @pytest.mark.asyncio
+    async def test_defers_commits_to_end_of_block(self, mock_async_session, mock_account):
+        repo = GenericRepository(mock_async_session, Account)
+
+        async with unit_of_work(mock_async_session):
+            await repo.create(mock_account)
+            await repo.update(mock_account)
+            async with unit_of_work(mock_async_session):
+                await repo.delete(mock_account)
+            mock_async_session.commit.assert_not_called()
+
+        assert mock_async_session.flush.call_count == 3
+        mock_async_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_rolls_back_on_error(self, mock_async_session, mock_account):
+        repo = GenericRepository(mock_async_session, Account)
+
+        with pytest.raises(RuntimeError):
+            async with unit_of_work(mock_async_session):
+                await repo.create(mock_account)
+                raise RuntimeError("boom")
+
+        mock_async_session.rollback.assert_called_once()
+        mock_async_session.commit.assert_not_called()
+
+        # Outside the block writes commit immediately again
+        await repo.create(mock_account)
+        mock_async_session.commit.assert_called_once()
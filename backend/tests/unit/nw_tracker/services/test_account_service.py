@@ -39,8 +39,10 @@ class TestAccountServiceCreateAccount:
         """Test successful account creation without balances or groups."""
         with patch.object(AccountService, "__init__", return_value=None):
             service = AccountService(mock_async_session)
+            service.session = mock_async_session
             service.repository = MagicMock()
             service.account_group_repository = MagicMock()
+            service.account_group_repository.get_by_ids = AsyncMock(return_value=[])
 
             # Setup request
             account_request = AccountCreateRequest(
@@ -78,8 +80,13 @@ class TestAccountServiceCreateAccount:
         """Test account creation with balances."""
         with patch.object(AccountService, "__init__", return_value=None):
             service = AccountService(mock_async_session)
+            service.session = mock_async_session
             service.repository = MagicMock()
             service.account_group_repository = MagicMock()
+            service.account_group_repository.get_by_ids = AsyncMock(return_value=[])
+            service.daily_balance_repository = MagicMock()
+            service.daily_balance_repository.rebuild = AsyncMock()
+            service.repository.refresh_current_balances = AsyncMock()
 
             # Setup request with balances - use date only, not datetime
             from datetime import date
@@ -118,8 +125,10 @@ class TestAccountServiceCreateAccount:
         """Test account creation with server error."""
         with patch.object(AccountService, "__init__", return_value=None):
             service = AccountService(mock_async_session)
+            service.session = mock_async_session
             service.repository = MagicMock()
             service.account_group_repository = MagicMock()
+            service.account_group_repository.get_by_ids = AsyncMock(return_value=[])
 
             # Setup request
             account_request = AccountCreateRequest(
@@ -162,6 +171,7 @@ class TestAccountServiceGetAll:
             mock_account.balances = []
             mock_account.groups = []
 
+            mock_account.current_balance = 250.0
             service.repository.get_all_for_user = AsyncMock(return_value=[mock_account])
 
             # Call get_all
@@ -171,7 +181,8 @@ class TestAccountServiceGetAll:
             assert isinstance(result, list)
             assert len(result) == 1
             assert isinstance(result[0], AccountResponse)
-            service.repository.get_all_for_user.assert_called_once_with(mock_user.id)
+            assert result[0].current_balance == 250.0
+            service.repository.get_all_for_user.assert_called_once_with(mock_user.id, with_balances=False)
 
     @pytest.mark.asyncio
     async def test_get_all_empty(self, mock_async_session, mock_user):
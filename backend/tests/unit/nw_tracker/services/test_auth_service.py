@@ -9,6 +9,7 @@ from uuid import uuid4
 from fastapi import HTTPException
 
 from nw_tracker.services.auth_service import AuthService
+from nw_tracker.utils.user_cache import get_user_cache
 from nw_tracker.models.models import User
 
 
@@ -202,6 +203,44 @@ class TestAuthServiceLogin:
 
                 assert exc_info.value.status_code == 401
 
+    @pytest.mark.asyncio
+    async def test_login_rehashes_old_cost_factor(self, mock_async_session, mock_user, monkeypatch):
+        """Test that a hash made with an outdated cost factor is replaced on login."""
+        from nw_tracker.config import security
+        monkeypatch.setattr(security.settings, "password_hash_rounds", 4)
+        mock_user.password_hash = security.get_password_hash("Password123!", rounds=5)
+        with patch.object(AuthService, "__init__", return_value=None):
+            service = AuthService(mock_async_session)
+            service.user_repository = MagicMock()
+            service.refresh_token_repository = MagicMock()
+            service.user_repository.get_by_email = AsyncMock(return_value=mock_user)
+            service.user_repository.update = AsyncMock(return_value=mock_user)
+            service.refresh_token_repository.create_refresh_token = AsyncMock()
+
+            await service.login("test@example.com", "Password123!")
+
+        assert mock_user.password_hash.startswith("$2b$04$")
+        assert security.verify_password("Password123!", mock_user.password_hash)
+        service.user_repository.update.assert_awaited_once_with(mock_user)
+
+    @pytest.mark.asyncio
+    async def test_login_hasher_saturated(self, mock_async_session, mock_user):
+        """Test that a saturated hashing pool answers 503."""
+        from nw_tracker.utils.password_hasher import PasswordHasherBusyError
+        with patch.object(AuthService, "__init__", return_value=None):
+            service = AuthService(mock_async_session)
+            service.user_repository = MagicMock()
+            service.user_repository.get_by_email = AsyncMock(return_value=mock_user)
+
+            hasher = MagicMock()
+            hasher.run = AsyncMock(side_effect=PasswordHasherBusyError("busy"))
+            with patch("nw_tracker.services.auth_service.get_password_hasher", return_value=hasher):
+                with pytest.raises(HTTPException) as exc_info:
+                    await service.login("test@example.com", "password")
+
+            assert exc_info.value.status_code == 503
+            assert exc_info.value.headers == {"Retry-After": "1"}
+
 
 @pytest.mark.unit
 class TestAuthServiceRefreshToken:
@@ -335,9 +374,28 @@ class TestAuthServiceGetCurrentUser:
                 result = await service.get_current_user_from_token("valid_token")
 
             # Verify
-            assert result == mock_user
+            assert (result.id, result.username, result.email) == (mock_user.id, mock_user.username, mock_user.email)
             service.user_repository.get_by_id.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_from_token_cached(self, mock_async_session, mock_user):
+        """Test that a second request with the same user does not query the database."""
+        with patch.object(AuthService, "__init__", return_value=None):
+            service = AuthService(mock_async_session)
+            service.user_repository = MagicMock()
+            service.user_repository.get_by_id = AsyncMock(return_value=mock_user)
+
+            with patch("nw_tracker.services.auth_service.decode_access_token") as mock_decode:
+                mock_decode.return_value = {"sub": str(mock_user.id)}
+                first = await service.get_current_user_from_token("valid_token")
+                second = await service.get_current_user_from_token("valid_token")
+
+                await get_user_cache().invalidate(mock_user.id)
+                await service.get_current_user_from_token("valid_token")
+
+            assert second is first
+            assert service.user_repository.get_by_id.await_count == 2
+
     @pytest.mark.asyncio
     async def test_get_current_user_from_token_invalid(self, mock_async_session):
         """Test getting user with invalid token."""
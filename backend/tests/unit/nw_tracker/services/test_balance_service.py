@@ -5,7 +5,7 @@ Tests the BalanceService class with mocked dependencies.
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
-from datetime import date
+from datetime import date, datetime
 from fastapi import HTTPException
 
 from nw_tracker.services.balance_service import BalanceService
@@ -40,6 +40,10 @@ class TestBalanceServiceCreateBalance:
             service = BalanceService(mock_async_session)
             service.repository = MagicMock()
             service.account_repository = MagicMock()
+            service.session = mock_async_session
+            service.daily_balance_repository = MagicMock()
+            service.daily_balance_repository.refresh_dates = AsyncMock()
+            service.account_repository.refresh_current_balances = AsyncMock()
 
             account_id = uuid4()
             balance_data = {
@@ -67,6 +71,7 @@ class TestBalanceServiceCreateBalance:
             assert result.amount == 1000.00
             service.account_repository.account_belongs_to_user.assert_called_once_with(account_id, mock_user.id)
             service.repository.create.assert_called_once()
+            service.daily_balance_repository.refresh_dates.assert_awaited_once_with(account_id, [mock_balance.date])
 
     @pytest.mark.asyncio
     async def test_create_balance_not_belongs_to_user(self, mock_async_session, mock_user):
@@ -111,82 +116,6 @@ class TestBalanceServiceCreateBalance:
             assert exc_info.value.status_code == 500
 
 
-@pytest.mark.unit
-class TestBalanceServiceGetAllBalancesForAccount:
-    """Test get_all_balances_for_account method."""
-
-    @pytest.mark.asyncio
-    async def test_get_all_balances_returns_list(self, mock_async_session, mock_user):
-        """Test getting all balances for account."""
-        with patch.object(BalanceService, "__init__", return_value=None):
-            service = BalanceService(mock_async_session)
-            service.repository = MagicMock()
-            service.account_repository = MagicMock()
-
-            account_id = uuid4()
-
-            # Setup mocks
-            mock_balance = MagicMock(spec=Balance)
-            mock_balance.id = uuid4()
-            mock_balance.amount = 1000.00
-            mock_balance.date = date.today()
-            mock_balance.account_uuid = account_id
-            mock_balance.created_at = "2024-01-01"
-            mock_balance.updated_at = "2024-01-01"
-
-            service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
-            service.repository.get_all_balances_by_account_id = AsyncMock(return_value=[mock_balance])
-
-            # Call get_all_balances_for_account
-            result = await service.get_all_balances_for_account(mock_user, account_id)
-
-            # Verify
-            assert isinstance(result, list)
-            assert len(result) == 1
-            assert isinstance(result[0], BalanceResponse)
-            service.account_repository.account_belongs_to_user.assert_called_once()
-            service.repository.get_all_balances_by_account_id.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_get_all_balances_not_belongs_to_user(self, mock_async_session, mock_user):
-        """Test getting balances for account that doesn't belong to user."""
-        with patch.object(BalanceService, "__init__", return_value=None):
-            service = BalanceService(mock_async_session)
-            service.repository = MagicMock()
-            service.account_repository = MagicMock()
-
-            account_id = uuid4()
-
-            # Setup mock - account doesn't belong to user
-            service.account_repository.account_belongs_to_user = AsyncMock(return_value=False)
-
-            # Call get_all_balances_for_account and expect 500 (service catches HTTPException)
-            with pytest.raises(HTTPException) as exc_info:
-                await service.get_all_balances_for_account(mock_user, account_id)
-
-            assert exc_info.value.status_code == 500
-
-    @pytest.mark.asyncio
-    async def test_get_all_balances_empty(self, mock_async_session, mock_user):
-        """Test getting all balances when account has none."""
-        with patch.object(BalanceService, "__init__", return_value=None):
-            service = BalanceService(mock_async_session)
-            service.repository = MagicMock()
-            service.account_repository = MagicMock()
-
-            account_id = uuid4()
-
-            # Setup mocks
-            service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
-            service.repository.get_all_balances_by_account_id = AsyncMock(return_value=[])
-
-            # Call get_all_balances_for_account
-            result = await service.get_all_balances_for_account(mock_user, account_id)
-
-            # Verify
-            assert result == []
-
-
 @pytest.mark.unit
 class TestBalanceServiceGetBalance:
     """Test get_balance method."""
@@ -236,11 +165,11 @@ class TestBalanceServiceGetBalance:
             # Setup mock - account doesn't belong to user
             service.account_repository.account_belongs_to_user = AsyncMock(return_value=False)
 
-            # Call get_balance and expect 500 (service catches HTTPException)
+            # Call get_balance and expect 403
             with pytest.raises(HTTPException) as exc_info:
                 await service.get_balance(mock_user, account_id, balance_id)
 
-            assert exc_info.value.status_code == 500
+            assert exc_info.value.status_code == 403
 
     @pytest.mark.asyncio
     async def test_get_balance_not_found(self, mock_async_session, mock_user):
@@ -257,11 +186,11 @@ class TestBalanceServiceGetBalance:
             service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
             service.repository.get_by_id = AsyncMock(return_value=None)
 
-            # Call get_balance and expect 500 (service catches HTTPException)
+            # Call get_balance and expect 404
             with pytest.raises(HTTPException) as exc_info:
                 await service.get_balance(mock_user, account_id, balance_id)
 
-            assert exc_info.value.status_code == 500
+            assert exc_info.value.status_code == 404
 
 
 @pytest.mark.unit
@@ -275,6 +204,10 @@ class TestBalanceServiceUpdateBalance:
             service = BalanceService(mock_async_session)
             service.repository = MagicMock()
             service.account_repository = MagicMock()
+            service.session = mock_async_session
+            service.daily_balance_repository = MagicMock()
+            service.daily_balance_repository.refresh_dates = AsyncMock()
+            service.account_repository.refresh_current_balances = AsyncMock()
 
             account_id = uuid4()
             balance_id = uuid4()
@@ -303,6 +236,7 @@ class TestBalanceServiceUpdateBalance:
             assert isinstance(result, BalanceResponse)
             service.account_repository.account_belongs_to_user.assert_called_once()
             service.repository.update.assert_called_once()
+            service.daily_balance_repository.refresh_dates.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_update_balance_not_belongs_to_user(self, mock_async_session, mock_user):
@@ -319,11 +253,11 @@ class TestBalanceServiceUpdateBalance:
             # Setup mock - account doesn't belong to user
             service.account_repository.account_belongs_to_user = AsyncMock(return_value=False)
 
-            # Call update_balance and expect 500 (service catches HTTPException)
+            # Call update_balance and expect 403
             with pytest.raises(HTTPException) as exc_info:
                 await service.update_balance(mock_user, account_id, balance_id, update_request)
 
-            assert exc_info.value.status_code == 500
+            assert exc_info.value.status_code == 403
 
     @pytest.mark.asyncio
     async def test_update_balance_not_found(self, mock_async_session, mock_user):
@@ -341,11 +275,11 @@ class TestBalanceServiceUpdateBalance:
             service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
             service.repository.get_by_id = AsyncMock(return_value=None)
 
-            # Call update_balance and expect 500 (service catches HTTPException)
+            # Call update_balance and expect 404
             with pytest.raises(HTTPException) as exc_info:
                 await service.update_balance(mock_user, account_id, balance_id, update_request)
 
-            assert exc_info.value.status_code == 500
+            assert exc_info.value.status_code == 404
 
 
 @pytest.mark.unit
@@ -359,14 +293,21 @@ class TestBalanceServiceDeleteBalance:
             service = BalanceService(mock_async_session)
             service.repository = MagicMock()
             service.account_repository = MagicMock()
+            service.session = mock_async_session
+            service.daily_balance_repository = MagicMock()
+            service.daily_balance_repository.refresh_dates = AsyncMock()
+            service.account_repository.refresh_current_balances = AsyncMock()
 
             account_id = uuid4()
             balance_id = uuid4()
 
             # Setup mocks
+            mock_balance = MagicMock(spec=Balance)
+            mock_balance.date = date.today()
+            mock_balance.account_uuid = account_id
             service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
-            service.repository.exists_by_id = AsyncMock(return_value=True)
-            service.repository.delete_by_id = AsyncMock(return_value=None)
+            service.repository.get_by_id = AsyncMock(return_value=mock_balance)
+            service.repository.delete = AsyncMock(return_value=None)
 
             # Call delete_balance
             result = await service.delete_balance(mock_user, account_id, balance_id)
@@ -374,8 +315,9 @@ class TestBalanceServiceDeleteBalance:
             # Verify
             assert result is True
             service.account_repository.account_belongs_to_user.assert_called_once()
-            service.repository.exists_by_id.assert_called_once()
-            service.repository.delete_by_id.assert_called_once()
+            service.repository.get_by_id.assert_called_once_with(balance_id)
+            service.repository.delete.assert_called_once_with(mock_balance)
+            service.daily_balance_repository.refresh_dates.assert_awaited_once_with(account_id, [mock_balance.date])
 
     @pytest.mark.asyncio
     async def test_delete_balance_not_belongs_to_user(self, mock_async_session, mock_user):
@@ -410,7 +352,7 @@ class TestBalanceServiceDeleteBalance:
 
             # Setup mocks
             service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
-            service.repository.exists_by_id = AsyncMock(return_value=False)
+            service.repository.get_by_id = AsyncMock(return_value=None)
 
             # Call delete_balance and expect 404
             with pytest.raises(HTTPException) as exc_info:
@@ -419,6 +361,30 @@ class TestBalanceServiceDeleteBalance:
             assert exc_info.value.status_code == 404
             assert "not found" in exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_delete_balance_of_another_account(self, mock_async_session, mock_user):
+        """Test that a balance of another account is not found and nothing is refreshed."""
+        with patch.object(BalanceService, "__init__", return_value=None):
+            service = BalanceService(mock_async_session)
+            service.repository = MagicMock()
+            service.account_repository = MagicMock()
+            service.daily_balance_repository = MagicMock()
+            service.daily_balance_repository.refresh_dates = AsyncMock()
+
+            account_id = uuid4()
+            balance_id = uuid4()
+
+            service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
+            service.repository.get_by_id = AsyncMock(return_value=MagicMock(spec=Balance, account_uuid=uuid4()))
+            service.repository.delete = AsyncMock()
+
+            with pytest.raises(HTTPException) as exc_info:
+                await service.delete_balance(mock_user, account_id, balance_id)
+
+            assert exc_info.value.status_code == 404
+            service.repository.delete.assert_not_awaited()
+            service.daily_balance_repository.refresh_dates.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_delete_balance_server_error(self, mock_async_session, mock_user):
         """Test balance deletion with server error."""
@@ -426,17 +392,153 @@ class TestBalanceServiceDeleteBalance:
             service = BalanceService(mock_async_session)
             service.repository = MagicMock()
             service.account_repository = MagicMock()
+            service.session = mock_async_session
+            service.daily_balance_repository = MagicMock()
+            service.daily_balance_repository.refresh_dates = AsyncMock()
+            service.account_repository.refresh_current_balances = AsyncMock()
 
             account_id = uuid4()
             balance_id = uuid4()
 
             # Setup mocks
             service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
-            service.repository.exists_by_id = AsyncMock(return_value=True)
-            service.repository.delete_by_id = AsyncMock(side_effect=Exception("Database error"))
+            service.repository.get_by_id = AsyncMock(return_value=MagicMock(spec=Balance, account_uuid=account_id))
+            service.repository.delete = AsyncMock(side_effect=Exception("Database error"))
 
             # Call delete_balance and expect 500
             with pytest.raises(HTTPException) as exc_info:
                 await service.delete_balance(mock_user, account_id, balance_id)
 
             assert exc_info.value.status_code == 500
+
+
+@pytest.mark.unit
+class TestBalanceServiceImportBalances:
+    """Test import_balances method."""
+
+    def _service(self, mock_async_session):
+        service = BalanceService(mock_async_session)
+        service.account_repository = MagicMock()
+        service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
+        service.account_repository.refresh_current_balances = AsyncMock()
+        service.repository = MagicMock()
+        service.repository.replace_balances_on_dates = AsyncMock(side_effect=lambda account_id, rows: len(rows))
+        service.daily_balance_repository = MagicMock()
+        service.daily_balance_repository.rebuild = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_writes_in_batches_and_rebuilds_once(self, mock_async_session, mock_user, monkeypatch):
+        """Test that rows are flushed per batch and snapshots rebuilt once at the end."""
+        from nw_tracker.services import balance_service
+        monkeypatch.setattr(balance_service.settings, "balance_import_batch_size", 2)
+        service = self._service(mock_async_session)
+        account_id = uuid4()
+
+        async def body():
+            yield b"date,amount\n2024-01-01,1\n2024-01-01,2\n2024-01-02,3\n"
+            yield b"2024-01-03,4\nbad,5\n"
+
+        result = await service.import_balances(mock_user, account_id, body(), "csv")
+
+        assert result.imported == 3
+        assert result.failed == 1
+        assert result.errors[0].line == 6
+        batches = [call.args[1] for call in service.repository.replace_balances_on_dates.await_args_list]
+        # Duplicate dates within a batch collapse to the last row
+        assert batches == [{date(2024, 1, 1): 2.0, date(2024, 1, 2): 3.0}, {date(2024, 1, 3): 4.0}]
+        service.daily_balance_repository.rebuild.assert_awaited_once_with([account_id])
+        service.account_repository.refresh_current_balances.assert_awaited_once_with([account_id])
+        mock_async_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_error_list_is_capped(self, mock_async_session, mock_user, monkeypatch):
+        """Test that failures past the cap are counted but not listed."""
+        from nw_tracker.services import balance_service
+        monkeypatch.setattr(balance_service.settings, "balance_import_max_errors", 2)
+        service = self._service(mock_async_session)
+
+        async def body():
+            yield b'{"date": "x"}\n' * 5
+
+        result = await service.import_balances(mock_user, uuid4(), body(), "ndjson")
+
+        assert result.imported == 0
+        assert result.failed == 5
+        assert len(result.errors) == 2
+        service.daily_balance_repository.rebuild.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_not_belongs_to_user(self, mock_async_session, mock_user):
+        service = self._service(mock_async_session)
+        service.account_repository.account_belongs_to_user = AsyncMock(return_value=False)
+
+        async def body():
+            yield b""
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.import_balances(mock_user, uuid4(), body(), "csv")
+
+        assert exc_info.value.status_code == 403
+
+
+@pytest.mark.unit
+class TestBalanceServiceGetBalancePage:
+    """Test get_balance_page method."""
+
+    def _balance(self, day: int):
+        balance = MagicMock(spec=Balance)
+        balance.id = uuid4()
+        balance.amount = float(day)
+        balance.date = date(2024, 1, day)
+        balance.account_uuid = uuid4()
+        balance.created_at = datetime(2024, 2, 1, 12, 0, 0)
+        balance.updated_at = datetime(2024, 2, 1, 12, 0, 0)
+        return balance
+
+    def _service(self, mock_async_session, balances):
+        with patch.object(BalanceService, "__init__", return_value=None):
+            service = BalanceService(mock_async_session)
+        service.account_repository = MagicMock()
+        service.account_repository.account_belongs_to_user = AsyncMock(return_value=True)
+        service.repository = MagicMock()
+        service.repository.get_all_balances_by_account_id = AsyncMock(return_value=balances)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_round_trips(self, mock_async_session, mock_user):
+        """Test that a full page returns a cursor that decodes to the last row's sort key."""
+        balances = [self._balance(day) for day in (5, 4, 3)]
+        service = self._service(mock_async_session, balances)
+        account_id = uuid4()
+
+        page = await service.get_balance_page(mock_user, account_id, limit=2)
+
+        assert [item.date for item in page.items] == [date(2024, 1, 5), date(2024, 1, 4)]
+        assert page.next_cursor is not None
+        service.repository.get_all_balances_by_account_id.assert_awaited_with(
+            account_id, limit=3, after=None, from_date=None, to_date=None
+        )
+
+        await service.get_balance_page(mock_user, account_id, limit=2, cursor=page.next_cursor)
+
+        after = service.repository.get_all_balances_by_account_id.await_args.kwargs["after"]
+        assert after == (balances[1].date, balances[1].created_at, balances[1].id)
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, mock_async_session, mock_user):
+        service = self._service(mock_async_session, [self._balance(1)])
+
+        page = await service.get_balance_page(mock_user, uuid4(), limit=2)
+
+        assert len(page.items) == 1
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, mock_async_session, mock_user):
+        service = self._service(mock_async_session, [])
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.get_balance_page(mock_user, uuid4(), limit=2, cursor="bm90LWpzb24")
+
+        assert exc_info.value.status_code == 400
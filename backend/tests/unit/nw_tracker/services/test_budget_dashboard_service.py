@@ -0,0 +1,149 @@
+"""
+Unit tests for budget_dashboard_service.py
+Tests the BudgetDashboardService summaries and trends with a mocked budget ledger.
+"""
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+from fastapi import HTTPException
+
+from nw_tracker.enums.budget_enums import BudgetKindEnum, FrequencyEnum
+from nw_tracker.services import budget_dashboard_service
+from nw_tracker.services.budget_dashboard_service import BudgetDashboardService, trailing_months
+
+
+@pytest.mark.unit
+class TestTrailingMonths:
+    """Test trailing_months helper."""
+
+    def test_wraps_across_years(self):
+        assert trailing_months(date(2025, 2, 15), 4) == [(2024, 11), (2024, 12), (2025, 1), (2025, 2)]
+
+    def test_full_range_crosses_two_year_boundaries(self):
+        periods = trailing_months(date(2025, 1, 31), 24)
+
+        assert periods[0] == (2023, 2)
+        assert periods[-1] == (2025, 1)
+        assert len(set(periods)) == 24
+
+
+def ledger_row(frequency, amount, category=None, year=0, month=0, kind=None):
+    """A budget ledger row as returned by BudgetMonthTotalRepository.get_totals."""
+    if kind is None:
+        kind = BudgetKindEnum.EXPENSE if category else BudgetKindEnum.INCOME
+    return SimpleNamespace(
+        kind=kind,
+        frequency=frequency,
+        year=year,
+        month=month,
+        category_id=uuid4() if category else None,
+        category_name=category,
+        amount=amount,
+    )
+
+
+def make_service(mock_async_session, rows):
+    with patch.object(BudgetDashboardService, "__init__", return_value=None):
+        service = BudgetDashboardService(mock_async_session)
+    service.ledger_repository = MagicMock()
+    service.ledger_repository.get_totals = AsyncMock(return_value=rows)
+    return service
+
+
+@pytest.mark.unit
+class TestBudgetDashboardServiceGetTrends:
+    """Test get_trends method."""
+
+    @pytest.mark.asyncio
+    async def test_get_trends_reads_ledger_once(self, mock_async_session, mock_user, monkeypatch):
+        """Test that every month is computed from a single ledger read."""
+        class FixedDate(date):
+            @classmethod
+            def today(cls):
+                return date(2025, 1, 10)
+
+        monkeypatch.setattr(budget_dashboard_service, "date", FixedDate)
+        service = make_service(mock_async_session, [
+            ledger_row(FrequencyEnum.MONTHLY, 3000.0),
+            ledger_row(FrequencyEnum.ONE_TIME, 500.0, year=2024, month=12),
+            ledger_row(FrequencyEnum.MONTHLY, 1000.0, category="Bills"),
+            ledger_row(FrequencyEnum.YEARLY, 600.0, category="Bills"),
+            ledger_row(FrequencyEnum.ONE_TIME, 250.0, category="Bills", year=2025, month=1),
+        ])
+
+        result = await service.get_trends(mock_user, months=24)
+
+        service.ledger_repository.get_totals.assert_awaited_once_with(mock_user.id, (2023, 2), (2025, 1))
+        assert len(result.months) == 24
+        assert (result.months[0].year, result.months[0].month) == (2023, 2)
+        december, january = result.months[-2], result.months[-1]
+        assert (december.income, december.expenses, december.surplus_deficit) == (3500.0, 1000.0, 2500.0)
+        assert (january.income, january.expenses, january.surplus_deficit) == (3000.0, 1250.0, 1750.0)
+        assert result.months[0].surplus_deficit == 2000.0
+
+    @pytest.mark.asyncio
+    async def test_get_trends_error(self, mock_async_session, mock_user):
+        """Test that repository failures surface as a 500."""
+        service = make_service(mock_async_session, [])
+        service.ledger_repository.get_totals = AsyncMock(side_effect=Exception("Database error"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.get_trends(mock_user)
+
+        assert exc_info.value.status_code == 500
+
+
+@pytest.mark.unit
+class TestBudgetDashboardServiceMonthlySummary:
+    """Test calculate_monthly_summary method."""
+
+    @pytest.mark.asyncio
+    async def test_summary_from_ledger(self, mock_async_session, mock_user):
+        """Test that the summary is built from ledger rows, ignoring yearly baselines."""
+        service = make_service(mock_async_session, [
+            ledger_row(FrequencyEnum.MONTHLY, 3500.0),
+            ledger_row(FrequencyEnum.ONE_TIME, 500.0, year=2025, month=3),
+            ledger_row(FrequencyEnum.YEARLY, 9000.0),
+            ledger_row(FrequencyEnum.MONTHLY, 1000.0, category="Bills"),
+            ledger_row(FrequencyEnum.ONE_TIME, 500.0, category="Bills", year=2025, month=3),
+            ledger_row(FrequencyEnum.MONTHLY, 300.0, category="Food"),
+            ledger_row(FrequencyEnum.MONTHLY, 200.0, kind=BudgetKindEnum.EXPENSE),
+        ])
+        # An expense row whose category is gone
+        service.ledger_repository.get_totals.return_value[-1].category_id = uuid4()
+
+        result = await service.calculate_monthly_summary(mock_user, 3, 2025)
+
+        service.ledger_repository.get_totals.assert_awaited_once_with(mock_user.id, (2025, 3), (2025, 3))
+        assert result.total_income == 4000.0
+        assert result.total_expenses == 2000.0
+        assert result.surplus_deficit == 2000.0
+        assert result.savings_rate == 50.0
+        assert [(item.category_name, item.percentage) for item in result.expense_breakdown] == [
+            ("Bills", 75.0), ("Food", 15.0), ("Uncategorized", 10.0)
+        ]
+
+
+@pytest.mark.unit
+class TestBudgetDashboardServiceYearlySummary:
+    """Test calculate_yearly_summary method."""
+
+    @pytest.mark.asyncio
+    async def test_yearly_summary_from_ledger(self, mock_async_session, mock_user):
+        """Test that monthly baselines count twelve times and yearly baselines once."""
+        service = make_service(mock_async_session, [
+            ledger_row(FrequencyEnum.MONTHLY, 3000.0),
+            ledger_row(FrequencyEnum.YEARLY, 2000.0),
+            ledger_row(FrequencyEnum.ONE_TIME, 500.0, year=2025, month=6),
+            ledger_row(FrequencyEnum.MONTHLY, 1000.0, category="Bills"),
+            ledger_row(FrequencyEnum.YEARLY, 600.0, category="Bills"),
+        ])
+
+        result = await service.calculate_yearly_summary(mock_user, 2025)
+
+        service.ledger_repository.get_totals.assert_awaited_once_with(mock_user.id, (2025, 0), (2025, 12))
+        assert result["total_income"] == 38500.0
+        assert result["total_expenses"] == 12600.0
+        assert result["surplus_deficit"] == 25900.0
@@ -0,0 +1,170 @@
+"""
+Unit tests for ExchangeRateService.
+"""
+import httpx
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from nw_tracker.models.models import Currency
+from nw_tracker.services import exchange_rate_service
+from nw_tracker.services.exchange_rate_service import ExchangeRateService, FALLBACK_RATES
+from nw_tracker.utils import exchange_rate_cache
+from nw_tracker.utils.exchange_rate_cache import get_exchange_rate_cache
+
+
+@pytest.mark.unit
+class TestExchangeRateServiceGetRateTable:
+    """Test building the rate snapshot."""
+
+    async def test_uses_cached_rates_and_fills_fallbacks(self):
+        """Test that missing currencies fall back and rates are not refetched."""
+        await get_exchange_rate_cache().set({"USD": 1.3})
+        with patch.object(ExchangeRateService, "get_rates", AsyncMock()) as get_rates:
+            table = await ExchangeRateService(None).get_rate_table()
+
+        get_rates.assert_not_awaited()
+        assert table.rate(Currency.USD) == 1.3
+        assert table.rate(Currency.EUR) == FALLBACK_RATES["EUR"]
+        assert table.rate(Currency.GBP) == 1.0
+
+    async def test_loads_rates_when_cold(self):
+        """Test that a cold cache loads the rates once."""
+        with patch.object(ExchangeRateService, "get_rates", AsyncMock(return_value={"USD": 1.2, "EUR": 1.1})) as get_rates:
+            service = ExchangeRateService(None)
+            table = await service.get_rate_table()
+            await service.get_rate_table()
+
+        get_rates.assert_awaited_once()
+        assert table.as_dict() == {"GBP": 1.0, "USD": 1.2, "EUR": 1.1}
+
+    async def test_unavailable_rates_are_retried_later(self):
+        """Test that fallback rates are cached briefly instead of reloading every call."""
+        with patch.object(ExchangeRateService, "get_rates", AsyncMock(return_value=FALLBACK_RATES)) as get_rates:
+            service = ExchangeRateService(None)
+            table = await service.get_rate_table()
+            await service.get_rate_table()
+
+        get_rates.assert_awaited_once()
+        assert table.rate(Currency.USD) == FALLBACK_RATES["USD"]
+
+    async def test_stale_refresh_uses_its_own_session(self, monkeypatch):
+        """Test that a background refresh never runs on the request's session."""
+        cache = get_exchange_rate_cache()
+        with patch.object(exchange_rate_cache.time, "monotonic", return_value=0.0):
+            await cache.set({"USD": 1.3})
+        loader_session = MagicMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=loader_session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        monkeypatch.setattr(exchange_rate_service, "AsyncSessionLocal", session_factory)
+        sessions = []
+
+        async def get_rates(service, *args, **kwargs):
+            sessions.append(service.session)
+            return {"USD": 1.4}
+
+        request_session = MagicMock()
+        with patch.object(ExchangeRateService, "get_rates", get_rates):
+            table = await ExchangeRateService(request_session).get_rate_table()
+            await cache._inflight
+
+        assert table.rate(Currency.USD) == 1.3
+        assert sessions == [loader_session]
+        assert cache.peek() == {"USD": 1.4}
+
+
+@pytest.mark.unit
+class TestExchangeRateServiceFetchAndStore:
+    """Test fetching rates from the API."""
+
+    def make_service(self, handler, read_only=False):
+        repository = MagicMock()
+        repository.delete_all_by_base = AsyncMock()
+        repository.create = AsyncMock()
+        history_repository = MagicMock()
+        history_repository.upsert_rates = AsyncMock()
+        with patch.object(ExchangeRateService, "__init__", return_value=None):
+            service = ExchangeRateService(None)
+        service.session = MagicMock(info={"read_only": True} if read_only else {})
+        service.repository = repository
+        service.history_repository = history_repository
+        service.transport = httpx.MockTransport(handler)
+        return service
+
+    async def test_fetch_updates_rate_cache(self):
+        """Test that fetched rates are stored and replace the cached rates."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"rates": {"GBP": 1.0, "USD": 1.4, "EUR": 1.2, "JPY": 190.0}})
+
+        service = self.make_service(handler)
+
+        rates = await service.fetch_and_store_rates("GBP")
+
+        assert len(requests) == 1
+        assert rates == {"USD": 1.4, "EUR": 1.2}
+        assert get_exchange_rate_cache().peek() == {"USD": 1.4, "EUR": 1.2}
+        service.history_repository.upsert_rates.assert_awaited_once()
+
+    async def test_fetch_invalidates_rate_history(self):
+        """Test that storing a new day's rates drops the cached history arrays."""
+        service = self.make_service(lambda request: httpx.Response(200, json={"rates": {"USD": 1.4}}))
+        cache = get_exchange_rate_cache()
+        await cache.get_history(AsyncMock(return_value={"USD": "old"}))
+
+        await service.fetch_and_store_rates("GBP")
+
+        assert cache._history is None
+
+    async def test_read_only_session_does_not_store(self):
+        """Test that rates fetched on a replica session are cached but not written."""
+        service = self.make_service(
+            lambda request: httpx.Response(200, json={"rates": {"USD": 1.4}}),
+            read_only=True
+        )
+
+        rates = await service.fetch_and_store_rates("GBP")
+
+        assert rates == {"USD": 1.4}
+        service.repository.delete_all_by_base.assert_not_awaited()
+        service.history_repository.upsert_rates.assert_not_awaited()
+        assert get_exchange_rate_cache().peek() == {"USD": 1.4}
+
+    async def test_api_error_uses_last_known_rates(self):
+        """Test that an API error falls back to stored rates without caching them as fresh."""
+        service = self.make_service(lambda request: httpx.Response(503))
+        service.repository.get_all_by_base = AsyncMock(
+            return_value=[MagicMock(target_currency="USD", rate=1.3)]
+        )
+
+        rates = await service.fetch_and_store_rates("GBP")
+
+        assert rates == {"USD": 1.3}
+        service.repository.delete_all_by_base.assert_not_awaited()
+        assert get_exchange_rate_cache().peek() is None
+
+
+@pytest.mark.unit
+class TestExchangeRateServiceGetRateHistory:
+    """Test the cached rate history."""
+
+    async def test_history_loaded_once_and_cut_per_request(self):
+        """Test that the history table is read once and each request sees rates up to its date."""
+        await get_exchange_rate_cache().set({"USD": 1.3})
+        with patch.object(ExchangeRateService, "__init__", return_value=None):
+            service = ExchangeRateService(None)
+        service.history_repository = MagicMock()
+        service.history_repository.get_history = AsyncMock(
+            return_value={"USD": [(date(2024, 1, 1), 1.2), (date(2024, 2, 1), 1.4)]}
+        )
+
+        full = await service.get_rate_history()
+        january = await service.get_rate_history(date(2024, 1, 31))
+
+        service.history_repository.get_history.assert_awaited_once_with("GBP")
+        assert full.rate_as_of(Currency.USD, date(2024, 3, 1)) == 1.4
+        assert january.rate_as_of(Currency.USD, date(2024, 3, 1)) == 1.2
+        assert january.rate(Currency.USD) == 1.3
@@ -0,0 +1,65 @@
+"""
+Unit tests for expense_service.py
+Tests the ExpenseResponseBuilder used by the expense endpoints.
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import PropertyMock, patch
+from uuid import uuid4
+
+from nw_tracker.enums.budget_enums import FrequencyEnum
+from nw_tracker.models.budget_models import BudgetCategoryModel, ExpenseModel
+from nw_tracker.services.expense_service import ExpenseResponseBuilder
+
+
+def make_category(user_id):
+    return BudgetCategoryModel(
+        id=uuid4(), user_id=user_id, name="Bills", is_essential=True,
+        created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+    )
+
+
+def make_expense(user_id, category):
+    return ExpenseModel(
+        id=uuid4(), user_id=user_id, description="Rent", amount=1000.0, frequency=FrequencyEnum.MONTHLY,
+        category_id=category.id, category=category,
+        created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+    )
+
+
+@pytest.mark.unit
+class TestExpenseResponseBuilder:
+    """Test ExpenseResponseBuilder."""
+
+    def test_builds_from_orm_row(self):
+        user_id = uuid4()
+        category = make_category(user_id)
+
+        response = ExpenseResponseBuilder().build(make_expense(user_id, category))
+
+        assert response.frequency == "MONTHLY"
+        assert response.amount == 1000.0
+        assert response.category.name == "Bills"
+        assert response.category_id == category.id
+
+    def test_categories_are_shared_across_expenses(self):
+        """Test that a category is validated once and reused for every expense in it."""
+        user_id = uuid4()
+        category = make_category(user_id)
+        builder = ExpenseResponseBuilder()
+
+        first, second = (builder.build(make_expense(user_id, category)) for _ in range(2))
+
+        assert first.category is second.category
+
+    def test_without_category_never_touches_relationship(self):
+        """Test that the lean path works on rows whose category was not loaded."""
+        user_id = uuid4()
+        expense = make_expense(user_id, make_category(user_id))
+
+        with patch.object(ExpenseModel, "category", new_callable=PropertyMock) as category:
+            response = ExpenseResponseBuilder(include_category=False).build(expense)
+
+        category.assert_not_called()
+        assert response.category is None
+        assert response.category_id == expense.category_id
@@ -0,0 +1,102 @@
+"""
+Unit tests for balance_import.py
+Tests streaming line splitting and CSV/NDJSON row parsing.
+"""
+import pytest
+from datetime import date
+
+from nw_tracker.utils.balance_import import CSV, NDJSON, detect_format, iter_balance_rows, iter_lines
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+@pytest.mark.unit
+class TestDetectFormat:
+    """Test Content-Type to format mapping."""
+
+    def test_known_types(self):
+        assert detect_format("text/csv; charset=utf-8") == CSV
+        assert detect_format("application/x-ndjson") == NDJSON
+
+    def test_unknown_or_missing(self):
+        assert detect_format("application/json") is None
+        assert detect_format(None) is None
+
+
+@pytest.mark.unit
+class TestIterLines:
+    """Test splitting byte chunks into lines."""
+
+    async def test_lines_split_across_chunks(self):
+        """Test lines and multi-byte characters that straddle chunk boundaries."""
+        euro = "€".encode()
+        lines = await collect(iter_lines(stream(b"a,b\r\nc", euro[:1], euro[1:] + b"\nlast")))
+
+        assert lines == ["a,b\r\n", "c€\n", "last"]
+
+    async def test_strips_byte_order_mark(self):
+        assert await collect(iter_lines(stream(b"\xef\xbb\xbfdate,amount\n"))) == ["date,amount\n"]
+
+    async def test_many_chunks_without_newline(self):
+        """Test that a line arriving in many small chunks is joined once."""
+        chunks = [b"x"] * 5000 + [b"\ny"]
+
+        assert await collect(iter_lines(stream(*chunks))) == ["x" * 5000 + "\n", "y"]
+
+
+@pytest.mark.unit
+class TestIterBalanceRows:
+    """Test row parsing and per-row errors."""
+
+    async def test_csv_rows(self):
+        body = b"Amount,Date\n100,2024-01-01\n\n\"1,250.50\",2024-01-02\nabc,2024-01-03\n5\n"
+
+        rows = await collect(iter_balance_rows(stream(body), CSV))
+
+        assert rows == [
+            (2, (date(2024, 1, 1), 100.0), None),
+            (4, (date(2024, 1, 2), 1250.5), None),
+            (5, None, "invalid amount 'abc'"),
+            (6, None, "missing date or amount"),
+        ]
+
+    async def test_csv_quoted_field_with_newline(self):
+        """Test that a quoted field spanning lines stays one record."""
+        body = b'date,amount,note\r\n2024-01-01,10,"first\r\nsecond"\r\n2024-01-02,"2""0",x\r\n2024-01-03,30,\n'
+
+        rows = await collect(iter_balance_rows(stream(body[:30], body[30:]), CSV))
+
+        assert rows == [
+            (2, (date(2024, 1, 1), 10.0), None),
+            (4, None, "invalid amount '2\"0'"),
+            (5, (date(2024, 1, 3), 30.0), None),
+        ]
+
+    async def test_csv_missing_column(self):
+        with pytest.raises(ValueError, match="amount"):
+            await collect(iter_balance_rows(stream(b"date,value\n2024-01-01,1\n"), CSV))
+
+    async def test_ndjson_rows(self):
+        body = (
+            b'{"date": "2024-01-01", "amount": 10.5}\n'
+            b'{"date": "01/02/2024", "amount": 1}\n'
+            b'{"date": "2024-01-03"}\n'
+            b'{"date": "2024-01-04", "amount": true}\n'
+            b'{"date": "2024-01-05", "amount": "NaN"}\n'
+            b'not json\n'
+        )
+
+        rows = await collect(iter_balance_rows(stream(body), NDJSON))
+
+        assert rows[0] == (1, (date(2024, 1, 1), 10.5), None)
+        assert [(line, error is not None) for line, _, error in rows[1:]] == [
+            (2, True), (3, True), (4, True), (5, True), (6, True)
+        ]
+        assert rows[5][2].startswith("invalid JSON")
@@ -0,0 +1,502 @@
+"""
+Unit tests for balance_utils.py
+Tests the fill-forward balance history engine against a reference implementation.
+"""
+import random
+import pytest
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from nw_tracker.models.models import Currency, HistoryResolution
+from nw_tracker.utils.rate_table import RateHistory, RateTable
+from nw_tracker.utils.balance_utils import (
+    compute_group_balance_history,
+    build_balance_matrix,
+    compute_multi_series_history,
+    compute_history_from_daily_deltas,
+    downsample_history
+)
+
+
+def make_balance(amount, balance_date, created_at=None):
+    return SimpleNamespace(
+        amount=amount,
+        date=balance_date,
+        created_at=created_at or datetime(2024, 1, 1),
+    )
+
+
+def make_account(balances, currency=Currency.GBP, excluded=False):
+    return SimpleNamespace(
+        id=uuid4(),
+        currency=currency,
+        balances=balances,
+        is_excluded_from_totals=excluded,
+    )
+
+
+def make_rate_table(rates):
+    return RateTable(rates)
+
+
+def reference_history(accounts, from_date=None, to_date=None, rates=None, rate_history=None):
+    """Per-date reverse scan, as the engine behaved before the sweep-line rewrite."""
+    account_balances = [
+        (acc.currency, sorted(acc.balances, key=lambda b: (b.date, b.created_at)))
+        for acc in accounts if acc.balances
+    ]
+    dates = sorted({b.date for _, balances in account_balances for b in balances})
+    if from_date:
+        dates = [d for d in dates if d >= from_date]
+    if to_date:
+        dates = [d for d in dates if d <= to_date]
+
+    history = []
+    for target_date in dates:
+        total = 0.0
+        for currency, balances in account_balances:
+            amount = next((b.amount for b in reversed(balances) if b.date <= target_date), None)
+            if amount is None:
+                continue
+            if currency == Currency.GBP:
+                total += amount
+            elif rate_history:
+                total += amount / rate_history.rate_as_of(currency, target_date)
+            elif rates:
+                total += amount / rates[currency]
+        history.append({'date': target_date, 'total_balance_gbp': total})
+    return history
+
+
+def assert_same_history(actual, expected):
+    assert [p['date'] for p in actual] == [p['date'] for p in expected]
+    for a, e in zip(actual, expected):
+        assert a['total_balance_gbp'] == pytest.approx(e['total_balance_gbp'], rel=1e-9, abs=1e-6)
+
+
+def make_random_accounts(seed, count=12):
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    accounts = []
+    for _ in range(count):
+        balances = [
+            make_balance(
+                round(rng.uniform(-5000, 50000), 2),
+                start + timedelta(days=rng.randint(0, 400)),
+                datetime(2024, 1, 1) + timedelta(seconds=rng.randint(0, 10_000)),
+            )
+            for _ in range(rng.randint(0, 60))
+        ]
+        accounts.append(make_account(balances, currency=rng.choice(list(RATES))))
+    return accounts
+
+
+RATES = {Currency.GBP: 1.0, Currency.USD: 1.27, Currency.EUR: 1.16}
+DATE_RANGES = [
+    (None, None),
+    (date(2020, 4, 10), None),
+    (None, date(2020, 10, 27)),
+    (date(2020, 2, 20), date(2020, 3, 1)),
+]
+
+
+@pytest.mark.unit
+class TestComputeGroupBalanceHistory:
+    """Test compute_group_balance_history."""
+
+    def test_empty_accounts(self):
+        """Test that no accounts produce no history."""
+        assert compute_group_balance_history([]) == []
+        assert compute_group_balance_history([make_account([])]) == []
+
+    def test_fill_forward(self):
+        """Test that accounts carry their last balance forward to later dates."""
+        accounts = [
+            make_account([make_balance(100.0, date(2024, 1, 1)), make_balance(150.0, date(2024, 1, 3))]),
+            make_account([make_balance(50.0, date(2024, 1, 2))]),
+        ]
+
+        history = compute_group_balance_history(accounts)
+
+        assert history == [
+            {'date': date(2024, 1, 1), 'total_balance_gbp': 100.0},
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 150.0},
+            {'date': date(2024, 1, 3), 'total_balance_gbp': 200.0},
+        ]
+
+    def test_same_date_uses_latest_created(self):
+        """Test that the most recently created balance wins on a shared date."""
+        accounts = [make_account([
+            make_balance(300.0, date(2024, 1, 1), datetime(2024, 1, 1, 12)),
+            make_balance(100.0, date(2024, 1, 1), datetime(2024, 1, 1, 9)),
+        ])]
+
+        history = compute_group_balance_history(accounts)
+
+        assert history == [{'date': date(2024, 1, 1), 'total_balance_gbp': 300.0}]
+
+    def test_date_filters_keep_prior_balances(self):
+        """Test that balances before from_date still seed the running total."""
+        accounts = [
+            make_account([make_balance(100.0, date(2024, 1, 1))]),
+            make_account([make_balance(10.0, date(2024, 1, 5)), make_balance(20.0, date(2024, 1, 9))]),
+        ]
+
+        history = compute_group_balance_history(
+            accounts, from_date=date(2024, 1, 2), to_date=date(2024, 1, 8)
+        )
+
+        assert history == [{'date': date(2024, 1, 5), 'total_balance_gbp': 110.0}]
+
+    def test_non_gbp_without_rate_table_is_skipped(self):
+        """Test that unconvertible accounts contribute dates but no amounts."""
+        accounts = [
+            make_account([make_balance(100.0, date(2024, 1, 1))]),
+            make_account([make_balance(999.0, date(2024, 1, 2))], currency=Currency.USD),
+        ]
+
+        history = compute_group_balance_history(accounts)
+
+        assert history == [
+            {'date': date(2024, 1, 1), 'total_balance_gbp': 100.0},
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 100.0},
+        ]
+
+    def test_converts_with_rate_table(self):
+        """Test that non-GBP accounts are converted with the rate snapshot."""
+        rate_table = make_rate_table({Currency.GBP: 1.0, Currency.USD: 1.25})
+        accounts = [make_account(
+            [make_balance(125.0 * i, date(2024, 1, i)) for i in range(1, 11)],
+            currency=Currency.USD,
+        )]
+
+        history = compute_group_balance_history(accounts, rate_table=rate_table)
+
+        assert history[-1]['total_balance_gbp'] == pytest.approx(1000.0)
+
+    def test_matches_reference_on_random_data(self):
+        """Test the sweep-line engine against the per-date reverse scan."""
+        accounts = make_random_accounts(42)
+
+        for from_date, to_date in DATE_RANGES:
+            actual = compute_group_balance_history(
+                accounts, from_date, to_date, rate_table=make_rate_table(RATES)
+            )
+            assert_same_history(actual, reference_history(accounts, from_date, to_date, RATES))
+
+    def test_long_series_does_not_accumulate_rounding(self):
+        """Test that many rewrites, some of huge values, leave no rounding error behind."""
+        rng = random.Random(7)
+        start = date(2015, 1, 1)
+        accounts = []
+        for _ in range(15):
+            balances = []
+            for day in sorted(rng.sample(range(3000), 1500)):
+                amount = round(rng.uniform(-5000, 50000), 2)
+                if rng.random() < 0.05:
+                    # A short-lived huge balance that a running total cannot shed exactly
+                    amount = rng.choice([1e15, -3e14, 7.5e13])
+                balances.append(make_balance(amount, start + timedelta(days=day)))
+            accounts.append(make_account(balances))
+
+        actual = compute_group_balance_history(accounts)
+
+        assert_same_history(actual, reference_history(accounts))
+
+
+@pytest.mark.unit
+class TestBalanceMatrix:
+    """Test the columnar BalanceMatrix path."""
+
+    def test_empty_matrix(self):
+        """Test that a matrix without balances yields no history."""
+        matrix = build_balance_matrix([make_account([])])
+
+        assert matrix.history() == []
+
+    def test_unknown_accounts_yield_no_history(self):
+        """Test that account IDs outside the matrix are ignored."""
+        matrix = build_balance_matrix([make_account([make_balance(10.0, date(2024, 1, 1))])])
+
+        assert matrix.history([uuid4()]) == []
+
+    def test_duplicate_accounts_counted_once(self):
+        """Test that an account shared by several groups is only one matrix row."""
+        account = make_account([make_balance(10.0, date(2024, 1, 1))])
+
+        matrix = build_balance_matrix([account, account])
+
+        assert matrix.values.shape == (1, 1)
+        assert matrix.history([account.id, account.id]) == [
+            {'date': date(2024, 1, 1), 'total_balance_gbp': 10.0}
+        ]
+
+    def test_subsets_match_sweep_engine(self):
+        """Test that any account subset matches compute_group_balance_history."""
+        accounts = make_random_accounts(7, count=15)
+        matrix = build_balance_matrix(accounts, rate_table=make_rate_table(RATES))
+
+        subsets = [accounts, accounts[:5], accounts[5:6], accounts[3:15:2]]
+        for subset in subsets:
+            for from_date, to_date in DATE_RANGES:
+                expected = compute_group_balance_history(
+                    subset, from_date, to_date, rate_table=make_rate_table(RATES)
+                )
+                actual = matrix.history([a.id for a in subset], from_date, to_date)
+                assert_same_history(actual, expected)
+
+
+@pytest.mark.unit
+class TestComputeMultiSeriesHistory:
+    """Test total and group histories computed from one account fetch."""
+
+    def test_total_skips_excluded_accounts(self):
+        """Test that excluded accounts are left out of the total but not groups."""
+        included = make_account([make_balance(100.0, date(2024, 1, 1))])
+        excluded = make_account([make_balance(50.0, date(2024, 1, 2))], excluded=True)
+        group_id = uuid4()
+
+        total, groups = compute_multi_series_history(
+            [included, excluded], {group_id: [included.id, excluded.id]}
+        )
+
+        assert total == [{'date': date(2024, 1, 1), 'total_balance_gbp': 100.0}]
+        assert groups[group_id] == [
+            {'date': date(2024, 1, 1), 'total_balance_gbp': 100.0},
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 150.0},
+        ]
+
+    def test_empty_and_unknown_memberships(self):
+        """Test that groups without known accounts get an empty history."""
+        account = make_account([make_balance(10.0, date(2024, 1, 1))])
+        empty_group, foreign_group = uuid4(), uuid4()
+
+        _, groups = compute_multi_series_history(
+            [account], {empty_group: [], foreign_group: [uuid4()]}
+        )
+
+        assert groups == {empty_group: [], foreign_group: []}
+
+    def test_matches_per_group_engine(self):
+        """Test that every series matches computing it on its own."""
+        accounts = make_random_accounts(11, count=10)
+        for account in accounts[::3]:
+            account.is_excluded_from_totals = True
+        memberships = {uuid4(): [a.id for a in accounts[i:i + 4]] for i in range(0, 10, 3)}
+        rate_table = make_rate_table(RATES)
+
+        for from_date, to_date in DATE_RANGES:
+            total, groups = compute_multi_series_history(
+                accounts, memberships, from_date, to_date, rate_table=rate_table
+            )
+
+            expected_total = compute_group_balance_history(
+                [a for a in accounts if not a.is_excluded_from_totals], from_date, to_date, rate_table
+            )
+            assert_same_history(total, expected_total)
+            for group_id, account_ids in memberships.items():
+                members = [a for a in accounts if a.id in account_ids]
+                expected = compute_group_balance_history(members, from_date, to_date, rate_table)
+                assert_same_history(groups[group_id], expected)
+
+
+def daily_history(start, days):
+    return [
+        {'date': start + timedelta(days=i), 'total_balance_gbp': float(i)}
+        for i in range(days)
+    ]
+
+
+@pytest.mark.unit
+class TestDownsampleHistory:
+    """Test resolution bucketing of history points."""
+
+    def test_daily_returns_history_unchanged(self):
+        """Test that daily resolution keeps every point."""
+        history = daily_history(date(2024, 1, 1), 10)
+
+        assert downsample_history(history, HistoryResolution.DAILY) is history
+
+    def test_weekly_keeps_last_point_per_week(self):
+        """Test that weeks run Monday to Sunday and keep their last point."""
+        # 2024-01-01 is a Monday
+        history = daily_history(date(2024, 1, 3), 14)
+
+        result = downsample_history(history, HistoryResolution.WEEKLY)
+
+        assert [p['date'] for p in result] == [date(2024, 1, 7), date(2024, 1, 14), date(2024, 1, 16)]
+        assert result[0]['total_balance_gbp'] == 4.0
+
+    def test_monthly_keeps_last_point_per_month(self):
+        """Test that months keep their last available point, even mid-month."""
+        history = [
+            {'date': date(2024, 1, 5), 'total_balance_gbp': 1.0},
+            {'date': date(2024, 1, 20), 'total_balance_gbp': 2.0},
+            {'date': date(2024, 3, 2), 'total_balance_gbp': 3.0},
+        ]
+
+        result = downsample_history(history, HistoryResolution.MONTHLY)
+
+        assert result == [history[1], history[2]]
+
+    @pytest.mark.parametrize("days, max_points, expected_step", [
+        (50, 100, 1),
+        (400, 100, 7),
+        (2000, 100, 30),
+    ])
+    def test_auto_picks_finest_fitting_resolution(self, days, max_points, expected_step):
+        """Test that auto uses daily, weekly or monthly buckets depending on the budget."""
+        history = daily_history(date(2020, 1, 1), days)
+
+        result = downsample_history(history, HistoryResolution.AUTO, max_points)
+
+        assert len(result) <= max_points
+        # The final bucket may be partial, so ignore the last gap
+        gaps = {(b['date'] - a['date']).days for a, b in zip(result[:-2], result[1:-1])}
+        assert min(gaps) >= expected_step - 3 and max(gaps) <= expected_step + 3
+        assert result[-1] == history[-1]
+
+    def test_auto_merges_months_for_long_ranges(self):
+        """Test that auto stays within the budget when even months are too many."""
+        history = daily_history(date(1990, 1, 1), 365 * 30)
+
+        result = downsample_history(history, HistoryResolution.AUTO, 24)
+
+        assert len(result) <= 24
+        assert result[-1] == history[-1]
+
+    def test_matrix_matches_downsampled_sweep(self):
+        """Test that the matrix buckets columns exactly like the sweep engine."""
+        accounts = make_random_accounts(3, count=8)
+        matrix = build_balance_matrix(accounts, rate_table=make_rate_table(RATES))
+
+        for resolution in HistoryResolution:
+            expected = compute_group_balance_history(
+                accounts, rate_table=make_rate_table(RATES), resolution=resolution, max_points=20
+            )
+            actual = matrix.history(resolution=resolution, max_points=20)
+            assert_same_history(actual, expected)
+
+
+@pytest.mark.unit
+class TestComputeHistoryFromDailyDeltas:
+    """Test history reads from summed account_daily_balances deltas."""
+
+    def test_seed_row_and_currencies(self):
+        """Test that the seed row is carried but not emitted and currencies convert."""
+        rows = [
+            (None, Currency.GBP, 100.0),
+            (date(2024, 1, 2), Currency.GBP, 10.0),
+            (date(2024, 1, 2), Currency.USD, 127.0),
+            (date(2024, 1, 3), Currency.USD, -127.0),
+        ]
+
+        history = compute_history_from_daily_deltas(rows, make_rate_table(RATES))
+
+        assert_same_history(history, [
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 210.0},
+            {'date': date(2024, 1, 3), 'total_balance_gbp': 110.0},
+        ])
+
+    def test_unconvertible_currency_keeps_dates(self):
+        """Test that non-GBP deltas without a rate table keep their dates with no amount."""
+        rows = [
+            (date(2024, 1, 1), Currency.GBP, 5.0),
+            (date(2024, 1, 2), Currency.EUR, 50.0),
+        ]
+
+        history = compute_history_from_daily_deltas(rows)
+
+        assert history == [
+            {'date': date(2024, 1, 1), 'total_balance_gbp': 5.0},
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 5.0},
+        ]
+
+
+def make_rate_history(seed):
+    """Weekly random-walk USD/EUR rates starting after the first balances."""
+    rng = random.Random(seed)
+    history = {}
+    for currency, rate in ((Currency.USD, 1.27), (Currency.EUR, 1.16)):
+        points = []
+        for week in range(60):
+            rate *= rng.uniform(0.97, 1.03)
+            points.append((date(2020, 1, 20) + timedelta(weeks=week), rate))
+        history[currency] = points
+    return RateHistory(RATES, history)
+
+
+def daily_delta_rows(accounts, from_date=None, to_date=None):
+    """Build (date, currency, delta) rows as the account_daily_balances query returns them."""
+    sums = {}
+    for account in accounts:
+        latest = {}
+        for balance in sorted(account.balances, key=lambda b: (b.date, b.created_at)):
+            latest[balance.date] = balance.amount
+        previous = 0.0
+        for balance_date in sorted(latest):
+            if to_date and balance_date > to_date:
+                break
+            key_date = None if from_date and balance_date < from_date else balance_date
+            key = (key_date, account.currency)
+            sums[key] = sums.get(key, 0.0) + latest[balance_date] - previous
+            previous = latest[balance_date]
+    return sorted(
+        ((d, c, delta) for (d, c), delta in sums.items()),
+        key=lambda row: (row[0] is not None, row[0] or date.min)
+    )
+
+
+@pytest.mark.unit
+class TestHistoricalRates:
+    """Test that every engine converts each point at its own date's rate."""
+
+    def test_sweep_matches_reference(self):
+        """Test the sweep-line engine against a per-date scan at dated rates."""
+        accounts = make_random_accounts(5)
+        rate_history = make_rate_history(5)
+
+        for from_date, to_date in DATE_RANGES:
+            actual = compute_group_balance_history(accounts, from_date, to_date, rate_table=rate_history)
+            assert_same_history(
+                actual, reference_history(accounts, from_date, to_date, rate_history=rate_history)
+            )
+
+    def test_matrix_matches_reference(self):
+        """Test BalanceMatrix against a per-date scan at dated rates."""
+        accounts = make_random_accounts(6)
+        rate_history = make_rate_history(6)
+        matrix = build_balance_matrix(accounts, rate_table=rate_history)
+
+        for from_date, to_date in DATE_RANGES:
+            assert_same_history(
+                matrix.history(from_date=from_date, to_date=to_date),
+                reference_history(accounts, from_date, to_date, rate_history=rate_history)
+            )
+
+    def test_daily_deltas_match_reference(self):
+        """Test the daily deltas path against a per-date scan at dated rates."""
+        accounts = make_random_accounts(7)
+        rate_history = make_rate_history(7)
+
+        for from_date, to_date in DATE_RANGES:
+            actual = compute_history_from_daily_deltas(
+                daily_delta_rows(accounts, from_date, to_date), rate_history
+            )
+            assert_same_history(
+                actual, reference_history(accounts, from_date, to_date, rate_history=rate_history)
+            )
+
+    def test_unchanged_balance_moves_with_rate(self):
+        """Test that a single USD balance is revalued on later dates."""
+        usd = make_account([make_balance(100.0, date(2024, 1, 1))], currency=Currency.USD)
+        gbp = make_account([make_balance(0.0, date(2024, 1, 2))])
+        rate_history = RateHistory(RATES, {Currency.USD: [(date(2024, 1, 1), 2.0), (date(2024, 1, 2), 4.0)]})
+
+        history = compute_group_balance_history([usd, gbp], rate_table=rate_history)
+
+        assert history == [
+            {'date': date(2024, 1, 1), 'total_balance_gbp': 50.0},
+            {'date': date(2024, 1, 2), 'total_balance_gbp': 25.0},
+        ]
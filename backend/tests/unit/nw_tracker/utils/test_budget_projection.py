@@ -0,0 +1,90 @@
+"""
+Unit tests for budget_projection.py
+Tests the vectorized budget schedule and net worth compounding.
+"""
+import time
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from uuid import uuid4
+
+from nw_tracker.enums.budget_enums import BudgetKindEnum, FrequencyEnum
+from nw_tracker.utils.budget_projection import compound_net_worth, months_after, project_budget
+
+
+def ledger_row(frequency, amount, expense=False, year=0, month=0):
+    return SimpleNamespace(
+        kind=BudgetKindEnum.EXPENSE if expense else BudgetKindEnum.INCOME,
+        frequency=frequency,
+        year=year,
+        month=month,
+        category_id=uuid4() if expense else None,
+        amount=amount,
+    )
+
+
+@pytest.mark.unit
+class TestProjectBudget:
+    """Test project_budget."""
+
+    def test_expands_each_frequency(self):
+        rows = [
+            ledger_row(FrequencyEnum.MONTHLY, 3000.0),
+            ledger_row(FrequencyEnum.YEARLY, 1200.0),
+            ledger_row(FrequencyEnum.ONE_TIME, 500.0, year=2025, month=2),
+            ledger_row(FrequencyEnum.ONE_TIME, 999.0, year=2024, month=12),
+            ledger_row(FrequencyEnum.MONTHLY, 1000.0, expense=True),
+            ledger_row(FrequencyEnum.ONE_TIME, 250.0, expense=True, year=2025, month=3),
+        ]
+
+        income, expenses = project_budget(rows, (2025, 1), 3)
+
+        assert income.tolist() == [3100.0, 3600.0, 3100.0]
+        assert expenses.tolist() == [1000.0, 1000.0, 1250.0]
+
+    def test_no_rows(self):
+        income, expenses = project_budget([], (2025, 1), 4)
+
+        assert income.tolist() == expenses.tolist() == [0.0] * 4
+
+    def test_fifty_years_of_hundreds_of_items_is_fast(self):
+        """Test that a 600-month projection of 500 items stays in milliseconds."""
+        rows = [ledger_row(FrequencyEnum.MONTHLY, 10.0, expense=i % 2 == 0) for i in range(250)]
+        rows += [
+            ledger_row(FrequencyEnum.ONE_TIME, 5.0, expense=i % 2 == 0, year=2025 + i // 12, month=i % 12 + 1)
+            for i in range(250)
+        ]
+
+        started = time.perf_counter()
+        income, expenses = project_budget(rows, (2025, 1), 600)
+        elapsed = time.perf_counter() - started
+
+        assert income.shape == expenses.shape == (600,)
+        assert (expenses[0], income[1]) == (1255.0, 1255.0)
+        assert elapsed < 0.1
+
+
+@pytest.mark.unit
+class TestCompoundNetWorth:
+    """Test compound_net_worth."""
+
+    def test_matches_month_by_month_loop(self):
+        surplus = np.array([100.0, -50.0, 200.0, 0.0, 75.0])
+        expected = []
+        worth = 10000.0
+        monthly_growth = 1.06 ** (1 / 12)
+        for month_surplus in surplus:
+            worth = worth * monthly_growth + month_surplus
+            expected.append(worth)
+
+        assert compound_net_worth(surplus, 10000.0, 0.06) == pytest.approx(expected)
+
+    def test_zero_return_is_cumulative_surplus(self):
+        surplus = np.array([100.0, 200.0, -50.0])
+
+        assert compound_net_worth(surplus, 1000.0, 0.0).tolist() == [1100.0, 1300.0, 1250.0]
+
+
+@pytest.mark.unit
+def test_months_after_wraps_year():
+    assert months_after(2024, 11, 3) == [(2024, 12), (2025, 1), (2025, 2)]
@@ -0,0 +1,130 @@
+"""
+Unit tests for exchange_rate_cache.py
+Tests TTL expiry, single-flight loading and stale-while-revalidate.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from nw_tracker.utils import exchange_rate_cache
+from nw_tracker.utils.exchange_rate_cache import ExchangeRateCache
+from nw_tracker.utils.result_cache import get_result_cache
+
+
+def make_cache(ttl_seconds=60, retry_seconds=5):
+    return ExchangeRateCache(ttl_seconds=ttl_seconds, retry_seconds=retry_seconds)
+
+
+@pytest.mark.unit
+class TestExchangeRateCache:
+    """Test the process-wide rate cache."""
+
+    async def test_concurrent_cold_gets_share_one_load(self):
+        """Test that a burst of cold callers triggers a single load."""
+        cache = make_cache()
+        release = asyncio.Event()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"USD": 1.25}
+
+        waiters = [asyncio.create_task(cache.get(loader)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert all(result == {"USD": 1.25} for result in results)
+
+    async def test_fresh_rates_are_not_reloaded(self):
+        """Test that rates within the TTL are served without loading."""
+        cache = make_cache()
+        loader = AsyncMock(return_value={"USD": 1.25})
+
+        await cache.get(loader)
+        await cache.get(loader)
+
+        loader.assert_awaited_once()
+
+    async def test_expired_rates_are_served_while_refreshing(self):
+        """Test that expired rates are returned immediately and refreshed in the background."""
+        cache = make_cache(ttl_seconds=10)
+        with patch.object(exchange_rate_cache.time, "monotonic", return_value=100.0):
+            await cache.set({"USD": 1.25})
+        loader = AsyncMock(return_value={"USD": 1.30})
+
+        with patch.object(exchange_rate_cache.time, "monotonic", return_value=111.0):
+            assert await cache.get(loader) == {"USD": 1.25}
+            await cache._inflight
+
+        loader.assert_awaited_once()
+        assert cache.peek() == {"USD": 1.30}
+
+    async def test_failed_refresh_keeps_stale_rates(self):
+        """Test that a failed refresh keeps serving the old rates and backs off."""
+        cache = make_cache(ttl_seconds=10, retry_seconds=5)
+        with patch.object(exchange_rate_cache.time, "monotonic", return_value=100.0):
+            await cache.set({"USD": 1.25})
+        loader = AsyncMock(side_effect=RuntimeError("API down"))
+
+        with patch.object(exchange_rate_cache.time, "monotonic", return_value=111.0):
+            assert await cache.refresh(loader) == {"USD": 1.25}
+        with patch.object(exchange_rate_cache.time, "monotonic", return_value=115.0):
+            assert cache.is_fresh()
+            assert await cache.get(loader) == {"USD": 1.25}
+
+        loader.assert_awaited_once()
+
+    async def test_failed_cold_load_raises(self):
+        """Test that a cold cache surfaces the loader error."""
+        cache = make_cache()
+
+        with pytest.raises(RuntimeError):
+            await cache.get(AsyncMock(side_effect=RuntimeError("API down")))
+
+        assert cache.peek() is None
+
+    async def test_changed_rates_invalidate_result_cache(self):
+        """Test that new rates drop results converted with the old ones."""
+        cache = make_cache()
+        user_id = uuid4()
+        results = get_result_cache()
+        await cache.set({"USD": 1.25})
+        await results.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="old"))
+
+        await cache.set({"USD": 1.25})
+        assert await results.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="new")) == "old"
+
+        await cache.set({"USD": 1.30})
+        assert await results.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="new")) == "new"
+
+    async def test_history_is_loaded_once(self):
+        """Test that the history arrays survive refreshes with the same rates and reload when they change."""
+        cache = make_cache()
+        await cache.set({"USD": 1.25})
+        loader = AsyncMock(return_value={"USD": "arrays"})
+
+        assert await cache.get_history(loader) == {"USD": "arrays"}
+        await cache.get_history(loader)
+        await cache.set({"USD": 1.25})
+        await cache.get_history(loader)
+        loader.assert_awaited_once()
+
+        await cache.set({"USD": 1.30})
+        await cache.get_history(loader)
+        assert loader.await_count == 2
+
+    async def test_history_invalidated_during_load_is_not_stored(self):
+        """Test that a load overtaken by an invalidation does not cache its stale result."""
+        cache = make_cache()
+
+        async def loader():
+            cache.invalidate_history()
+            return {"USD": "stale"}
+
+        assert await cache.get_history(loader) == {"USD": "stale"}
+        assert cache._history is None
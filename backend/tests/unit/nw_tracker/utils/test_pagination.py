@@ -0,0 +1,26 @@
+"""
+Unit tests for pagination.py
+Tests cursor encoding and decoding.
+"""
+import pytest
+from datetime import date, datetime
+from uuid import uuid4
+
+from nw_tracker.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.unit
+class TestCursor:
+    """Test opaque keyset cursors."""
+
+    def test_round_trip(self):
+        balance_id = uuid4()
+        cursor = encode_cursor((date(2024, 1, 5), datetime(2024, 1, 5, 9, 30, 1, 500), balance_id))
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, 3) == ["2024-01-05", "2024-01-05T09:30:01.000500", str(balance_id)]
+
+    @pytest.mark.parametrize("cursor", ["", "!!!", "bm90LWpzb24", encode_cursor(("2024-01-05",))])
+    def test_rejects_malformed(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, 3)
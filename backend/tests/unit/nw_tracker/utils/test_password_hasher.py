@@ -0,0 +1,88 @@
+"""
+Unit tests for password_hasher.py
+Tests the bounded hashing pool, rehash detection and event loop responsiveness.
+"""
+import asyncio
+import threading
+import time
+import pytest
+
+from nw_tracker.config import security
+from nw_tracker.config.security import get_password_hash, password_needs_rehash, verify_password
+from nw_tracker.utils.password_hasher import PasswordHasher, PasswordHasherBusyError
+
+
+@pytest.mark.unit
+class TestPasswordHasher:
+    """Test the bounded hashing pool."""
+
+    async def test_runs_on_hashing_thread(self):
+        """Test that calls run on the dedicated pool, not the event loop thread."""
+        hasher = PasswordHasher(workers=1, max_pending=4)
+
+        thread_name = await hasher.run(lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("password-hash")
+        assert hasher.pending == 0
+        hasher.shutdown()
+
+    async def test_rejects_when_saturated(self):
+        """Test that calls beyond max_pending fail fast instead of queueing."""
+        hasher = PasswordHasher(workers=1, max_pending=2)
+        release = threading.Event()
+        running = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.run(release.wait)
+
+        release.set()
+        await asyncio.gather(*running)
+        assert hasher.rejected == 1
+        assert hasher.pending == 0
+        hasher.shutdown()
+
+    async def test_event_loop_stays_responsive_during_login_storm(self):
+        """Test that a burst of bcrypt verifications does not stall other coroutines."""
+        password_hash = get_password_hash("Password123!", rounds=10)
+        hasher = PasswordHasher(workers=2, max_pending=64)
+        lags = []
+
+        async def heartbeat(stop: asyncio.Event):
+            # Stands in for other requests on the same worker
+            while not stop.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - started - 0.005)
+
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(heartbeat(stop))
+        started = time.perf_counter()
+        results = await asyncio.gather(*[
+            hasher.run(verify_password, "Password123!", password_hash) for _ in range(16)
+        ])
+        storm_seconds = time.perf_counter() - started
+        stop.set()
+        await ticker
+        hasher.shutdown()
+
+        assert all(results)
+        # The loop kept ticking throughout; inline bcrypt would block it for the whole storm
+        assert len(lags) > 10
+        assert max(lags) < storm_seconds / 4
+
+
+@pytest.mark.unit
+class TestPasswordNeedsRehash:
+    """Test cost factor detection."""
+
+    def test_matching_cost(self, monkeypatch):
+        monkeypatch.setattr(security.settings, "password_hash_rounds", 12)
+        assert not password_needs_rehash("$2b$12$" + "a" * 53)
+
+    def test_changed_cost(self, monkeypatch):
+        monkeypatch.setattr(security.settings, "password_hash_rounds", 13)
+        assert password_needs_rehash(get_password_hash("Password123!", rounds=4))
+
+    def test_unrecognised_hash(self):
+        assert not password_needs_rehash("not-a-bcrypt-hash")
@@ -0,0 +1,128 @@
+"""
+Unit tests for pool_metrics.py
+Tests pool event counters and acquire time stats.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from nw_tracker.config import database
+from nw_tracker.utils import pool_metrics
+from nw_tracker.utils.pool_metrics import instrument_engine
+
+
+@pytest.fixture
+async def engine(monkeypatch):
+    monkeypatch.setattr(pool_metrics, "_pool_metrics", {})
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=AsyncAdaptedQueuePool, pool_size=2)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestPoolMetrics:
+    """Test engine instrumentation."""
+
+    async def test_counts_checkouts_and_connects(self, engine):
+        """Test that pool events are counted per engine."""
+        metrics = instrument_engine(engine, "primary")
+
+        for _ in range(3):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+        stats = metrics.get_stats()
+        assert stats["name"] == "primary"
+        assert (stats["checkouts"], stats["checkins"]) == (3, 3)
+        assert stats["acquire_count"] == 3
+        assert stats["connects"] >= 1
+        assert stats["checked_out"] == 0
+        assert stats["size"] == 2
+
+    async def test_times_pre_ping(self, monkeypatch):
+        """Test that pre-ping on checkout of a pooled connection is timed."""
+        monkeypatch.setattr(pool_metrics, "_pool_metrics", {})
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            poolclass=AsyncAdaptedQueuePool,
+            pool_pre_ping=True
+        )
+        metrics = instrument_engine(engine, "primary")
+
+        for _ in range(2):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+        stats = metrics.get_stats()
+        assert stats["pings"] == 1
+        assert stats["ping_max_ms"] >= stats["ping_avg_ms"] >= 0
+
+    async def test_acquire_times(self, engine):
+        """Test that acquire averages and maxima are reported in milliseconds."""
+        metrics = instrument_engine(engine, "replica")
+        metrics.record_acquire(0.002)
+        metrics.record_acquire(0.004)
+
+        stats = pool_metrics.get_all_pool_stats()
+
+        assert [s["name"] for s in stats] == ["replica"]
+        assert stats[0]["acquire_count"] == 2
+        assert stats[0]["acquire_avg_ms"] == pytest.approx(3.0)
+        assert stats[0]["acquire_max_ms"] == pytest.approx(4.0)
+
+
+@pytest.mark.unit
+class TestReadOnlyRouting:
+    """Test the read-only session dependency."""
+
+    def test_reads_use_ro_user_on_primary_without_replica(self):
+        """Test that reads log in as the RO user on the primary when no replica host is set."""
+        assert not database.settings.read_replica_configured
+        assert database.ro_engine is not database.engine
+        assert database.ro_engine.url.username == database.settings.postgres_ro_user
+        assert database.ro_engine.url.host == database.settings.postgres_host
+        assert database.is_read_only(database.ROAsyncSessionLocal())
+
+    async def test_replica_host_with_ro_user(self, monkeypatch):
+        """Test that a configured replica host is used with the RO user."""
+        monkeypatch.setattr(pool_metrics, "_pool_metrics", {})
+        monkeypatch.setattr(database.settings, "postgres_ro_host", "replica.internal")
+
+        ro_engine = database.create_read_only_engine()
+
+        assert ro_engine.url.host == "replica.internal"
+        assert ro_engine.url.username == database.settings.postgres_ro_user
+        assert "replica" in pool_metrics._pool_metrics
+        await ro_engine.dispose()
+
+    def test_shares_primary_without_ro_user(self, monkeypatch):
+        """Test that reads share the primary engine only when no RO user is configured."""
+        monkeypatch.setattr(database.settings, "postgres_ro_user", "")
+
+        assert database.create_read_only_engine() is None
+
+    def test_replica_sessions_are_read_only(self):
+        """Test that only RO user sessions are flagged read-only."""
+        assert database.is_read_only(database.ROAsyncSessionLocal(info={"read_only": True}))
+        assert not database.is_read_only(database.AsyncSessionLocal())
+
+
+@pytest.mark.unit
+class TestEngineOptions:
+    """Test pool tuning from settings."""
+
+    def test_options_follow_settings(self, monkeypatch):
+        """Test that pool sizes, timeouts and statement caches come from settings."""
+        monkeypatch.setattr(database.settings, "sql_echo", False)
+        monkeypatch.setattr(database.settings, "db_pool_timeout", 5.0)
+        monkeypatch.setattr(database.settings, "db_pool_recycle", 600)
+        monkeypatch.setattr(database.settings, "db_statement_cache_size", 0)
+
+        options = database.engine_options(pool_size=4, max_overflow=2)
+
+        assert options["echo"] is False
+        assert (options["pool_size"], options["max_overflow"]) == (4, 2)
+        assert (options["pool_timeout"], options["pool_recycle"]) == (5.0, 600)
+        assert options["connect_args"]["statement_cache_size"] == 0
@@ -0,0 +1,135 @@
+"""
+Unit tests for rate_table.py
+Tests the immutable exchange rate snapshot.
+"""
+import numpy as np
+import pytest
+from datetime import date
+
+from nw_tracker.models.models import Currency
+from nw_tracker.utils.rate_table import RateHistory, RateTable, history_arrays
+
+
+RATES = {Currency.USD: 1.25, "EUR": 1.15}
+
+
+@pytest.mark.unit
+class TestRateTable:
+    """Test RateTable lookups and conversions."""
+
+    def test_gbp_always_present(self):
+        """Test that GBP converts at 1.0 and keys accept enums or codes."""
+        table = RateTable(RATES)
+
+        assert table.rate(Currency.GBP) == 1.0
+        assert table.rate("USD") == table.rate(Currency.USD) == 1.25
+        assert Currency.EUR in table
+
+    def test_convert_scalar_to_gbp(self):
+        """Test scalar conversion to GBP."""
+        table = RateTable(RATES)
+
+        assert table.convert(125.0, Currency.USD) == pytest.approx(100.0)
+        assert table.to_gbp(115.0, Currency.EUR) == pytest.approx(100.0)
+        assert isinstance(table.convert(10.0, Currency.GBP), float)
+
+    def test_convert_array(self):
+        """Test that a whole array converts in one call."""
+        table = RateTable(RATES)
+
+        converted = table.convert(np.array([125.0, 250.0]), Currency.USD)
+
+        assert isinstance(converted, np.ndarray)
+        np.testing.assert_allclose(converted, [100.0, 200.0])
+        np.testing.assert_allclose(table.convert([1.25, 2.5], "USD"), [1.0, 2.0])
+
+    def test_convert_to_display_currency(self):
+        """Test conversion between two non-GBP currencies."""
+        table = RateTable(RATES)
+
+        assert table.convert(125.0, Currency.USD, to_currency=Currency.EUR) == pytest.approx(115.0)
+        assert table.convert(100.0, Currency.GBP, to_currency="USD") == pytest.approx(125.0)
+
+    def test_unknown_currency_raises(self):
+        """Test that a currency missing from the snapshot raises KeyError."""
+        with pytest.raises(KeyError):
+            RateTable({}).rate(Currency.USD)
+
+    def test_immutable(self):
+        """Test that the snapshot cannot be modified."""
+        table = RateTable(RATES)
+
+        with pytest.raises(AttributeError):
+            table.rates = {}
+        with pytest.raises(TypeError):
+            table._rates["USD"] = 2.0
+        assert table.as_dict() == {"GBP": 1.0, "USD": 1.25, "EUR": 1.15}
+
+
+@pytest.mark.unit
+class TestRateHistory:
+    """Test dated rate lookups."""
+
+    HISTORY = {
+        Currency.USD: [(date(2024, 1, 10), 1.3), (date(2024, 1, 1), 1.2), (date(2024, 2, 1), 1.4)],
+    }
+
+    def test_rate_as_of(self):
+        """Test that the latest rate on or before the date is used."""
+        history = RateHistory(RATES, self.HISTORY)
+
+        assert history.rate_as_of(Currency.USD, date(2024, 1, 1)) == 1.2
+        assert history.rate_as_of(Currency.USD, date(2024, 1, 9)) == 1.2
+        assert history.rate_as_of(Currency.USD, date(2024, 1, 10)) == 1.3
+        assert history.rate_as_of(Currency.USD, date(2025, 1, 1)) == 1.4
+
+    def test_before_first_rate_and_missing_history(self):
+        """Test the earliest-rate and current-rate fallbacks."""
+        history = RateHistory(RATES, self.HISTORY)
+
+        assert history.rate_as_of(Currency.USD, date(2023, 6, 1)) == 1.2
+        assert history.rate_as_of(Currency.EUR, date(2023, 6, 1)) == 1.15
+        assert history.rate_as_of(Currency.GBP, date(2023, 6, 1)) == 1.0
+
+    def test_rates_on_matches_rate_as_of(self):
+        """Test the vectorised lookup against the scalar one."""
+        history = RateHistory(RATES, self.HISTORY)
+        dates = [date(2023, 12, 1), date(2024, 1, 1), date(2024, 1, 15), date(2024, 3, 1)]
+        ordinals = np.array([d.toordinal() for d in dates])
+
+        for currency in (Currency.USD, Currency.EUR):
+            np.testing.assert_array_equal(
+                history.rates_on(currency, ordinals),
+                [history.rate_as_of(currency, d) for d in dates]
+            )
+
+    def test_current_rates_unchanged(self):
+        """Test that scalar conversions still use the current snapshot."""
+        history = RateHistory(RATES, self.HISTORY)
+
+        assert history.rate(Currency.USD) == 1.25
+        assert history.to_gbp(125.0, Currency.USD) == pytest.approx(100.0)
+        np.testing.assert_array_equal(RateTable(RATES).rates_on(Currency.USD, np.arange(3)), [1.25] * 3)
+
+    @pytest.mark.parametrize("to_date", [None, date(2023, 6, 1), date(2024, 1, 9), date(2024, 1, 10), date(2025, 1, 1)])
+    def test_from_arrays_matches_loaded_history(self, to_date):
+        """Test that cutting shared arrays at to_date matches loading the history up to it."""
+        arrays = history_arrays(self.HISTORY)
+        loaded = {
+            currency: [(d, rate) for d, rate in points if to_date is None or d <= to_date]
+            for currency, points in self.HISTORY.items()
+        }
+        expected = RateHistory(RATES, loaded)
+        history = RateHistory.from_arrays(RATES, arrays, to_date)
+        dates = [date(2023, 12, 1), date(2024, 1, 1), date(2024, 1, 15), date(2024, 3, 1)]
+
+        for currency in (Currency.USD, Currency.EUR):
+            assert [history.rate_as_of(currency, d) for d in dates] == [expected.rate_as_of(currency, d) for d in dates]
+
+    def test_history_arrays_are_read_only(self):
+        """Test that arrays shared through the cache cannot be modified."""
+        ordinals, values = history_arrays(self.HISTORY)["USD"]
+
+        assert list(values) == [1.2, 1.3, 1.4]
+        with pytest.raises(ValueError):
+            values[0] = 2.0
@@ -0,0 +1,153 @@
+"""
+Unit tests for result_cache.py
+Tests the LRU/TTL backend and per-user version invalidation.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from nw_tracker.utils import result_cache
+from nw_tracker.utils.result_cache import InMemoryCacheBackend, ResultCache
+
+
+def make_cache(max_entries=16, ttl_seconds=60):
+    return ResultCache(InMemoryCacheBackend(max_entries=max_entries, ttl_seconds=ttl_seconds))
+
+
+@pytest.mark.unit
+class TestInMemoryCacheBackend:
+    """Test the in-process backend."""
+
+    async def test_evicts_least_recently_used(self):
+        """Test that reads refresh recency and the oldest entry is evicted."""
+        backend = InMemoryCacheBackend(max_entries=2)
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+        await backend.get("a")
+        await backend.set("c", 3)
+
+        assert await backend.get("a") == 1
+        assert await backend.get("b") is None
+        assert await backend.get("c") == 3
+
+    async def test_expires_entries(self):
+        """Test that entries past their TTL are dropped on read."""
+        backend = InMemoryCacheBackend(max_entries=2, ttl_seconds=10)
+        with patch.object(result_cache.time, "monotonic", return_value=100.0):
+            await backend.set("a", 1)
+        with patch.object(result_cache.time, "monotonic", return_value=111.0):
+            assert await backend.get("a") is None
+        assert await backend.size() == 0
+
+    async def test_counters_survive_eviction_and_clear(self):
+        """Test that version counters are never evicted."""
+        backend = InMemoryCacheBackend(max_entries=1)
+        await backend.incr("version")
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+        await backend.clear()
+
+        assert await backend.get_counter("version") == 1
+        assert await backend.get_counter("missing") == 0
+
+    async def test_expires_counters_with_entries(self):
+        """Test that idle counters are dropped after the TTL without repeating a value."""
+        backend = InMemoryCacheBackend(max_entries=2, ttl_seconds=10)
+        with patch.object(result_cache.time, "monotonic", return_value=100.0):
+            first = await backend.incr("version:user:a")
+            await backend.incr("version:user:b")
+        with patch.object(result_cache.time, "monotonic", return_value=105.0):
+            await backend.incr("version:user:b")
+        with patch.object(result_cache.time, "monotonic", return_value=111.0):
+            await backend.incr("version:user:c")
+
+            assert await backend.get_counter("version:user:a") == 0
+            assert await backend.get_counter("version:user:b") != 0
+            assert len(backend._counters) == 2
+            assert await backend.incr("version:user:a") > first
+
+    async def test_keeps_counters_without_ttl(self):
+        """Test that counters are never dropped when entries never expire."""
+        backend = InMemoryCacheBackend(max_entries=2)
+        with patch.object(result_cache.time, "monotonic", return_value=100.0):
+            await backend.incr("version")
+        with patch.object(result_cache.time, "monotonic", return_value=10_000.0):
+            await backend.incr("other")
+
+        assert await backend.get_counter("version") == 1
+
+
+@pytest.mark.unit
+class TestResultCache:
+    """Test cached computation and invalidation."""
+
+    async def test_second_call_is_a_hit(self):
+        """Test that a repeated call with the same params does not recompute."""
+        cache = make_cache()
+        compute = AsyncMock(return_value="summary")
+        user_id = uuid4()
+
+        assert await cache.get_or_compute(user_id, "dashboard", (), compute) == "summary"
+        assert await cache.get_or_compute(user_id, "dashboard", (), compute) == "summary"
+
+        compute.assert_awaited_once()
+        stats = await cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["namespaces"] == {"dashboard": {"hits": 1, "misses": 1}}
+
+    async def test_params_and_users_are_separate(self):
+        """Test that different params and users get their own entries."""
+        cache = make_cache()
+        compute = AsyncMock(side_effect=["a", "b", "c"])
+        user_id = uuid4()
+
+        assert await cache.get_or_compute(user_id, "history", ("daily",), compute) == "a"
+        assert await cache.get_or_compute(user_id, "history", ("monthly",), compute) == "b"
+        assert await cache.get_or_compute(uuid4(), "history", ("daily",), compute) == "c"
+
+    async def test_invalidate_user_only_affects_that_user(self):
+        """Test that a user's writes do not evict other users' results."""
+        cache = make_cache()
+        user_id, other_id = uuid4(), uuid4()
+        await cache.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="old"))
+        await cache.get_or_compute(other_id, "dashboard", (), AsyncMock(return_value="other"))
+
+        await cache.invalidate_user(user_id)
+
+        assert await cache.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="new")) == "new"
+        assert await cache.get_or_compute(other_id, "dashboard", (), AsyncMock(return_value="x")) == "other"
+
+    async def test_invalidate_all(self):
+        """Test that a global bump drops every user's results."""
+        cache = make_cache()
+        user_id = uuid4()
+        await cache.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="old"))
+
+        await cache.invalidate_all()
+
+        assert await cache.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="new")) == "new"
+
+    async def test_write_during_compute_is_not_cached(self):
+        """Test that a result computed across an invalidation is not stored."""
+        cache = make_cache()
+        user_id = uuid4()
+
+        async def compute_with_write():
+            await cache.invalidate_user(user_id)
+            return "stale"
+
+        assert await cache.get_or_compute(user_id, "dashboard", (), compute_with_write) == "stale"
+        assert await cache.get_or_compute(user_id, "dashboard", (), AsyncMock(return_value="fresh")) == "fresh"
+
+    async def test_disabled_always_computes(self, monkeypatch):
+        """Test that the cache is bypassed when disabled."""
+        monkeypatch.setattr(result_cache.settings, "result_cache_enabled", False)
+        cache = make_cache()
+        compute = AsyncMock(return_value="summary")
+        user_id = uuid4()
+
+        await cache.get_or_compute(user_id, "dashboard", (), compute)
+        await cache.get_or_compute(user_id, "dashboard", (), compute)
+
+        assert compute.await_count == 2
+        assert (await cache.get_stats())["hits"] == 0
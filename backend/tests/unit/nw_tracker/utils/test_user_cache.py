@@ -0,0 +1,68 @@
+"""
+Unit tests for user_cache.py
+Tests principal snapshots, expiry and invalidation.
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+from nw_tracker.models.models import User
+from nw_tracker.utils import result_cache, user_cache
+from nw_tracker.utils.result_cache import InMemoryCacheBackend
+from nw_tracker.utils.user_cache import UserCache, UserPrincipal
+
+
+def make_principal(**overrides):
+    user = User(
+        id=uuid4(),
+        username="testuser",
+        email="test@example.com",
+        is_active=True,
+        created_at=datetime(2024, 1, 1),
+    )
+    for key, value in overrides.items():
+        setattr(user, key, value)
+    return UserPrincipal.from_user(user)
+
+
+@pytest.mark.unit
+class TestUserCache:
+    """Test the user principal cache."""
+
+    async def test_set_get_invalidate(self):
+        """Test that a cached principal is returned until invalidated."""
+        cache = UserCache(InMemoryCacheBackend(max_entries=8, ttl_seconds=30))
+        principal = make_principal()
+
+        await cache.set(principal)
+        assert await cache.get(principal.id) is principal
+
+        await cache.invalidate(principal.id)
+        assert await cache.get(principal.id) is None
+
+    async def test_entries_expire(self):
+        """Test that principals are re-read after the TTL."""
+        cache = UserCache(InMemoryCacheBackend(max_entries=8, ttl_seconds=30))
+        principal = make_principal(is_active=False)
+        with patch.object(result_cache.time, "monotonic", return_value=100.0):
+            await cache.set(principal)
+        with patch.object(result_cache.time, "monotonic", return_value=131.0):
+            assert await cache.get(principal.id) is None
+
+    async def test_disabled(self, monkeypatch):
+        """Test that nothing is cached when disabled."""
+        monkeypatch.setattr(user_cache.settings, "user_cache_enabled", False)
+        cache = UserCache(InMemoryCacheBackend(max_entries=8))
+        principal = make_principal()
+
+        await cache.set(principal)
+
+        assert await cache.get(principal.id) is None
+
+    def test_principal_is_a_snapshot(self):
+        """Test that the principal copies scalar fields only."""
+        principal = make_principal(username="alice")
+        assert principal.username == "alice"
+        assert principal.created_at == datetime(2024, 1, 1)
+        assert not hasattr(principal, "accounts")